@@ -0,0 +1,44 @@
+from django.contrib import admin
+from .models import AttendeeSketch, LocationSketch, LocationThroughput, ScannerThroughput, StudentAttendance
+
+
+@admin.register(AttendeeSketch)
+class AttendeeSketchAdmin(admin.ModelAdmin):
+    list_display = ('key', 'event', 'day', 'updated_at')
+    list_filter = ('day',)
+    search_fields = ('key',)
+    list_select_related = ('event',)
+    exclude = ('registers',)
+    readonly_fields = ('key', 'event', 'day', 'folded_seq', 'updated_at')
+
+
+@admin.register(StudentAttendance)
+class StudentAttendanceAdmin(admin.ModelAdmin):
+    list_display = ('student_id', 'event', 'first_seen_at')
+    search_fields = ('=student_id',)
+    list_select_related = ('event',)
+    raw_id_fields = ('event',)
+
+
+@admin.register(ScannerThroughput)
+class ScannerThroughputAdmin(admin.ModelAdmin):
+    list_display = ('scanner', 'event', 'total_scans', 'success_scans', 'last_scan_at')
+    list_select_related = ('scanner', 'event')
+    raw_id_fields = ('event', 'scanner')
+    exclude = ('minute_counts', 'recent_gaps')
+
+
+@admin.register(LocationThroughput)
+class LocationThroughputAdmin(admin.ModelAdmin):
+    list_display = ('location', 'event', 'total_scans', 'success_scans', 'duplicate_scans', 'last_scan_at')
+    list_select_related = ('event',)
+    raw_id_fields = ('event',)
+    exclude = ('minute_counts',)
+
+
+@admin.register(LocationSketch)
+class LocationSketchAdmin(admin.ModelAdmin):
+    list_display = ('location', 'event', 'updated_at')
+    list_select_related = ('event',)
+    exclude = ('registers',)
+    readonly_fields = ('event', 'location', 'updated_at')
@@ -0,0 +1,113 @@
+"""
+Per-student attendance index: which events each student attended and when first seen.
+
+Cross-event questions (overlap, retention, repeat attendees) are answered from
+this compact table instead of self-joining scan_logs.
+"""
+from django.db import transaction
+from django.db.models import Count, F, Max, Min
+from django.db.models.functions import Coalesce, Trim, Upper
+
+from apps.scans.models import ScanLog, normalize_student_id
+from .models import StudentAttendance
+
+
+def record_attendance(event_id, student_id, timestamp):
+    """Index a successful scan. The first sighting wins; later ones are ignored."""
+    StudentAttendance.objects.bulk_create(
+        [StudentAttendance(event_id=event_id, student_id=normalize_student_id(student_id), first_seen_at=timestamp)],
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_attendance(event_ids=None, batch_size=1000):
+    """Recompute the index from SUCCESS scans, for all events or only the given ones."""
+    scans = ScanLog.objects.filter(status='SUCCESS')
+    if event_ids is not None:
+        scans = scans.filter(event_id__in=event_ids)
+    # Students are indexed by normalized ID, the same identity duplicate detection uses
+    rows = (
+        scans.order_by()
+        .values('event_id', student=Coalesce(F('student_key__student_id'), Upper(Trim('student_id'))))
+        .annotate(first_seen_at=Min('timestamp'))
+        .iterator()
+    )
+
+    written = 0
+    with transaction.atomic():
+        stale = StudentAttendance.objects.all()
+        if event_ids is not None:
+            stale = stale.filter(event_id__in=event_ids)
+        stale.delete()
+
+        batch = []
+        for row in rows:
+            batch.append(StudentAttendance(
+                event_id=row['event_id'], student_id=row['student'], first_seen_at=row['first_seen_at'],
+            ))
+            if len(batch) >= batch_size:
+                StudentAttendance.objects.bulk_create(batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            StudentAttendance.objects.bulk_create(batch)
+            written += len(batch)
+    return written
+
+
+def attendee_sets(event_ids):
+    """Map each event ID to the set of students who attended it."""
+    sets = {event_id: set() for event_id in event_ids}
+    rows = StudentAttendance.objects.filter(event_id__in=event_ids).values_list('event_id', 'student_id')
+    for event_id, student_id in rows.iterator():
+        sets[event_id].add(student_id)
+    return sets
+
+
+def overlap_matrix(event_ids):
+    """matrix[i][j] is the number of students who attended both event i and event j."""
+    sets = attendee_sets(event_ids)
+    return [[len(sets[row] & sets[column]) for column in event_ids] for row in event_ids]
+
+
+def retention(event_ids):
+    """
+    Follow attendees through an ordered series of events.
+
+    For each event: its attendees, how many had attended any earlier event in
+    the series, and how many of the first event's attendees came back.
+    """
+    sets = attendee_sets(event_ids)
+    first = sets[event_ids[0]] if event_ids else set()
+    seen = set()
+    steps = []
+    for event_id in event_ids:
+        attendees = sets[event_id]
+        retained = len(attendees & first)
+        steps.append({
+            'event_id': event_id,
+            'attendees': len(attendees),
+            'returning': len(attendees & seen),
+            'retained_from_first': retained,
+            'retention_rate': round(retained / len(first), 4) if first else 0.0,
+        })
+        seen |= attendees
+    return steps
+
+
+def top_repeat_attendees(limit=20, event_ids=None):
+    """Students who attended the most events (optionally within a set of events)."""
+    attendance = StudentAttendance.objects.all()
+    if event_ids is not None:
+        attendance = attendance.filter(event_id__in=event_ids)
+    return list(
+        attendance.order_by()
+        .values('student_id')
+        .annotate(
+            events_attended=Count('event_id'),
+            first_attended_at=Min('first_seen_at'),
+            last_attended_at=Max('first_seen_at'),
+        )
+        .filter(events_attended__gt=1)
+        .order_by('-events_attended', 'student_id')[:limit]
+    )
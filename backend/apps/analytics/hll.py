@@ -0,0 +1,53 @@
+"""
+HyperLogLog cardinality sketches for unique-attendee counts.
+
+Sketches use 2^14 one-byte registers (16 KB) over a 64-bit BLAKE2b hash.
+The relative standard error is 1.04 / sqrt(2^14) ~= 0.81%, so about 95% of
+estimates fall within +/-1.6% of the exact count. Small counts (under ~40,000)
+use linear counting and are nearly exact. Sketches merge losslessly by taking
+the register-wise maximum, so the union of any set of events or days has the
+same error bound as a single sketch.
+"""
+import math
+from hashlib import blake2b
+
+PRECISION = 14
+REGISTER_COUNT = 1 << PRECISION
+STANDARD_ERROR = 1.04 / math.sqrt(REGISTER_COUNT)
+
+_ALPHA = 0.7213 / (1 + 1.079 / REGISTER_COUNT)
+_INVERSE_POWERS = [2.0 ** -rank for rank in range(65)]
+_VALUE_BITS = 64 - PRECISION
+
+
+def empty_registers():
+    return bytes(REGISTER_COUNT)
+
+
+def position(value):
+    """Return (register index, rank) for a value."""
+    hashed = int.from_bytes(blake2b(value.encode(), digest_size=8).digest(), 'big')
+    index = hashed >> _VALUE_BITS
+    remainder = hashed & ((1 << _VALUE_BITS) - 1)
+    rank = _VALUE_BITS - remainder.bit_length() + 1
+    return index, rank
+
+
+def merge(registers_list):
+    """Register-wise maximum of several sketches."""
+    registers_list = list(registers_list)
+    if not registers_list:
+        return empty_registers()
+    if len(registers_list) == 1:
+        return bytes(registers_list[0])
+    return bytes(map(max, *registers_list))
+
+
+def estimate(registers):
+    """Estimated number of distinct values added to the sketch."""
+    total = sum(map(_INVERSE_POWERS.__getitem__, registers))
+    raw = _ALPHA * REGISTER_COUNT * REGISTER_COUNT / total
+    zeros = registers.count(0)
+    if raw <= 2.5 * REGISTER_COUNT and zeros:
+        return REGISTER_COUNT * math.log(REGISTER_COUNT / zeros)
+    return raw
@@ -0,0 +1,122 @@
+"""
+Per-door scan rollups, maintained incrementally from the location stored on each scan.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Max, Sum
+from django.utils import timezone
+
+from apps.scans.models import ScanLog
+from . import hll
+from .models import LocationSketch, LocationThroughput
+from .throughput import WINDOW_MINUTES, count_in_minute, empty_minute_counts, scans_in_window
+
+STATUS_COUNTERS = {
+    'SUCCESS': 'success_scans',
+    'DUPLICATE': 'duplicate_scans',
+    'ERROR': 'error_scans',
+}
+
+
+def record_location_scan(event_id, location, status, timestamp):
+    """Count one scan attempt at a door."""
+    with transaction.atomic():
+        row, _ = LocationThroughput.objects.select_for_update().get_or_create(
+            event_id=event_id, location=location or '',
+            defaults={'minute_counts': empty_minute_counts()},
+        )
+        count_in_minute(row, timestamp)
+        row.total_scans += 1
+        counter = STATUS_COUNTERS.get(status)
+        if counter:
+            setattr(row, counter, getattr(row, counter) + 1)
+        if row.last_scan_at is None or timestamp > row.last_scan_at:
+            row.last_scan_at = timestamp
+        row.save()
+
+
+def rebuild_location_rollups(event_ids=None):
+    """
+    Recompute door rollups from scan_logs, for all events or only the given ones.
+
+    Totals are exact; the per-minute buffers are refilled from the scans of the
+    last WINDOW_MINUTES minutes, counting a collapsed duplicate once at its
+    first timestamp. Returns the number of rows written.
+    """
+    scans = ScanLog.objects.order_by()
+    if event_ids is not None:
+        scans = scans.filter(event_id__in=event_ids)
+
+    rows = {}
+
+    def row_for(event_id, location):
+        key = (event_id, location or '')
+        if key not in rows:
+            rows[key] = LocationThroughput(
+                event_id=event_id, location=location or '', minute_counts=empty_minute_counts()
+            )
+        return rows[key]
+
+    totals = scans.values('event_id', 'location', 'status').annotate(
+        attempts=Sum('attempts'), latest=Max('timestamp'), latest_repeat=Max('last_scan_at'),
+    )
+    for item in totals:
+        row = row_for(item['event_id'], item['location'])
+        row.total_scans += item['attempts']
+        counter = STATUS_COUNTERS.get(item['status'])
+        if counter:
+            setattr(row, counter, getattr(row, counter) + item['attempts'])
+        for seen in (item['latest'], item['latest_repeat']):
+            if seen is not None and (row.last_scan_at is None or seen > row.last_scan_at):
+                row.last_scan_at = seen
+
+    recent = scans.filter(timestamp__gte=timezone.now() - timedelta(minutes=WINDOW_MINUTES)).order_by('timestamp')
+    for event_id, location, timestamp in recent.values_list('event_id', 'location', 'timestamp').iterator():
+        count_in_minute(row_for(event_id, location), timestamp)
+
+    with transaction.atomic():
+        stale = LocationThroughput.objects.all()
+        if event_ids is not None:
+            stale = stale.filter(event_id__in=event_ids)
+        stale.delete()
+        LocationThroughput.objects.bulk_create(rows.values(), batch_size=500)
+    return len(rows)
+
+
+def location_rollup(event, now=None):
+    """Live per-door stats for an event, busiest door first."""
+    now = now or timezone.now()
+    scanners = defaultdict(int)
+    for location in event.event_users.values_list('location', flat=True):
+        scanners[location or ''] += 1
+
+    rows = {row.location: row for row in LocationThroughput.objects.filter(event=event)}
+    students = dict(LocationSketch.objects.filter(event=event).values_list('location', 'registers'))
+    rollup = []
+    for location in set(rows) | set(scanners):
+        row = rows.get(location)
+        scans_5 = scans_in_window(row, 5, now) if row else 0
+        scans_15 = scans_in_window(row, 15, now) if row else 0
+        total = row.total_scans if row else 0
+        duplicates = row.duplicate_scans if row else 0
+        rollup.append({
+            'location': location or None,
+            'assigned_scanners': scanners.get(location, 0),
+            'scans_last_5m': scans_5,
+            'scans_last_15m': scans_15,
+            'scans_per_minute_5m': round(scans_5 / 5, 2),
+            'scans_per_minute_15m': round(scans_15 / 15, 2),
+            'total_scans': total,
+            # SUCCESS scans: one per student under ONCE_PER_EVENT, more under the other policies
+            'admissions': row.success_scans if row else 0,
+            # Distinct students with a SUCCESS scan at the door (HyperLogLog estimate)
+            'unique_students': round(hll.estimate(bytes(students[location]))) if location in students else 0,
+            'duplicate_scans': duplicates,
+            'duplicate_rate': round(duplicates / total, 4) if total else 0.0,
+            'error_scans': row.error_scans if row else 0,
+            'last_scan_at': row.last_scan_at if row else None,
+        })
+    rollup.sort(key=lambda entry: (-entry['scans_last_5m'], -entry['total_scans'], entry['location'] or ''))
+    return rollup
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.attendance import rebuild_attendance
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-student attendance index from scan_logs (all events, or the given event IDs).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', help='Only rebuild these events.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        written = rebuild_attendance(options['event_ids'] or None, batch_size=options['batch_size'])
+        self.stdout.write(f'Indexed {written} attendance row(s).')
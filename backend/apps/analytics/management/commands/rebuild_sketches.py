@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.analytics.sketches import rebuild_sketches
+
+
+class Command(BaseCommand):
+    help = 'Rebuild unique-attendee sketches from scan_logs (all events, or the given event IDs).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', help='Only rebuild these events.')
+
+    def handle(self, *args, **options):
+        written = rebuild_sketches(options['event_ids'] or None)
+        self.stdout.write(f'Wrote {written} sketch(es).')
@@ -0,0 +1,33 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:43
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0005_event_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendeeSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=80, unique=True)),
+                ('day', models.DateField(blank=True, null=True)),
+                ('registers', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='attendee_sketches', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Attendee Sketch',
+                'verbose_name_plural': 'Attendee Sketches',
+                'db_table': 'attendee_sketches',
+                'indexes': [models.Index(fields=['event', 'day'], name='attendee_sketch_event_day_idx'), models.Index(fields=['day', 'event'], name='attendee_sketch_day_event_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('events', '0005_event_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentAttendance',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('student_id', models.CharField(max_length=50)),
+                ('first_seen_at', models.DateTimeField()),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendances', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Student Attendance',
+                'verbose_name_plural': 'Student Attendance',
+                'db_table': 'student_attendance',
+                'indexes': [models.Index(fields=['event', 'student_id'], name='student_attendance_event_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='studentattendance',
+            constraint=models.UniqueConstraint(fields=('student_id', 'event'), name='student_attendance_student_event_uniq'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:52
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0002_studentattendance'),
+        ('events', '0005_event_status_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScannerThroughput',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('minute_counts', models.BinaryField()),
+                ('newest_minute', models.BigIntegerField(default=0)),
+                ('recent_gaps', models.BinaryField()),
+                ('gap_count', models.PositiveIntegerField(default=0)),
+                ('total_scans', models.PositiveIntegerField(default=0)),
+                ('success_scans', models.PositiveIntegerField(default=0)),
+                ('last_scan_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scanner_throughput', to='events.event')),
+                ('scanner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='scanner_throughput', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Scanner Throughput',
+                'verbose_name_plural': 'Scanner Throughput',
+                'db_table': 'scanner_throughput',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='scannerthroughput',
+            constraint=models.UniqueConstraint(fields=('event', 'scanner'), name='scanner_throughput_event_scanner_uniq'),
+        ),
+    ]
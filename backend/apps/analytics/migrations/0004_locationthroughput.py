@@ -0,0 +1,39 @@
+# Generated by Django 5.0.6 on 2026-10-19 05:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0003_scannerthroughput'),
+        ('events', '0007_event_collapse_duplicates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationThroughput',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('minute_counts', models.BinaryField()),
+                ('newest_minute', models.BigIntegerField(default=0)),
+                ('total_scans', models.PositiveIntegerField(default=0)),
+                ('success_scans', models.PositiveIntegerField(default=0)),
+                ('duplicate_scans', models.PositiveIntegerField(default=0)),
+                ('error_scans', models.PositiveIntegerField(default=0)),
+                ('last_scan_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_throughput', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Location Throughput',
+                'verbose_name_plural': 'Location Throughput',
+                'db_table': 'location_throughput',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='locationthroughput',
+            constraint=models.UniqueConstraint(fields=('event', 'location'), name='location_throughput_event_location_uniq'),
+        ),
+    ]
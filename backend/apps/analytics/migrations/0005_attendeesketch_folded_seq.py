@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:08
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def mark_event_sketches_folded(apps, schema_editor):
+    """Event sketches were updated as each scan committed, so they already include every scan."""
+    AttendeeSketch = apps.get_model('analytics', 'AttendeeSketch')
+    Event = apps.get_model('events', 'Event')
+    AttendeeSketch.objects.filter(event__isnull=False, day__isnull=True).update(
+        folded_seq=Subquery(Event.objects.filter(pk=OuterRef('event_id')).values('scan_seq')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_locationthroughput'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attendeesketch',
+            name='folded_seq',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.RunPython(mark_event_sketches_folded, migrations.RunPython.noop),
+    ]
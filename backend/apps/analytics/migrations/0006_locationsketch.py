@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_attendeesketch_folded_seq'),
+        ('events', '0008_event_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LocationSketch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('registers', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='location_sketches', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'Location Sketch',
+                'verbose_name_plural': 'Location Sketches',
+                'db_table': 'location_sketches',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='locationsketch',
+            constraint=models.UniqueConstraint(fields=('event', 'location'), name='location_sketch_event_location_uniq'),
+        ),
+    ]
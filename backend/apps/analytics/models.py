@@ -0,0 +1,135 @@
+from django.db import models
+
+
+class AttendeeSketch(models.Model):
+    """
+    HyperLogLog sketch of the students successfully scanned in one scope.
+
+    Scopes are a whole event (day is null), a whole day across all events
+    (event is null) or one event on one day. ``key`` identifies the scope
+    uniquely; see apps.analytics.sketches.sketch_key.
+    """
+    key = models.CharField(max_length=80, unique=True)
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, null=True, blank=True, related_name='attendee_sketches')
+    day = models.DateField(null=True, blank=True)
+    registers = models.BinaryField()
+    # Event sketches: highest scan seq of the event included (see sketches.fold_attendees)
+    folded_seq = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'attendee_sketches'
+        verbose_name = 'Attendee Sketch'
+        verbose_name_plural = 'Attendee Sketches'
+        indexes = [
+            models.Index(fields=['event', 'day'], name='attendee_sketch_event_day_idx'),
+            models.Index(fields=['day', 'event'], name='attendee_sketch_day_event_idx'),
+        ]
+
+    def __str__(self):
+        return self.key
+
+
+class LocationSketch(models.Model):
+    """
+    HyperLogLog sketch of the students successfully scanned at one door of an event.
+
+    Maintained with the attendee sketches (see apps.analytics.sketches);
+    ``location`` is '' for scans by scanners without an assigned door.
+    """
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='location_sketches')
+    location = models.CharField(max_length=255, blank=True)
+    registers = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'location_sketches'
+        verbose_name = 'Location Sketch'
+        verbose_name_plural = 'Location Sketches'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'location'], name='location_sketch_event_location_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.location or '(no location)'} @ {self.event_id}"
+
+
+class StudentAttendance(models.Model):
+    """One row per student per event attended, with the time of the first successful scan."""
+    student_id = models.CharField(max_length=50)
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='attendances')
+    first_seen_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'student_attendance'
+        verbose_name = 'Student Attendance'
+        verbose_name_plural = 'Student Attendance'
+        constraints = [
+            models.UniqueConstraint(fields=['student_id', 'event'], name='student_attendance_student_event_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['event', 'student_id'], name='student_attendance_event_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.student_id} @ {self.event_id}"
+
+
+class ScannerThroughput(models.Model):
+    """
+    Rolling throughput counters for one scanner at one event, updated on every scan.
+
+    ``minute_counts`` is a ring buffer of per-minute scan counts ending at
+    ``newest_minute`` (minutes since the epoch); ``recent_gaps`` is a ring
+    buffer of the latest gaps between scans in milliseconds. See
+    apps.analytics.throughput for the layout.
+    """
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='scanner_throughput')
+    scanner = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='scanner_throughput')
+    minute_counts = models.BinaryField()
+    newest_minute = models.BigIntegerField(default=0)
+    recent_gaps = models.BinaryField()
+    gap_count = models.PositiveIntegerField(default=0)
+    total_scans = models.PositiveIntegerField(default=0)
+    success_scans = models.PositiveIntegerField(default=0)
+    last_scan_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'scanner_throughput'
+        verbose_name = 'Scanner Throughput'
+        verbose_name_plural = 'Scanner Throughput'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'scanner'], name='scanner_throughput_event_scanner_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.scanner_id} @ {self.event_id}"
+
+
+class LocationThroughput(models.Model):
+    """
+    Rolling counters for one door (EventUser.location) at one event, updated on every scan.
+
+    ``location`` is '' for scans by scanners without an assigned door. The
+    per-minute ring buffer has the same layout as ScannerThroughput's.
+    """
+    event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='location_throughput')
+    location = models.CharField(max_length=255, blank=True)
+    minute_counts = models.BinaryField()
+    newest_minute = models.BigIntegerField(default=0)
+    total_scans = models.PositiveIntegerField(default=0)
+    success_scans = models.PositiveIntegerField(default=0)
+    duplicate_scans = models.PositiveIntegerField(default=0)
+    error_scans = models.PositiveIntegerField(default=0)
+    last_scan_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'location_throughput'
+        verbose_name = 'Location Throughput'
+        verbose_name_plural = 'Location Throughput'
+        constraints = [
+            models.UniqueConstraint(fields=['event', 'location'], name='location_throughput_event_location_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.location or '(no location)'} @ {self.event_id}"
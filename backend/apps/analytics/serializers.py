@@ -0,0 +1,41 @@
+from rest_framework import serializers
+
+
+class EventIdsField(serializers.CharField):
+    """Comma-separated event IDs, returned as a list."""
+
+    def to_internal_value(self, data):
+        value = super().to_internal_value(data)
+        return [event_id.strip() for event_id in value.split(',') if event_id.strip()]
+
+
+class UniqueAttendeeQuerySerializer(serializers.Serializer):
+    events = EventIdsField(required=False)
+    location = serializers.CharField(required=False)
+    start = serializers.DateField(required=False)
+    end = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        if attrs.get('start') and attrs.get('end') and attrs['start'] > attrs['end']:
+            raise serializers.ValidationError("start must be on or before end")
+        return attrs
+
+
+class EventSeriesQuerySerializer(serializers.Serializer):
+    events = EventIdsField()
+
+    def validate_events(self, value):
+        if not value:
+            raise serializers.ValidationError("At least one event ID is required.")
+        if len(value) > 100:
+            raise serializers.ValidationError("At most 100 events can be compared at once.")
+        return list(dict.fromkeys(value))
+
+
+class RepeatAttendeeQuerySerializer(serializers.Serializer):
+    events = EventIdsField(required=False)
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=500)
+
+
+class ThroughputQuerySerializer(serializers.Serializer):
+    idle_after = serializers.IntegerField(required=False, default=120, min_value=10, max_value=3600)
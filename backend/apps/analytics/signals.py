@@ -0,0 +1,79 @@
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.jobs.registry import enqueue
+from apps.scans.models import ScanLog
+from apps.scans.signals import scan_folded, scans_purged, scans_reclassified
+from .attendance import record_attendance
+from .locations import record_location_scan
+from .sketches import queue_fold, rebuild_day_sketches
+from .throughput import record_scan
+
+
+@receiver(post_save, sender=ScanLog)
+def update_attendee_sketches(sender, instance, created, **kwargs):
+    """Queue the event's sketch fold once a new successful scan is committed."""
+    if not created or instance.status != 'SUCCESS':
+        return
+    transaction.on_commit(lambda: queue_fold(instance.event_id))
+
+
+@receiver(post_save, sender=ScanLog)
+def update_attendance_index(sender, instance, created, **kwargs):
+    """Record the student's first successful scan at the event in the attendance index."""
+    if not created or instance.status != 'SUCCESS':
+        return
+    transaction.on_commit(
+        lambda: record_attendance(instance.event_id, instance.student_id, instance.timestamp)
+    )
+
+
+@receiver(post_save, sender=ScanLog)
+def update_scanner_throughput(sender, instance, created, **kwargs):
+    """Count every new scan, whatever its outcome, towards the scanner's live throughput."""
+    if not created:
+        return
+    transaction.on_commit(
+        lambda: record_scan(instance.event_id, instance.scanner_id, instance.timestamp, instance.status == 'SUCCESS')
+    )
+
+
+@receiver(post_save, sender=ScanLog)
+def update_location_rollup(sender, instance, created, **kwargs):
+    """Count every new scan towards the rollup of the door it was taken at."""
+    if not created:
+        return
+    transaction.on_commit(
+        lambda: record_location_scan(instance.event_id, instance.location, instance.status, instance.timestamp)
+    )
+
+
+@receiver(scan_folded)
+def count_folded_scan(sender, scan_log, scanner_id, location, timestamp, **kwargs):
+    """A collapsed repeat duplicate is still a scan for the scanner and door throughput."""
+    event_id = scan_log.event_id
+    transaction.on_commit(lambda: record_scan(event_id, scanner_id, timestamp, False))
+    transaction.on_commit(lambda: record_location_scan(event_id, location, 'DUPLICATE', timestamp))
+
+
+def queue_rebuild(event_id):
+    # Keyed per event, so repeated changes before a worker gets to it rebuild once
+    enqueue('analytics.rebuild_events', key=f'event:{event_id}', event_ids=[event_id])
+
+
+@receiver(scans_reclassified)
+def rebuild_after_reclassification(sender, event_id, **kwargs):
+    """Statuses changed in bulk: rebuild everything that counts SUCCESS or DUPLICATE scans."""
+    queue_rebuild(event_id)
+
+
+@receiver(scans_purged)
+def rebuild_after_purge(sender, event_ids, days=(), **kwargs):
+    """
+    Scans are gone: recount the live events that lost some (deleted scanner) and
+    drop a deleted event's students from the day sketches it contributed to.
+    """
+    for event_id in event_ids:
+        queue_rebuild(event_id)
+    rebuild_day_sketches(days)
@@ -0,0 +1,218 @@
+"""
+Maintenance and querying of per-event and per-day attendee sketches, and of
+the per-door sketches behind the location rollup's unique students.
+
+New successful scans are not added on the request thread. Each event sketch
+records the highest scan ``seq`` it includes (``folded_seq``), and the
+``analytics.fold_attendees`` job adds the event's later SUCCESS scans to the
+event, event-day, day and door sketches in batches, writing each sketch once
+per batch. The day sketches, shared by every event, are only locked by workers.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.jobs.registry import enqueue
+from apps.scans.models import ScanLog, normalize_student_id
+from . import hll
+from .models import AttendeeSketch, LocationSketch
+
+FOLD_BATCH_SIZE = 5000
+
+
+def sketch_key(event_id=None, day=None):
+    parts = []
+    if event_id is not None:
+        parts.append(f'event:{event_id}')
+    if day is not None:
+        parts.append(f'day:{day.isoformat()}')
+    return ':'.join(parts)
+
+
+def queue_fold(event_id):
+    """Have a worker add the event's new successful scans to its sketches."""
+    # Keyed per event: scans committed while a fold is queued are picked up by it
+    enqueue('analytics.fold_attendees', key=f'event:{event_id}', event_id=event_id)
+
+
+def _locked_sketch(event_id, day):
+    sketch, _ = AttendeeSketch.objects.select_for_update().get_or_create(
+        key=sketch_key(event_id, day),
+        defaults={'event_id': event_id, 'day': day, 'registers': hll.empty_registers()},
+    )
+    return sketch
+
+
+def _locked_location_sketch(event_id, location):
+    sketch, _ = LocationSketch.objects.select_for_update().get_or_create(
+        event_id=event_id, location=location, defaults={'registers': hll.empty_registers()},
+    )
+    return sketch
+
+
+def _raise_registers(sketch, positions):
+    """Raise the sketch's registers to the given (index, rank) positions. Returns True if any changed."""
+    registers = bytearray(sketch.registers)
+    changed = False
+    for index, rank in positions:
+        if registers[index] < rank:
+            registers[index] = rank
+            changed = True
+    if changed:
+        sketch.registers = bytes(registers)
+    return changed
+
+
+def fold_attendees(event_id, batch_size=FOLD_BATCH_SIZE):
+    """
+    Add the event's SUCCESS scans newer than its sketch's ``folded_seq`` to the
+    event, event-day, day and door sketches. Returns the number of scans folded.
+    """
+    folded = 0
+    while True:
+        with transaction.atomic():
+            # The event sketch is locked first, then day scopes in date order, then doors
+            event_sketch = _locked_sketch(event_id, None)
+            rows = list(
+                ScanLog.objects
+                .filter(event_id=event_id, status='SUCCESS', seq__gt=event_sketch.folded_seq)
+                .order_by('seq')
+                .values_list('seq', 'student_id', 'timestamp', 'location')[:batch_size]
+            )
+            if not rows:
+                return folded
+
+            by_day = defaultdict(list)
+            by_location = defaultdict(list)
+            for _, student_id, timestamp, location in rows:
+                position = hll.position(normalize_student_id(student_id))
+                by_day[timezone.localdate(timestamp)].append(position)
+                by_location[location or ''].append(position)
+            for day in sorted(by_day):
+                for sketch in (_locked_sketch(event_id, day), _locked_sketch(None, day)):
+                    if _raise_registers(sketch, by_day[day]):
+                        sketch.save(update_fields=['registers', 'updated_at'])
+                _raise_registers(event_sketch, by_day[day])
+            for location in sorted(by_location):
+                sketch = _locked_location_sketch(event_id, location)
+                if _raise_registers(sketch, by_location[location]):
+                    sketch.save(update_fields=['registers', 'updated_at'])
+            event_sketch.folded_seq = rows[-1][0]
+            event_sketch.save(update_fields=['registers', 'folded_seq', 'updated_at'])
+        folded += len(rows)
+
+
+def _store(key, event_id, day, registers, folded_seq=0):
+    AttendeeSketch.objects.update_or_create(
+        key=key, defaults={'event_id': event_id, 'day': day, 'registers': registers, 'folded_seq': folded_seq}
+    )
+
+
+def rebuild_sketches(event_ids=None):
+    """
+    Recompute sketches from scan_logs, for all events or only the given ones.
+
+    Event-day and door sketches are built from the raw SUCCESS scans; event
+    and day sketches are then derived by merging them. Each event sketch is
+    marked as folded up to the highest seq read, so fold_attendees continues
+    from there. Returns the number of sketches written.
+    """
+    scans = ScanLog.objects.filter(status='SUCCESS').order_by()
+    if event_ids is not None:
+        scans = scans.filter(event_id__in=event_ids)
+
+    event_day = defaultdict(lambda: bytearray(hll.REGISTER_COUNT))
+    doors = defaultdict(lambda: bytearray(hll.REGISTER_COUNT))
+    folded_seq = defaultdict(int)
+    rows = scans.values_list('event_id', 'seq', 'student_id', 'timestamp', 'location').iterator()
+    for event_id, seq, student_id, timestamp, location in rows:
+        folded_seq[event_id] = max(folded_seq[event_id], seq)
+        index, rank = hll.position(normalize_student_id(student_id))
+        for registers in (event_day[(event_id, timezone.localdate(timestamp))], doors[(event_id, location or '')]):
+            if registers[index] < rank:
+                registers[index] = rank
+
+    with transaction.atomic():
+        stale = AttendeeSketch.objects.filter(event__isnull=False)
+        if event_ids is not None:
+            stale = stale.filter(event_id__in=event_ids)
+        touched_days = set(stale.exclude(day__isnull=True).values_list('day', flat=True))
+        stale.delete()
+        stale_doors = LocationSketch.objects.all()
+        if event_ids is not None:
+            stale_doors = stale_doors.filter(event_id__in=event_ids)
+        stale_doors.delete()
+
+        written = 0
+        by_event = defaultdict(list)
+        for (event_id, day), registers in event_day.items():
+            _store(sketch_key(event_id, day), event_id, day, bytes(registers))
+            by_event[event_id].append(bytes(registers))
+            touched_days.add(day)
+            written += 1
+        for event_id, parts in by_event.items():
+            _store(sketch_key(event_id), event_id, None, hll.merge(parts), folded_seq[event_id])
+            written += 1
+        LocationSketch.objects.bulk_create([
+            LocationSketch(event_id=event_id, location=location, registers=bytes(registers))
+            for (event_id, location), registers in doors.items()
+        ], batch_size=100)
+        written += len(doors)
+
+        written += rebuild_day_sketches(touched_days)
+
+    return written
+
+
+def rebuild_day_sketches(days):
+    """
+    Re-derive the cross-event sketches of these days from the event-day sketches.
+
+    Day sketches span every event, so they need this whenever an event's
+    event-day sketches are rebuilt or deleted. Returns the number written.
+    """
+    written = 0
+    with transaction.atomic():
+        for day in days:
+            parts = [
+                bytes(part) for part in
+                AttendeeSketch.objects.filter(day=day, event__isnull=False).values_list('registers', flat=True)
+            ]
+            if parts:
+                _store(sketch_key(day=day), None, day, hll.merge(parts))
+                written += 1
+            else:
+                AttendeeSketch.objects.filter(key=sketch_key(day=day)).delete()
+    return written
+
+
+def estimate_unique_attendees(event_ids=None, start=None, end=None):
+    """
+    Estimate unique students across a set of events and/or a date range.
+
+    With no filter at all, every event's all-time sketch is merged.
+    Returns (estimate, sketches merged).
+    """
+    sketches = AttendeeSketch.objects.all()
+    if event_ids is not None:
+        sketches = sketches.filter(event_id__in=event_ids)
+    elif start is None and end is None:
+        # There is no global sketch; the union of all events is the union of their sketches
+        sketches = sketches.filter(event__isnull=False)
+    else:
+        sketches = sketches.filter(event__isnull=True)
+
+    if start is None and end is None:
+        sketches = sketches.filter(day__isnull=True)
+    else:
+        sketches = sketches.filter(day__isnull=False)
+        if start is not None:
+            sketches = sketches.filter(day__gte=start)
+        if end is not None:
+            sketches = sketches.filter(day__lte=end)
+
+    parts = [bytes(registers) for registers in sketches.values_list('registers', flat=True)]
+    if not parts:
+        return 0, 0
+    return round(hll.estimate(hll.merge(parts))), len(parts)
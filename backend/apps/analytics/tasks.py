@@ -0,0 +1,31 @@
+from apps.jobs.registry import task
+from .attendance import rebuild_attendance
+from .locations import rebuild_location_rollups
+from .sketches import fold_attendees, rebuild_sketches
+from .throughput import refresh_scanner_totals
+
+REBUILD_STEPS = (
+    ('attendee sketches', rebuild_sketches),
+    ('attendance index', rebuild_attendance),
+    ('door rollups', rebuild_location_rollups),
+    ('scanner totals', refresh_scanner_totals),
+)
+
+
+def rebuild_event_analytics(event_ids, progress=None):
+    """Recompute every per-event analytics table of the given events from scan_logs."""
+    for done, (label, rebuild) in enumerate(REBUILD_STEPS):
+        if progress:
+            progress(done, len(REBUILD_STEPS), label)
+        rebuild(event_ids)
+
+
+@task('analytics.rebuild_events')
+def rebuild_events(job, event_ids):
+    rebuild_event_analytics(event_ids, job.report_progress)
+    return {'event_ids': event_ids}
+
+
+@task('analytics.fold_attendees')
+def fold_event_attendees(job, event_id):
+    return {'folded': fold_attendees(event_id)}
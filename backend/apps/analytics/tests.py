@@ -0,0 +1,130 @@
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.events.models import Event
+from apps.jobs.models import Job
+from apps.jobs.worker import work
+from apps.scans.models import ScanLog
+from apps.scans import students
+from apps.scans.purge import purge
+from apps.users.models import User
+from .attendance import overlap_matrix, rebuild_attendance
+from .models import StudentAttendance
+from .sketches import estimate_unique_attendees, rebuild_sketches
+
+
+# The replica connection cannot see the test's uncommitted rows: read from the primary
+@override_settings(REPLICA_DATABASE_ALIAS=None)
+class AnalyticsTestCase(TestCase):
+    def setUp(self):
+        # The student cache is per process and would outlive the rolled-back rows of earlier tests
+        students._intern_cache.clear()
+        self.admin = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def scan(self, event, student_id, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return ScanLog.objects.create(event=event, scanner=self.scanner, student_id=student_id, **fields)
+
+
+class UniqueAttendeeTests(AnalyticsTestCase):
+    def test_unfiltered_estimate_counts_every_event(self):
+        first = Event.objects.create(name='First', is_permanent=True)
+        second = Event.objects.create(name='Second', is_permanent=True)
+        for index in range(20):
+            self.scan(first, f'S{index:04d}')
+        for index in range(10, 30):
+            self.scan(second, f'S{index:04d}')
+        work(burst=True)
+
+        response = self.client.get('/api/analytics/unique-attendees/')
+        self.assertEqual(response.status_code, 200)
+        self.assertAlmostEqual(response.data['unique_attendees'], 30, delta=1)
+        self.assertEqual(response.data['sketches_merged'], 2)
+
+        rebuild_sketches()
+        response = self.client.get('/api/analytics/unique-attendees/')
+        self.assertAlmostEqual(response.data['unique_attendees'], 30, delta=1)
+
+    def test_fold_continues_after_a_rebuild(self):
+        event = Event.objects.create(name='Fair', is_permanent=True)
+        self.scan(event, 'S0001')
+        self.scan(event, 'S0002', status='ERROR')
+        # Nothing is added on the request thread
+        self.assertEqual(estimate_unique_attendees([event.id])[0], 0)
+        work(burst=True)
+        self.assertEqual(estimate_unique_attendees([event.id])[0], 1)
+
+        rebuild_sketches([event.id])
+        self.scan(event, 'S0003')
+        work(burst=True)
+        self.assertEqual(Job.objects.filter(kind='analytics.fold_attendees').first().result, {'folded': 1})
+        today = timezone.localdate()
+        self.assertEqual(estimate_unique_attendees([event.id])[0], 2)
+        self.assertEqual(estimate_unique_attendees(start=today, end=today)[0], 2)
+
+    def test_purged_event_leaves_the_day_sketch(self):
+        kept = Event.objects.create(name='Kept', is_permanent=True)
+        purged = Event.objects.create(name='Purged', is_permanent=True)
+        for index in range(10):
+            self.scan(kept, f'S{index:04d}')
+        for index in range(10, 30):
+            self.scan(purged, f'S{index:04d}')
+        work(burst=True)
+        today = timezone.localdate()
+        self.assertAlmostEqual(estimate_unique_attendees(start=today, end=today)[0], 30, delta=1)
+
+        purge(purged)
+        self.assertAlmostEqual(estimate_unique_attendees(start=today, end=today)[0], 10, delta=1)
+
+        purge(kept)
+        self.assertEqual(estimate_unique_attendees(start=today, end=today)[0], 0)
+
+
+class NormalizedStudentTests(AnalyticsTestCase):
+    def test_case_and_whitespace_variants_are_one_attendee(self):
+        first = Event.objects.create(name='First', is_permanent=True)
+        second = Event.objects.create(name='Second', is_permanent=True)
+        self.scan(first, 'abc1')
+        self.scan(first, ' ABC1')
+        self.scan(second, 'Abc1 ')
+        work(burst=True)
+
+        for rebuilt in (False, True):
+            if rebuilt:
+                rebuild_sketches()
+                rebuild_attendance()
+            self.assertEqual(estimate_unique_attendees([first.id])[0], 1)
+            self.assertEqual(estimate_unique_attendees()[0], 1)
+            self.assertEqual(
+                set(StudentAttendance.objects.values_list('event_id', 'student_id')),
+                {(first.id, 'ABC1'), (second.id, 'ABC1')},
+            )
+            self.assertEqual(overlap_matrix([first.id, second.id]), [[1, 1], [1, 1]])
+
+
+class LocationRollupTests(AnalyticsTestCase):
+    def doors(self, event):
+        response = self.client.get(f'/api/analytics/events/{event.pk}/locations/')
+        self.assertEqual(response.status_code, 200)
+        return {door['location']: door for door in response.data['locations']}
+
+    def test_admissions_and_unique_students_per_door(self):
+        event = Event.objects.create(name='Gala', is_permanent=True, duplicate_policy='ALLOW_DUPLICATES')
+        for _ in range(3):
+            self.scan(event, 'S0001', location='North')
+        self.scan(event, 'S0002', location='South', status='DUPLICATE')
+        self.scan(event, 'S0003', location='North')
+        work(burst=True)
+
+        doors = self.doors(event)
+        self.assertEqual((doors['North']['admissions'], doors['North']['total_scans']), (4, 4))
+        self.assertEqual(doors['North']['unique_students'], 2)
+        self.assertEqual((doors['South']['admissions'], doors['South']['duplicate_scans']), (0, 1))
+        self.assertEqual(doors['South']['unique_students'], 0)
+
+        rebuild_sketches([event.id])
+        self.assertEqual(self.doors(event)['North']['unique_students'], 2)
@@ -0,0 +1,164 @@
+"""
+Live per-scanner throughput, maintained incrementally as scans arrive.
+
+Each (event, scanner) row holds two fixed-size ring buffers:
+
+* ``minute_counts``: WINDOW_MINUTES unsigned 16-bit counters; the counter for
+  epoch minute ``m`` lives in slot ``m % WINDOW_MINUTES`` and is valid while
+  ``m`` is within WINDOW_MINUTES of ``newest_minute``.
+* ``recent_gaps``: the last GAP_SAMPLES gaps between consecutive scans, in
+  milliseconds; gap number ``n`` lives in slot ``n % GAP_SAMPLES``.
+
+Reads only touch these rows, never scan_logs.
+"""
+import statistics
+from array import array
+
+from django.db import transaction
+from django.db.models import Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apps.scans.models import ScanLog
+from .models import ScannerThroughput
+
+WINDOW_MINUTES = 15
+GAP_SAMPLES = 32
+MAX_COUNT = 0xFFFF
+MAX_GAP_MS = 0xFFFFFFFF
+
+
+def _epoch_minute(timestamp):
+    return int(timestamp.timestamp()) // 60
+
+
+def _empty(typecode, size):
+    return array(typecode, [0] * size)
+
+
+def _load(typecode, data, size):
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    return values if len(values) == size else _empty(typecode, size)
+
+
+def empty_minute_counts():
+    return _empty('H', WINDOW_MINUTES).tobytes()
+
+
+def count_in_minute(row, timestamp):
+    """Add one scan at ``timestamp`` to ``row.minute_counts``, advancing the ring as needed."""
+    minute = _epoch_minute(timestamp)
+    counts = _load('H', row.minute_counts, WINDOW_MINUTES)
+    if minute > row.newest_minute:
+        # Zero the slots of the minutes that passed without scans
+        for skipped in range(max(row.newest_minute + 1, minute - WINDOW_MINUTES + 1), minute + 1):
+            counts[skipped % WINDOW_MINUTES] = 0
+        row.newest_minute = minute
+    if minute > row.newest_minute - WINDOW_MINUTES:
+        slot = minute % WINDOW_MINUTES
+        counts[slot] = min(counts[slot] + 1, MAX_COUNT)
+    row.minute_counts = counts.tobytes()
+
+
+def record_scan(event_id, scanner_id, timestamp, success):
+    """Fold one scan into the scanner's ring buffers."""
+    with transaction.atomic():
+        row, _ = ScannerThroughput.objects.select_for_update().get_or_create(
+            event_id=event_id, scanner_id=scanner_id,
+            defaults={
+                'minute_counts': empty_minute_counts(),
+                'recent_gaps': _empty('I', GAP_SAMPLES).tobytes(),
+            },
+        )
+        count_in_minute(row, timestamp)
+        gaps = _load('I', row.recent_gaps, GAP_SAMPLES)
+
+        # Late (offline-synced) scans still count, but do not describe the current pace
+        if row.last_scan_at is not None and timestamp >= row.last_scan_at:
+            gap_ms = int((timestamp - row.last_scan_at).total_seconds() * 1000)
+            gaps[row.gap_count % GAP_SAMPLES] = min(gap_ms, MAX_GAP_MS)
+            row.gap_count += 1
+        if row.last_scan_at is None or timestamp > row.last_scan_at:
+            row.last_scan_at = timestamp
+
+        row.total_scans += 1
+        if success:
+            row.success_scans += 1
+        row.recent_gaps = gaps.tobytes()
+        row.save()
+
+
+def refresh_scanner_totals(event_ids):
+    """Recompute total and success counts from scan_logs, leaving the ring buffers as they are."""
+    totals = (
+        ScanLog.objects.filter(event_id__in=event_ids).order_by()
+        .values('event_id', 'scanner_id')
+        .annotate(total=Sum('attempts'), success=Coalesce(Sum('attempts', filter=Q(status='SUCCESS')), 0))
+    )
+    updated = 0
+    for item in totals:
+        updated += ScannerThroughput.objects.filter(
+            event_id=item['event_id'], scanner_id=item['scanner_id']
+        ).update(total_scans=item['total'], success_scans=item['success'])
+    return updated
+
+
+def scans_in_window(row, minutes, now=None):
+    """Scans in the last ``minutes`` minutes, including the current partial minute."""
+    current = _epoch_minute(now or timezone.now())
+    counts = _load('H', row.minute_counts, WINDOW_MINUTES)
+    oldest = max(current - minutes + 1, row.newest_minute - WINDOW_MINUTES + 1)
+    return sum(counts[minute % WINDOW_MINUTES] for minute in range(oldest, min(current, row.newest_minute) + 1))
+
+
+def median_gap_seconds(row):
+    """Median time between the scanner's recent scans, or None before the second scan."""
+    samples = min(row.gap_count, GAP_SAMPLES)
+    if not samples:
+        return None
+    gaps = _load('I', row.recent_gaps, GAP_SAMPLES)[:samples]
+    return round(statistics.median(gaps) / 1000, 1)
+
+
+def leaderboard(event, idle_after, now=None):
+    """
+    Throughput of every scanner assigned to or active at the event, busiest first.
+
+    Scanners with no scan in the last ``idle_after`` seconds are marked idle.
+    """
+    now = now or timezone.now()
+    rows = {
+        row.scanner_id: row
+        for row in ScannerThroughput.objects.filter(event=event).select_related('scanner')
+    }
+    locations = {}
+    names = {}
+    for assignment in event.event_users.select_related('user'):
+        locations[assignment.user_id] = assignment.location
+        names[assignment.user_id] = assignment.user.name
+    for scanner_id, row in rows.items():
+        names.setdefault(scanner_id, row.scanner.name)
+
+    board = []
+    for scanner_id, name in names.items():
+        row = rows.get(scanner_id)
+        last_scan_at = row.last_scan_at if row else None
+        scans_5 = scans_in_window(row, 5, now) if row else 0
+        scans_15 = scans_in_window(row, 15, now) if row else 0
+        board.append({
+            'user_id': scanner_id,
+            'user_name': name,
+            'location': locations.get(scanner_id),
+            'scans_last_5m': scans_5,
+            'scans_last_15m': scans_15,
+            'scans_per_minute_5m': round(scans_5 / 5, 2),
+            'scans_per_minute_15m': round(scans_15 / 15, 2),
+            'median_seconds_between_scans': median_gap_seconds(row) if row else None,
+            'total_scans': row.total_scans if row else 0,
+            'success_scans': row.success_scans if row else 0,
+            'last_scan_at': last_scan_at,
+            'idle': last_scan_at is None or (now - last_scan_at).total_seconds() > idle_after,
+        })
+    board.sort(key=lambda entry: (-entry['scans_last_5m'], -entry['scans_last_15m'], entry['user_name']))
+    return board
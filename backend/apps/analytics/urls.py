@@ -0,0 +1,13 @@
+from django.urls import path
+from . import views
+
+app_name = 'analytics'
+
+urlpatterns = [
+    path('unique-attendees/', views.unique_attendees_view, name='unique-attendees'),
+    path('overlap/', views.event_overlap_view, name='event-overlap'),
+    path('retention/', views.event_retention_view, name='event-retention'),
+    path('repeat-attendees/', views.repeat_attendees_view, name='repeat-attendees'),
+    path('events/<str:event_id>/throughput/', views.scanner_throughput_view, name='scanner-throughput'),
+    path('events/<str:event_id>/locations/', views.location_rollup_view, name='location-rollup'),
+]
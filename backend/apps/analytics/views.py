@@ -0,0 +1,141 @@
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from core.db_router import replica_reads
+from apps.events.models import Event
+from apps.users.permissions import IsAdminUser
+from . import hll
+from .attendance import overlap_matrix, retention, top_repeat_attendees
+from .serializers import (
+    EventSeriesQuerySerializer, RepeatAttendeeQuerySerializer, ThroughputQuerySerializer, UniqueAttendeeQuerySerializer,
+)
+from .sketches import estimate_unique_attendees
+from .locations import location_rollup
+from .throughput import leaderboard
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@replica_reads
+def unique_attendees_view(request):
+    """
+    Estimated unique attendees over any set of events and/or date range.
+
+    Answered by merging precomputed HyperLogLog sketches; see apps.analytics.hll
+    for the error bounds.
+    """
+    query = UniqueAttendeeQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = query.validated_data
+
+    event_ids = params.get('events')
+    if params.get('location'):
+        at_location = Event.objects.filter(location=params['location'])
+        if event_ids is not None:
+            at_location = at_location.filter(pk__in=event_ids)
+        event_ids = list(at_location.values_list('id', flat=True))
+
+    estimate, merged = estimate_unique_attendees(event_ids, params.get('start'), params.get('end'))
+    return Response({
+        'unique_attendees': estimate,
+        'standard_error': round(hll.STANDARD_ERROR, 4),
+        'margin_95': round(estimate * 2 * hll.STANDARD_ERROR),
+        'sketches_merged': merged,
+    })
+
+
+def _event_summaries(event_ids):
+    names = dict(Event.objects.filter(pk__in=event_ids).values_list('id', 'name'))
+    return [{'id': event_id, 'name': names.get(event_id)} for event_id in event_ids]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@replica_reads
+def event_overlap_view(request):
+    """
+    Pairwise attendee overlap between events: ``matrix[i][j]`` students attended both.
+
+    The diagonal holds each event's own attendee count.
+    """
+    query = EventSeriesQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    event_ids = query.validated_data['events']
+
+    return Response({
+        'events': _event_summaries(event_ids),
+        'matrix': overlap_matrix(event_ids),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@replica_reads
+def event_retention_view(request):
+    """Attendee retention through a series of events, in the order given."""
+    query = EventSeriesQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    event_ids = query.validated_data['events']
+
+    steps = retention(event_ids)
+    for step, summary in zip(steps, _event_summaries(event_ids)):
+        step['event_name'] = summary['name']
+    return Response({'series': steps})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+@replica_reads
+def repeat_attendees_view(request):
+    """Students who attended the most events, optionally within a set of events."""
+    query = RepeatAttendeeQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    params = query.validated_data
+
+    return Response({
+        'results': top_repeat_attendees(params['limit'], params.get('events')),
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def scanner_throughput_view(request, event_id):
+    """
+    Live scans per minute for each scanner at an event over the last 5 and 15 minutes.
+
+    Served from the rolling counters in apps.analytics.throughput, so it stays
+    cheap to poll during peak; reads the primary to stay current.
+    """
+    query = ThroughputQuerySerializer(data=request.query_params)
+    query.is_valid(raise_exception=True)
+    idle_after = query.validated_data['idle_after']
+
+    event = get_object_or_404(Event, pk=event_id)
+    now = timezone.now()
+    scanners = leaderboard(event, idle_after, now)
+    return Response({
+        'event_id': event.id,
+        'generated_at': now,
+        'idle_after_seconds': idle_after,
+        'idle_scanners': sum(1 for scanner in scanners if scanner['idle']),
+        'scanners': scanners,
+    })
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def location_rollup_view(request, event_id):
+    """
+    Live per-door stats for an event: scans per minute, students admitted and duplicate rate.
+
+    Served from the per-location rollup rows, never from scan_logs.
+    """
+    event = get_object_or_404(Event, pk=event_id)
+    now = timezone.now()
+    return Response({
+        'event_id': event.id,
+        'generated_at': now,
+        'locations': location_rollup(event, now),
+    })
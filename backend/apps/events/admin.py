@@ -1,5 +1,7 @@
 from django.contrib import admin
-from .models import Event, EventUser
+from core.admin import AutocompleteFilter, LargeTableAdmin, MarkDeletedAdminMixin
+from apps.jobs.registry import enqueue
+from .models import Event, EventReportSnapshot, EventUser
 
 
 class EventUserInline(admin.TabularInline):
@@ -9,7 +11,7 @@ class EventUserInline(admin.TabularInline):
 
 
 @admin.register(Event)
-class EventAdmin(admin.ModelAdmin):
+class EventAdmin(MarkDeletedAdminMixin, admin.ModelAdmin):
     list_display = ('name', 'date', 'location', 'status', 'scanning_enabled', 'created_at')
     list_filter = ('status', 'scanning_enabled', 'created_at', 'date')
     search_fields = ('name', 'location', 'description')
@@ -19,16 +21,40 @@ class EventAdmin(admin.ModelAdmin):
     fieldsets = (
         (None, {'fields': ('name', 'description')}),
         ('Event Details', {'fields': ('date', 'time_range', 'location')}),
-        ('Settings', {'fields': ('scanning_enabled', 'status')}),
+        ('Settings', {'fields': ('scanning_enabled', 'status', 'duplicate_policy', 'collapse_duplicates')}),
         ('Timestamps', {'fields': ('created_at', 'updated_at')}),
     )
     
     readonly_fields = ('created_at', 'updated_at')
+    actions = ['rebuild_reports', 'reclassify_scans']
+    
+    @admin.action(description='Rebuild report snapshots')
+    def rebuild_reports(self, request, queryset):
+        event_ids = list(queryset.with_status('COMPLETED').values_list('id', flat=True))
+        job = enqueue('events.build_reports', created_by=request.user, event_ids=event_ids)
+        self.message_user(request, f'Queued job {job.pk} to rebuild {len(event_ids)} report snapshot(s).')
+    
+    @admin.action(description='Recompute scan statuses under the duplicate policy')
+    def reclassify_scans(self, request, queryset):
+        jobs = [
+            enqueue('scans.reclassify', key=f'event:{event_id}', created_by=request.user, event_id=event_id)
+            for event_id in queryset.values_list('id', flat=True)
+        ]
+        self.message_user(request, f"Queued reclassification job(s) {', '.join(str(job.pk) for job in jobs)}.")
 
 
 @admin.register(EventUser)
-class EventUserAdmin(admin.ModelAdmin):
+class EventUserAdmin(LargeTableAdmin):
     list_display = ('event', 'user', 'location')
-    list_filter = ('event', 'user__role')
+    list_filter = (('event', AutocompleteFilter), 'user__role')
+    list_select_related = ('event', 'user')
     search_fields = ('event__name', 'user__name', 'location')
     autocomplete_fields = ['event', 'user']
+
+
+@admin.register(EventReportSnapshot)
+class EventReportSnapshotAdmin(admin.ModelAdmin):
+    list_display = ('event', 'scan_seq', 'event_updated_at', 'built_at')
+    list_select_related = ('event',)
+    exclude = ('payload',)
+    readonly_fields = ('event', 'scan_seq', 'event_updated_at', 'built_at')
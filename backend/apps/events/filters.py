@@ -0,0 +1,14 @@
+import django_filters
+from .models import Event
+
+
+class EventFilter(django_filters.FilterSet):
+    # Filters on the computed status so results never depend on when the row was last saved
+    status = django_filters.ChoiceFilter(choices=Event.STATUS_CHOICES, method='filter_status')
+
+    class Meta:
+        model = Event
+        fields = ['status', 'scanning_enabled']
+
+    def filter_status(self, queryset, name, value):
+        return queryset.with_status(value)
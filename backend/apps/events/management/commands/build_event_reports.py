@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event
+from apps.events.reports import materialize_completed_reports, stale_completed_events
+
+
+class Command(BaseCommand):
+    help = 'Build report snapshots for completed events (stale or missing ones, or the given events).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='*', help='Rebuild only these completed events, even if current.')
+
+    def handle(self, *args, **options):
+        if options['event_ids']:
+            events = Event.objects.with_status('COMPLETED').filter(pk__in=options['event_ids'])
+        else:
+            events = stale_completed_events()
+        built = materialize_completed_reports(events)
+        self.stdout.write(f'Built {built} report snapshot(s).')
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.events.models import Event
+from apps.events.reports import materialize_completed_reports
+
+
+class Command(BaseCommand):
+    help = (
+        'Update the stored Event.status column for events whose computed status has changed '
+        'and build report snapshots for newly completed events.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and re-sync every N seconds (default: run once).'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+        while True:
+            changed = Event.objects.sync_status()
+            self.stdout.write(f'Updated status on {changed} event(s).')
+            built = materialize_completed_reports()
+            self.stdout.write(f'Built {built} report snapshot(s) for completed events.')
+            if not interval:
+                break
+            time.sleep(interval)
@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0003_event_duplicate_policy_event_end_date_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='scan_seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+    ]
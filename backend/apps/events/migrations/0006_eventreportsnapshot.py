@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_status_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventReportSnapshot',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='report_snapshot', serialize=False, to='events.event')),
+                ('payload', models.JSONField()),
+                ('scan_seq', models.PositiveBigIntegerField()),
+                ('event_updated_at', models.DateTimeField()),
+                ('built_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Event Report Snapshot',
+                'verbose_name_plural': 'Event Report Snapshots',
+                'db_table': 'event_report_snapshots',
+            },
+        ),
+    ]
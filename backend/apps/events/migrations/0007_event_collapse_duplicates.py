@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_eventreportsnapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='collapse_duplicates',
+            field=models.BooleanField(default=False),
+        ),
+    ]
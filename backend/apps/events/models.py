@@ -1,4 +1,7 @@
-from django.db import models
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Q
 from django.utils import timezone
 import uuid
 
@@ -7,6 +10,45 @@ def generate_uuid():
     return str(uuid.uuid4().hex[:25])
 
 
+class EventQuerySet(models.QuerySet):
+    def with_status(self, status, now=None):
+        """
+        Filter by computed status using range predicates on the timing fields.
+
+        Mirrors Event.calculated_status: permanent events are always ongoing,
+        events missing a start or end date fall back to the stored status.
+        """
+        now = now or timezone.now()
+        undated = Q(is_permanent=False) & (Q(start_date__isnull=True) | Q(end_date__isnull=True))
+        dated = Q(is_permanent=False, start_date__isnull=False, end_date__isnull=False)
+
+        if status == 'UPCOMING':
+            condition = dated & Q(start_date__gt=now)
+        elif status == 'ONGOING':
+            condition = Q(is_permanent=True) | (dated & Q(start_date__lte=now, end_date__gte=now))
+        elif status == 'COMPLETED':
+            condition = dated & Q(start_date__lte=now, end_date__lt=now)
+        else:
+            return self.none()
+
+        return self.filter(condition | (undated & Q(status=status)))
+
+    def sync_status(self, now=None):
+        """Bring the stored status column in line with the computed status. Returns rows changed."""
+        now = now or timezone.now()
+        changed = 0
+        for status, _ in Event.STATUS_CHOICES:
+            changed += self.with_status(status, now).exclude(status=status).update(status=status)
+        return changed
+
+
+class EventManager(models.Manager.from_queryset(EventQuerySet)):
+    """Default manager; hides events marked deleted that are waiting to be purged."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Event(models.Model):
     STATUS_CHOICES = [
         ('UPCOMING', 'Upcoming'),
@@ -44,14 +86,31 @@ class Event(models.Model):
         default='ONCE_PER_EVENT'
     )
     
+    # Fold repeat duplicate scans of a student into one DUPLICATE row (ScanLog.attempts)
+    collapse_duplicates = models.BooleanField(default=False)
+    
+    # Bumped on every scan write; combined with updated_at it versions the event's payload
+    scan_seq = models.PositiveBigIntegerField(default=0, editable=False)
+    
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set by mark_deleted(); the row and its scans are removed later by purge_deleted
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
+
+    objects = EventManager()
+    all_objects = EventQuerySet.as_manager()
 
     class Meta:
         db_table = 'events'
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
         ordering = ['-date']
+        indexes = [
+            # Range predicates used by EventQuerySet.with_status
+            models.Index(fields=['start_date', 'end_date'], name='events_start_end_idx'),
+            models.Index(fields=['end_date'], name='events_end_idx'),
+            models.Index(fields=['is_permanent', 'status'], name='events_permanent_status_idx'),
+        ]
 
     def __str__(self):
         return self.name
@@ -71,6 +130,18 @@ class Event(models.Model):
         
         super().save(*args, **kwargs)
     
+    def mark_deleted(self):
+        """
+        Hide the event and stop scanning at once, and queue a job that deletes
+        the row and its scans in small batches (apps.scans.purge). Returns the job.
+        """
+        from apps.jobs.registry import enqueue
+        with transaction.atomic():
+            self.deleted_at = timezone.now()
+            self.scanning_enabled = False
+            self.save(update_fields=['deleted_at', 'scanning_enabled', 'updated_at'])
+            return enqueue('scans.purge', key=f'event:{self.pk}', model='event', pk=self.pk)
+    
     @property
     def calculated_status(self):
         """Calculate status dynamically without saving to database."""
@@ -87,6 +158,82 @@ class Event(models.Model):
             return 'ONGOING'
         else:
             return 'COMPLETED'
+    
+    @property
+    def version_stamp(self):
+        """Cheap stamp that changes whenever the event's API payload may change."""
+        return f"{self.pk}:{self.updated_at.isoformat()}:{self.scan_seq}:{self.calculated_status}"
+
+
+def _location_cache_key(event_id, user_id):
+    return f'assignment-location:{event_id}:{user_id}'
+
+
+class EventUserManager(models.Manager):
+    # Cached value for "no assignment or no location", since None means a cache miss
+    NO_LOCATION = ''
+
+    def location_for(self, event_id, user_id):
+        """The door ``user_id`` is assigned to at the event, or None; cached for ASSIGNMENT_CACHE_SECONDS."""
+        key = _location_cache_key(event_id, user_id)
+        location = cache.get(key)
+        if location is None:
+            location = (
+                self.filter(event_id=event_id, user_id=user_id).values_list('location', flat=True).first()
+                or self.NO_LOCATION
+            )
+            cache.set(key, location, settings.ASSIGNMENT_CACHE_SECONDS)
+        return location or None
+
+    def forget_locations(self, event_id, user_ids):
+        """Drop cached locations once the current transaction commits (in every process only with a shared cache)."""
+        keys = [_location_cache_key(event_id, user_id) for user_id in user_ids]
+        if keys:
+            transaction.on_commit(lambda: cache.delete_many(keys))
+
+    def sync_for_event(self, event, user_ids, user_locations=None):
+        """
+        Make the event's assignments match ``user_ids`` by applying only the difference.
+
+        New users are inserted with bulk_create, users whose location changed are
+        relocated with bulk_update and dropped users are removed with a single
+        delete, all in one transaction. Returns (added, removed, relocated) counts.
+        """
+        user_locations = user_locations or {}
+        wanted = list(dict.fromkeys(user_ids))
+
+        with transaction.atomic():
+            existing = {
+                assignment.user_id: assignment
+                for assignment in self.filter(event=event).only('id', 'user_id', 'location')
+            }
+
+            to_add = []
+            to_relocate = []
+            for user_id in wanted:
+                location = user_locations.get(user_id, '')
+                assignment = existing.get(user_id)
+                if assignment is None:
+                    to_add.append(self.model(event=event, user_id=user_id, location=location))
+                elif (assignment.location or '') != location:
+                    assignment.location = location
+                    to_relocate.append(assignment)
+
+            wanted_set = set(wanted)
+            to_remove = [assignment.pk for user_id, assignment in existing.items() if user_id not in wanted_set]
+
+            if to_remove:
+                self.filter(pk__in=to_remove).delete()
+            if to_add:
+                self.bulk_create(to_add, batch_size=500)
+            if to_relocate:
+                self.bulk_update(to_relocate, ['location'], batch_size=500)
+
+            changed = [assignment.user_id for assignment in to_add + to_relocate]
+            changed += [user_id for user_id in existing if user_id not in wanted_set]
+            self.forget_locations(event.pk, changed)
+
+        return len(to_add), len(to_remove), len(to_relocate)
 
 
 class EventUser(models.Model):
@@ -96,6 +243,8 @@ class EventUser(models.Model):
     user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='event_users')
     location = models.CharField(max_length=255, null=True, blank=True)
 
+    objects = EventUserManager()
+
     class Meta:
         db_table = 'event_users'
         unique_together = ('event', 'user')
@@ -104,3 +253,39 @@ class EventUser(models.Model):
 
     def __str__(self):
         return f"{self.event.name} - {self.user.name}"
+    
+    def save(self, *args, **kwargs):
+        """Override save to drop the cached location used to attribute scans."""
+        super().save(*args, **kwargs)
+        EventUser.objects.forget_locations(self.event_id, [self.user_id])
+    
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        EventUser.objects.forget_locations(self.event_id, [self.user_id])
+        return result
+
+
+class EventReportSnapshot(models.Model):
+    """
+    Stored report payload (EventWithStatsSerializer output) for a completed event.
+
+    The snapshot is current while the event's ``scan_seq`` and ``updated_at``
+    match the values it was built from; late scans, overrides or edits make it
+    stale and it is rebuilt on next use (see apps.events.reports).
+    """
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='report_snapshot')
+    payload = models.JSONField()
+    scan_seq = models.PositiveBigIntegerField()
+    event_updated_at = models.DateTimeField()
+    built_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'event_report_snapshots'
+        verbose_name = 'Event Report Snapshot'
+        verbose_name_plural = 'Event Report Snapshots'
+
+    def __str__(self):
+        return f"Report for {self.event_id}"
+
+    def is_current(self, event):
+        return self.scan_seq == event.scan_seq and self.event_updated_at == event.updated_at
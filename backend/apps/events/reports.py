@@ -0,0 +1,64 @@
+"""
+Materialized report snapshots for completed events.
+
+A completed event's stats only change when late scans or overrides arrive
+(which bump Event.scan_seq) or the event itself is edited (updated_at), so the
+full EventWithStatsSerializer payload is computed once and stored.
+"""
+from django.db.models import F, Prefetch, Q
+
+from apps.jobs.registry import enqueue
+from .models import Event, EventReportSnapshot, EventUser
+
+
+def build_report(event):
+    """Compute and store the report payload for an event; returns the snapshot."""
+    from .serializers import EventWithStatsSerializer
+
+    # Record the version first: scans arriving during the build only make the snapshot stale
+    scan_seq, updated_at = event.scan_seq, event.updated_at
+    event = Event.objects.prefetch_related(
+        Prefetch('event_users', queryset=EventUser.objects.select_related('user'))
+    ).get(pk=event.pk)
+    snapshot, _ = EventReportSnapshot.objects.update_or_create(
+        event=event,
+        defaults={
+            'payload': EventWithStatsSerializer(event).data,
+            'scan_seq': scan_seq,
+            'event_updated_at': updated_at,
+        },
+    )
+    return snapshot
+
+
+def stored_report(event):
+    """The stored report payload for an event, or None if it is missing or stale."""
+    snapshot = EventReportSnapshot.objects.filter(pk=event.pk).first()
+    if snapshot is None or not snapshot.is_current(event):
+        return None
+    return snapshot.payload
+
+
+def queue_report(event_id):
+    # Keyed per event, so repeated views before a worker gets to it build once
+    enqueue('events.build_reports', key=f'event:{event_id}', event_ids=[event_id])
+
+
+def stale_completed_events():
+    """Completed events whose snapshot is missing or out of date."""
+    return Event.objects.with_status('COMPLETED').filter(
+        Q(report_snapshot__isnull=True)
+        | ~Q(report_snapshot__scan_seq=F('scan_seq'))
+        | ~Q(report_snapshot__event_updated_at=F('updated_at'))
+    )
+
+
+def materialize_completed_reports(events=None):
+    """Build snapshots for completed events that need one; returns how many were built."""
+    if events is None:
+        events = stale_completed_events()
+    built = 0
+    for event in events.only('id', 'scan_seq', 'updated_at').iterator():
+        build_report(event)
+        built += 1
+    return built
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from django.db.models import Count, Q
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from .models import Event, EventUser
 from apps.users.serializers import UserSerializer
@@ -31,7 +33,7 @@ class EventSerializer(serializers.ModelSerializer):
             'id', 'name', 'description', 'date', 'time_range', 'location',
             'scanning_enabled', 'status', 'created_at', 'updated_at',
             # Enhanced timing fields
-            'start_date', 'end_date', 'is_permanent', 'duplicate_policy',
+            'start_date', 'end_date', 'is_permanent', 'duplicate_policy', 'collapse_duplicates',
             'event_users', 'assigned_users', 'user_locations'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
@@ -40,15 +42,12 @@ class EventSerializer(serializers.ModelSerializer):
         assigned_users = validated_data.pop('assigned_users', [])
         user_locations = validated_data.pop('user_locations', {})
         
-        event = Event.objects.create(**validated_data)
-        
-        # Create EventUser instances for assigned users
-        for user_id in assigned_users:
-            EventUser.objects.create(
-                event=event,
-                user_id=user_id,
-                location=user_locations.get(user_id, '')
-            )
+        with transaction.atomic():
+            event = Event.objects.create(**validated_data)
+            
+            # Create EventUser instances for assigned users
+            if assigned_users:
+                EventUser.objects.sync_for_event(event, assigned_users, user_locations)
         
         return event
 
@@ -56,23 +55,15 @@ class EventSerializer(serializers.ModelSerializer):
         assigned_users = validated_data.pop('assigned_users', None)
         user_locations = validated_data.pop('user_locations', {})
         
-        # Update event fields
-        for attr, value in validated_data.items():
-            setattr(instance, attr, value)
-        instance.save()
-        
-        # Update assigned users if provided
-        if assigned_users is not None:
-            # Remove existing assignments
-            instance.event_users.all().delete()
+        with transaction.atomic():
+            # Update event fields
+            for attr, value in validated_data.items():
+                setattr(instance, attr, value)
+            instance.save()
             
-            # Create new assignments
-            for user_id in assigned_users:
-                EventUser.objects.create(
-                    event=instance,
-                    user_id=user_id,
-                    location=user_locations.get(user_id, '')
-                )
+            # Update assigned users if provided, touching only the rows that changed
+            if assigned_users is not None:
+                EventUser.objects.sync_for_event(instance, assigned_users, user_locations)
         
         return instance
     
@@ -94,18 +85,22 @@ class EventWithStatsSerializer(EventSerializer):
     class Meta(EventSerializer.Meta):
         fields = EventSerializer.Meta.fields + [
             'total_scans', 'unique_scans', 'duplicate_scans', 'error_scans',
-            'scans_by_hour', 'scanner_performance', 'peak_hour', 'logs'
+            'scans_by_hour', 'scanner_performance', 'peak_hour', 'logs',
+            # Cursor for polling /api/scan-logs/?event_id=...&since=<scan_seq>
+            'scan_seq'
         ]
+        read_only_fields = EventSerializer.Meta.read_only_fields + ['scan_seq']
 
     def get_total_scans(self, obj):
-        return obj.scan_logs.count()
+        # A collapsed DUPLICATE row stands for several attempts
+        return obj.scan_logs.aggregate(total=Coalesce(Sum('attempts'), 0))['total']
 
     def get_unique_scans(self, obj):
         # Count unique students who were successfully scanned
-        return obj.scan_logs.filter(status='SUCCESS').values('student_id').distinct().count()
+        return obj.scan_logs.filter(status='SUCCESS').values('student_key').distinct().count()
 
     def get_duplicate_scans(self, obj):
-        return obj.scan_logs.filter(status='DUPLICATE').count()
+        return obj.scan_logs.filter(status='DUPLICATE').aggregate(total=Coalesce(Sum('attempts'), 0))['total']
 
     def get_error_scans(self, obj):
         return obj.scan_logs.filter(status='ERROR').count()
@@ -159,6 +154,5 @@ class EventWithStatsSerializer(EventSerializer):
         return peak
 
     def get_logs(self, obj):
-        from apps.scans.serializers import ScanLogSerializer
-        logs = obj.scan_logs.select_related('scanner', 'event').order_by('-timestamp')[:50]
-        return ScanLogSerializer(logs, many=True).data
+        from apps.scans.serializers import render_scan_logs, scan_log_values
+        return render_scan_logs(scan_log_values(obj.scan_logs.order_by('-timestamp'))[:50])
@@ -0,0 +1,13 @@
+from apps.jobs.registry import task
+from .models import Event
+from .reports import build_report
+
+
+@task('events.build_reports')
+def build_reports(job, event_ids):
+    """Rebuild the report snapshots of the given completed events."""
+    events = list(Event.objects.with_status('COMPLETED').filter(pk__in=event_ids).only('id', 'scan_seq', 'updated_at'))
+    for done, event in enumerate(events):
+        job.report_progress(done, len(events), event.pk)
+        build_report(event)
+    return {'built': len(events)}
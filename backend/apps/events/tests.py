@@ -0,0 +1,105 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.jobs.models import Job
+from apps.jobs.worker import work
+from apps.scans import students
+from apps.scans.models import ScanLog
+from apps.users.models import User
+from .models import Event, EventReportSnapshot, EventUser
+from .views import EventListCreateView
+
+
+# The replica connection cannot see the test's uncommitted rows: read from the primary
+@override_settings(REPLICA_DATABASE_ALIAS=None)
+class EventListETagTests(TestCase):
+    def setUp(self):
+        # Interned student keys of earlier tests were rolled back
+        students._intern_cache.clear()
+        self.admin = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        now = timezone.now()
+        self.upcoming = Event.objects.create(
+            name='Fair', start_date=now + timedelta(hours=1), end_date=now + timedelta(hours=3),
+        )
+        self.permanent = Event.objects.create(name='Desk', is_permanent=True)
+        EventUser.objects.create(event=self.permanent, user=self.scanner, location='Main door')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def etag(self, **params):
+        response = self.client.get('/api/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_not_modified_until_the_list_changes(self):
+        etag = self.etag()
+        response = self.client.get('/api/events/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.etag(), etag)
+
+        self.permanent.name = 'Help desk'
+        self.permanent.save()
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_changes_with_scans_users_and_status(self):
+        etag = self.etag()
+        ScanLog.objects.create(event=self.permanent, scanner=self.scanner, student_id='S0001')
+        self.assertNotEqual(self.etag(), etag)
+
+        etag = self.etag()
+        User.objects.filter(pk=self.scanner.pk).update(name='Renamed', updated_at=timezone.now())
+        self.assertNotEqual(self.etag(), etag)
+
+        # Nothing is saved when the event starts; only the clock moves
+        etag = self.etag()
+        later = timezone.now() + timedelta(hours=2)
+        with mock.patch('django.utils.timezone.now', return_value=later):
+            statuses = {event['id']: event['status'] for event in self.client.get('/api/events/').data['results']}
+            self.assertEqual(statuses[self.upcoming.pk], 'ONGOING')
+            self.assertNotEqual(self.etag(), etag)
+
+    def test_filtered_stamp_is_one_query(self):
+        view = EventListCreateView()
+        view.request = view.initialize_request(RequestFactory().get('/api/events/', {'status': 'ONGOING'}))
+        view.format_kwarg = None
+        with CaptureQueriesContext(connection) as queries:
+            view.get_version_stamp()
+        self.assertEqual(len(queries), 1)
+
+
+@override_settings(REPLICA_DATABASE_ALIAS=None)
+class EventReportTests(TestCase):
+    def setUp(self):
+        students._intern_cache.clear()
+        self.admin = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name='Fair', start_date=now - timedelta(hours=3), end_date=now - timedelta(hours=1),
+        )
+        ScanLog.objects.create(event=self.event, scanner=self.scanner, student_id='S0001')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_missing_snapshot_is_queued_not_built_on_get(self):
+        live = self.client.get(f'/api/events/{self.event.pk}/')
+        self.assertEqual(live.status_code, 200)
+        self.assertFalse(EventReportSnapshot.objects.exists())
+        self.assertEqual(Job.objects.filter(kind='events.build_reports', status='QUEUED').count(), 1)
+
+        # Views before a worker runs share the queued build
+        self.client.get(f'/api/events/{self.event.pk}/')
+        self.assertEqual(Job.objects.filter(kind='events.build_reports').count(), 1)
+
+        work(burst=True)
+        self.assertTrue(EventReportSnapshot.objects.filter(pk=self.event.pk).exists())
+        response = self.client.get(f'/api/events/{self.event.pk}/')
+        self.assertEqual(response.data, live.data)
+        self.assertEqual(Job.objects.filter(kind='events.build_reports').count(), 1)
@@ -3,16 +3,26 @@ from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Prefetch
+from django.conf import settings
+from django.db.models import Count, Max, Prefetch, Q, Subquery, Sum
+from django.utils import timezone
+from core.conditional import ConditionalGetMixin, queryset_stamp
+from core.db_router import ReplicaReadMixin
+from .filters import EventFilter
 from .models import Event, EventUser
+from .reports import queue_report, stored_report
 from .serializers import EventSerializer, EventWithStatsSerializer
+from apps.users.models import User
 from apps.users.permissions import IsAdminUser
 
+# Fields needed to compute Event.version_stamp without loading full rows
+VERSION_STAMP_FIELDS = ('id', 'updated_at', 'scan_seq', 'start_date', 'end_date', 'is_permanent', 'status')
 
-class EventListCreateView(generics.ListCreateAPIView):
+
+class EventListCreateView(ReplicaReadMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ['status', 'scanning_enabled']
+    filterset_class = EventFilter
     
     def get_queryset(self):
         queryset = Event.objects.prefetch_related(
@@ -26,6 +36,24 @@ class EventListCreateView(generics.ListCreateAPIView):
         
         return queryset.order_by('-date')
     
+    def get_version_stamp(self):
+        # One aggregate over the filtered events. The payload changes when an event
+        # is saved or scanned, when one crosses its start or end date (status is
+        # computed from the clock) and when any user is saved (names in assignments
+        # and stats; creation and soft deletion both bump updated_at).
+        now = timezone.now()
+        newest_user = User.objects.order_by('-updated_at').values('updated_at')[:1]
+        events = self.filter_queryset(self.get_queryset()).prefetch_related(None).order_by()
+        stamp = events.aggregate(
+            count=Count('pk'),
+            latest=Max('updated_at'),
+            seq=Sum('scan_seq'),
+            started=Max('start_date', filter=Q(start_date__lte=now)),
+            ended=Max('end_date', filter=Q(end_date__lt=now)),
+            users=Max(Subquery(newest_user)),
+        )
+        return ':'.join(value.isoformat() if hasattr(value, 'isoformat') else str(value) for value in stamp.values())
+    
     def get_serializer_class(self):
         include_stats = self.request.query_params.get('includeStats') == 'true'
         if include_stats:
@@ -39,15 +67,53 @@ class EventListCreateView(generics.ListCreateAPIView):
         return [IsAuthenticated()]
 
 
-class EventDetailView(generics.RetrieveUpdateDestroyAPIView):
+class EventDetailView(ReplicaReadMixin, ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     queryset = Event.objects.prefetch_related(
-        Prefetch('event_users', queryset=EventUser.objects.select_related('user')),
-        'scan_logs__scanner'
+        Prefetch('event_users', queryset=EventUser.objects.select_related('user'))
     )
     
+    def get_stamp_event(self):
+        if not hasattr(self, '_stamp_event'):
+            self._stamp_event = Event.objects.only(*VERSION_STAMP_FIELDS).filter(pk=self.kwargs['pk']).first()
+        return self._stamp_event
+    
+    def serves_report(self):
+        """Completed events are answered from their stored report snapshot."""
+        event = self.get_stamp_event()
+        return event is not None and event.calculated_status == 'COMPLETED'
+    
+    def get_version_stamp(self):
+        event = self.get_stamp_event()
+        if event is None:
+            return None
+        if self.serves_report():
+            # The snapshot keeps the scanner names it was built with
+            return f"report:{event.version_stamp}"
+        # Scanner names appear both in assignments and in the recent logs
+        return f"{event.version_stamp}#{queryset_stamp(User.objects.all())}"
+    
+    def get_cache_control(self):
+        if self.serves_report():
+            return {'private': True, 'max_age': settings.REPORT_CACHE_SECONDS}
+        return super().get_cache_control()
+    
+    def retrieve(self, request, *args, **kwargs):
+        if self.serves_report():
+            payload = stored_report(self.get_stamp_event())
+            if payload is not None:
+                return Response(payload)
+            # No snapshot writes on a GET: serve the live stats and have a worker build it
+            queue_report(self.get_stamp_event().pk)
+        return super().retrieve(request, *args, **kwargs)
+    
     def get_serializer_class(self):
         return EventWithStatsSerializer
     
+    def destroy(self, request, *args, **kwargs):
+        # Scans are purged in batches by a background job; the cascade would lock scan_logs
+        job = self.get_object().mark_deleted()
+        return Response({'status': 'deleting', 'job_id': job.pk}, status=status.HTTP_202_ACCEPTED)
+    
     def get_permissions(self):
         # Only admins can update/delete events
         if self.request.method in ['PUT', 'PATCH', 'DELETE']:
@@ -0,0 +1,22 @@
+from django.contrib import admin
+from django.utils import timezone
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'attempts', 'progress_done', 'progress_total', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('kind', 'key')
+    # args can hold import rows and other request data; they are not shown
+    exclude = ('args',)
+    readonly_fields = (
+        'kind', 'key', 'attempts', 'progress_done', 'progress_total', 'progress_message',
+        'result', 'error', 'worker', 'created_by', 'created_at', 'started_at', 'finished_at', 'heartbeat_at',
+    )
+    actions = ['retry']
+
+    @admin.action(description='Retry selected failed jobs')
+    def retry(self, request, queryset):
+        retried = queryset.filter(status='FAILED').update(status='QUEUED', attempts=0, run_after=timezone.now())
+        self.message_user(request, f'Requeued {retried} job(s).')
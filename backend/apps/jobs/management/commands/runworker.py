@@ -0,0 +1,59 @@
+import multiprocessing
+import signal
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.worker import work
+
+
+def _worker_process(stop, burst, poll_seconds):
+    # The parent handles Ctrl-C/SIGTERM and tells every worker to stop after its current job
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, lambda *args: stop.set())
+    work(stop, burst=burst, poll_seconds=poll_seconds)
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the jobs table with a pool of worker processes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--processes', type=int, default=settings.JOB_WORKER_PROCESSES,
+            help='Worker processes (default: JOB_WORKER_PROCESSES).'
+        )
+        parser.add_argument('--burst', action='store_true', help='Exit once no job is due instead of polling.')
+        parser.add_argument(
+            '--poll', type=float, default=settings.JOB_POLL_SECONDS,
+            help='Seconds between polls of an empty queue (default: JOB_POLL_SECONDS).'
+        )
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        context = multiprocessing.get_context('fork')
+        stop = context.Event()
+
+        def request_stop(signum, frame):
+            self.stdout.write('Stopping after current jobs...')
+            stop.set()
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        if processes == 1:
+            ran = work(stop, burst=options['burst'], poll_seconds=options['poll'])
+            self.stdout.write(f'Ran {ran} job(s).')
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        pool = [
+            context.Process(target=_worker_process, args=(stop, options['burst'], options['poll']), daemon=False)
+            for _ in range(processes)
+        ]
+        for process in pool:
+            process.start()
+        self.stdout.write(f'Started {processes} worker process(es).')
+        for process in pool:
+            process.join()
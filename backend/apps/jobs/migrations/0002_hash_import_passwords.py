@@ -0,0 +1,24 @@
+from django.contrib.auth.hashers import make_password
+from django.db import migrations
+
+
+def hash_import_passwords(apps, schema_editor):
+    """Bulk import jobs used to store row passwords in plaintext; the task now expects hashes."""
+    Job = apps.get_model('jobs', 'Job')
+    for job in Job.objects.filter(kind='users.bulk_import').iterator():
+        rows = job.args.get('rows') or []
+        for row in rows:
+            if isinstance(row, dict) and row.get('password') not in (None, '') and not isinstance(row['password'], bool):
+                row['password'] = make_password(str(row['password']))
+        job.save(update_fields=['args'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(hash_import_passwords, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,69 @@
+from django.db import models
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of background work, claimed and run by ``manage.py runworker``.
+
+    ``kind`` names a function registered with apps.jobs.registry.task and
+    ``args`` holds its keyword arguments. Failed jobs are retried with backoff
+    until ``max_attempts``; see apps.jobs.worker.
+    """
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('SUCCEEDED', 'Succeeded'),
+        ('FAILED', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=100)
+    # Optional deduplication key: enqueueing while a job with the same kind and key is queued reuses it
+    key = models.CharField(max_length=255, blank=True, default='')
+    args = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='QUEUED')
+    run_after = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+
+    progress_done = models.PositiveBigIntegerField(default=0)
+    progress_total = models.PositiveBigIntegerField(null=True, blank=True)
+    progress_message = models.CharField(max_length=255, blank=True, default='')
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+
+    worker = models.CharField(max_length=100, blank=True, default='')
+    created_by = models.ForeignKey(
+        'users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Refreshed while the job runs; RUNNING jobs that stop beating are requeued
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        ordering = ['-id']
+        indexes = [
+            # Claim query: next QUEUED job whose run_after has passed
+            models.Index(fields=['status', 'run_after'], name='jobs_status_run_after_idx'),
+            models.Index(fields=['kind', 'key'], name='jobs_kind_key_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+    def report_progress(self, done, total=None, message=None):
+        """Record progress from inside a running task; also serves as the worker heartbeat."""
+        self.progress_done = done
+        self.heartbeat_at = timezone.now()
+        fields = {'progress_done': done, 'heartbeat_at': self.heartbeat_at}
+        if total is not None:
+            self.progress_total = fields['progress_total'] = total
+        if message is not None:
+            self.progress_message = fields['progress_message'] = message[:255]
+        if self.pk:
+            Job.objects.filter(pk=self.pk).update(**fields)
@@ -0,0 +1,48 @@
+"""
+Task registration and enqueueing.
+
+Apps declare background tasks in their ``tasks`` module:
+
+    @task('events.build_reports')
+    def build_reports(job, event_ids):
+        ...
+
+A task receives its Job (for report_progress) and the keyword arguments it
+was enqueued with, which must be JSON-serializable. Its return value, also
+JSON, is stored as the job's result.
+"""
+from django.conf import settings
+
+from .models import Job
+
+_tasks = {}
+
+
+def task(kind):
+    def register(func):
+        _tasks[kind] = func
+        return func
+    return register
+
+
+def get_task(kind):
+    return _tasks.get(kind)
+
+
+def enqueue(kind, key='', created_by=None, max_attempts=None, **kwargs):
+    """
+    Queue ``kind`` to run with ``kwargs`` and return the Job.
+
+    With a ``key``, a job of the same kind and key that is still queued is
+    returned instead of adding another one.
+    """
+    if kind not in _tasks:
+        raise ValueError(f'Unknown job kind: {kind}')
+    if key:
+        queued = Job.objects.filter(kind=kind, key=key, status='QUEUED').first()
+        if queued is not None:
+            return queued
+    return Job.objects.create(
+        kind=kind, key=key, args=kwargs, created_by=created_by,
+        max_attempts=max_attempts or settings.JOB_MAX_ATTEMPTS,
+    )
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from .models import Job
+
+
+class JobSerializer(serializers.ModelSerializer):
+    progress_percent = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            'id', 'kind', 'status', 'attempts', 'max_attempts', 'run_after',
+            'progress_done', 'progress_total', 'progress_percent', 'progress_message',
+            'result', 'error', 'worker', 'created_by', 'created_at', 'started_at', 'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_progress_percent(self, obj):
+        if obj.status == 'SUCCEEDED':
+            return 100.0
+        if not obj.progress_total:
+            return None
+        return round(min(obj.progress_done / obj.progress_total, 1) * 100, 1)
@@ -0,0 +1,85 @@
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import enqueue, task
+from .worker import claim_next, requeue_stale, work
+
+calls = []
+
+
+@task('tests.record')
+def record(job, value):
+    calls.append(value)
+    return {'value': value}
+
+
+@task('tests.flaky')
+def flaky(job):
+    raise RuntimeError('flaky task failed')
+
+
+class JobWorkerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_enqueue_reuses_queued_job_with_same_key(self):
+        first = enqueue('tests.record', key='k', value=1)
+        self.assertEqual(enqueue('tests.record', key='k', value=2).pk, first.pk)
+        self.assertNotEqual(enqueue('tests.record', key='other', value=3).pk, first.pk)
+        with self.assertRaises(ValueError):
+            enqueue('tests.missing')
+
+    def test_claims_oldest_due_job_once(self):
+        later = enqueue('tests.record', value='later')
+        Job.objects.filter(pk=later.pk).update(run_after=timezone.now() + timedelta(hours=1))
+        due = enqueue('tests.record', value='due')
+
+        claimed = claim_next('w1')
+        self.assertEqual(claimed.pk, due.pk)
+        self.assertEqual((claimed.status, claimed.attempts, claimed.worker), ('RUNNING', 1, 'w1'))
+        self.assertIsNone(claim_next('w2'))
+
+    def test_runs_job_and_stores_result(self):
+        job = enqueue('tests.record', value=7)
+        self.assertEqual(work(burst=True, worker='w1'), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.result), ('SUCCEEDED', {'value': 7}))
+        self.assertEqual(calls, [7])
+
+    @override_settings(JOB_RETRY_DELAY_SECONDS=10)
+    def test_failed_job_is_retried_with_backoff_then_failed(self):
+        job = enqueue('tests.flaky', max_attempts=2)
+        started = timezone.now()
+        with self.assertLogs('apps.jobs.worker', 'ERROR'):
+            work(burst=True, worker='w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('QUEUED', 1))
+        self.assertIn('flaky task failed', job.error)
+        self.assertGreaterEqual(job.run_after, started + timedelta(seconds=10))
+
+        # Not due yet: a burst worker finds nothing to do
+        self.assertEqual(work(burst=True, worker='w1'), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs('apps.jobs.worker', 'ERROR'):
+            work(burst=True, worker='w1')
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('FAILED', 2))
+        self.assertIsNotNone(job.finished_at)
+
+    @override_settings(JOB_STALE_SECONDS=60)
+    def test_stale_running_jobs_are_requeued_until_out_of_attempts(self):
+        stale = timezone.now() - timedelta(minutes=5)
+        retried = Job.objects.create(kind='tests.record', status='RUNNING', attempts=1, max_attempts=3, heartbeat_at=stale)
+        exhausted = Job.objects.create(kind='tests.record', status='RUNNING', attempts=3, max_attempts=3, heartbeat_at=stale)
+        alive = Job.objects.create(kind='tests.record', status='RUNNING', attempts=1, heartbeat_at=timezone.now())
+
+        self.assertEqual(requeue_stale(), 2)
+        statuses = dict(Job.objects.values_list('pk', 'status'))
+        self.assertEqual(
+            (statuses[retried.pk], statuses[exhausted.pk], statuses[alive.pk]),
+            ('QUEUED', 'FAILED', 'RUNNING'),
+        )
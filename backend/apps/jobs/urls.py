@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'jobs'
+
+urlpatterns = [
+    path('', views.JobListView.as_view(), name='job-list'),
+    path('<int:pk>/', views.JobDetailView.as_view(), name='job-detail'),
+]
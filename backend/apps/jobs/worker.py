@@ -0,0 +1,178 @@
+"""
+Claiming and running jobs.
+
+Workers claim the oldest due QUEUED job with ``SELECT ... FOR UPDATE SKIP
+LOCKED``, so any number of worker processes share the table without blocking
+each other, then run it outside the claiming transaction. A failed attempt is
+requeued after JOB_RETRY_DELAY_SECONDS, doubled per attempt, until the job's
+max_attempts is reached. RUNNING jobs whose heartbeat is older than
+JOB_STALE_SECONDS (a worker died mid-job) are requeued the same way.
+"""
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def claim_next(worker):
+    """Mark the next due job RUNNING for ``worker`` and return it, or None if there is none."""
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status='QUEUED', run_after__lte=now)
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        # Conditional, for databases without row locks (SQLite): only one worker's update matches
+        claimed = Job.objects.filter(pk=job.pk, status='QUEUED').update(
+            status='RUNNING', attempts=F('attempts') + 1, worker=worker, started_at=now, heartbeat_at=now,
+        )
+    if not claimed:
+        return claim_next(worker)
+    job.refresh_from_db()
+    return job
+
+
+def _retry_delay(attempts):
+    return timedelta(seconds=settings.JOB_RETRY_DELAY_SECONDS * 2 ** (attempts - 1))
+
+
+def _fail(job, error):
+    now = timezone.now()
+    job.error = error
+    job.finished_at = None
+    if job.attempts < job.max_attempts:
+        job.status = 'QUEUED'
+        job.run_after = now + _retry_delay(job.attempts)
+    else:
+        job.status = 'FAILED'
+        job.finished_at = now
+    job.save(update_fields=['status', 'error', 'run_after', 'finished_at'])
+
+
+class _Heartbeat(threading.Thread):
+    """Keeps a running job's heartbeat fresh while its task works, so it is not taken for stale."""
+
+    def __init__(self, job_id):
+        super().__init__(daemon=True)
+        self.job_id = job_id
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            while not self.done.wait(settings.JOB_STALE_SECONDS / 3):
+                Job.objects.filter(pk=self.job_id, status='RUNNING').update(heartbeat_at=timezone.now())
+        finally:
+            connection.close()
+
+
+def run_job(job):
+    """Run a claimed job and record its outcome."""
+    func = get_task(job.kind)
+    if func is None:
+        job.attempts = job.max_attempts
+        _fail(job, f'Unknown job kind: {job.kind}')
+        return job
+
+    heartbeat = _Heartbeat(job.pk)
+    heartbeat.start()
+    try:
+        result = func(job, **job.args)
+    except Exception:
+        logger.exception('Job %s failed (attempt %s of %s)', job.pk, job.attempts, job.max_attempts)
+        _fail(job, traceback.format_exc())
+        return job
+    finally:
+        heartbeat.done.set()
+        heartbeat.join()
+
+    job.status = 'SUCCEEDED'
+    job.result = result
+    job.error = ''
+    job.finished_at = timezone.now()
+    if job.progress_total is not None:
+        job.progress_done = job.progress_total
+    job.save(update_fields=['status', 'result', 'error', 'finished_at', 'progress_done'])
+    return job
+
+
+def requeue_stale():
+    """Return jobs of workers that stopped heartbeating to the queue (or fail them). Returns the count."""
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_STALE_SECONDS)
+    stale = Job.objects.filter(status='RUNNING', heartbeat_at__lt=cutoff)
+    error = 'Worker stopped responding.'
+    requeued = stale.filter(attempts__lt=F('max_attempts')).update(
+        status='QUEUED', run_after=timezone.now(), error=error
+    )
+    failed = stale.update(status='FAILED', finished_at=timezone.now(), error=error)
+    return requeued + failed
+
+
+def _pause(stop, seconds):
+    if stop is not None:
+        stop.wait(seconds)
+    else:
+        time.sleep(seconds)
+
+
+def work(stop=None, burst=False, poll_seconds=None, worker=None):
+    """
+    Claim and run jobs until ``stop`` (a threading/multiprocessing Event) is set.
+
+    With ``burst``, return as soon as no job is due instead of polling. Called
+    inside a transaction (e.g. a test), it keeps the caller's connection open.
+    Returns the number of jobs run.
+    """
+    worker = worker or worker_name()
+    poll_seconds = settings.JOB_POLL_SECONDS if poll_seconds is None else poll_seconds
+    # Closing the connection would roll back and break the caller's transaction
+    owns_connection = not connection.in_atomic_block
+    ran = 0
+    next_reap = 0.0
+    while stop is None or not stop.is_set():
+        if owns_connection:
+            close_old_connections()
+        try:
+            if time.monotonic() >= next_reap:
+                requeue_stale()
+                next_reap = time.monotonic() + settings.JOB_STALE_SECONDS / 2
+            job = claim_next(worker)
+        except DatabaseError:
+            if not owns_connection:
+                raise
+            # Lock timeout or lost connection: reconnect and retry after a poll interval
+            logger.exception('Worker %s could not claim a job', worker)
+            connection.close()
+            _pause(stop, poll_seconds)
+            continue
+        if job is None:
+            if burst:
+                break
+            _pause(stop, poll_seconds)
+            continue
+        logger.info('Running job %s (%s), attempt %s', job.pk, job.kind, job.attempts)
+        run_job(job)
+        ran += 1
+    if owns_connection:
+        close_old_connections()
+    return ran
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-19 05:26
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('monitoring', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QueryFinding',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('REPEATED', 'Repeated'), ('SLOW', 'Slow')], max_length=10)),
+                ('fingerprint', models.CharField(max_length=40)),
+                ('sql', models.TextField()),
+                ('view', models.CharField(max_length=255)),
+                ('call_site', models.CharField(blank=True, default='', max_length=255)),
+                ('serializer', models.CharField(blank=True, default='', max_length=100)),
+                ('requests', models.PositiveIntegerField(default=0)),
+                ('executions', models.PositiveBigIntegerField(default=0)),
+                ('max_per_request', models.PositiveIntegerField(default=0)),
+                ('total_ms', models.FloatField(default=0)),
+                ('max_ms', models.FloatField(default=0)),
+                ('first_seen', models.DateTimeField(default=django.utils.timezone.now)),
+                ('last_seen', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Query finding',
+                'verbose_name_plural': 'Query findings',
+                'db_table': 'query_findings',
+                'ordering': ['-requests', '-last_seen'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='queryfinding',
+            constraint=models.UniqueConstraint(fields=('kind', 'fingerprint', 'view'), name='query_findings_unique'),
+        ),
+    ]
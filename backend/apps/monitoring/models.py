@@ -0,0 +1,83 @@
+from django.db import models
+from django.utils import timezone
+
+
+class RequestProfile(models.Model):
+    """
+    One profiled request, recorded by core.middleware.ProfilingMiddleware.
+
+    ``summary`` holds the top functions, SQL statements and serializer
+    methods (see apps.monitoring.profiling); ``pstats`` is the raw cProfile
+    data in the format written by ``pstats.Stats.dump_stats``.
+    """
+    TRIGGER_CHOICES = [
+        ('REQUEST', 'Requested'),
+        ('SAMPLE', 'Sampled'),
+    ]
+
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+    trigger = models.CharField(max_length=10, choices=TRIGGER_CHOICES)
+    user = models.ForeignKey(
+        'users.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    query_string = models.TextField(blank=True, default='')
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    sql_count = models.PositiveIntegerField(default=0)
+    sql_ms = models.FloatField(default=0)
+    summary = models.JSONField(default=dict)
+    pstats = models.BinaryField()
+
+    class Meta:
+        db_table = 'request_profiles'
+        verbose_name = 'Request profile'
+        verbose_name_plural = 'Request profiles'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
+
+
+class QueryFinding(models.Model):
+    """
+    A SQL pattern flagged in sampled requests by apps.monitoring.queries.
+
+    REPEATED: one statement fingerprint ran more than QUERY_REPEAT_THRESHOLD
+    times in a single request (typically an N+1 in a serializer). SLOW: a
+    single execution took longer than SLOW_QUERY_MS. Findings are aggregated
+    per kind, fingerprint and view across requests.
+    """
+    KIND_CHOICES = [
+        ('REPEATED', 'Repeated'),
+        ('SLOW', 'Slow'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    # SHA-1 of the normalized statement (literals and IN lists collapsed)
+    fingerprint = models.CharField(max_length=40)
+    sql = models.TextField()
+    view = models.CharField(max_length=255)
+    # Innermost project frame and serializer class seen running the statement
+    call_site = models.CharField(max_length=255, blank=True, default='')
+    serializer = models.CharField(max_length=100, blank=True, default='')
+    requests = models.PositiveIntegerField(default=0)
+    executions = models.PositiveBigIntegerField(default=0)
+    max_per_request = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    first_seen = models.DateTimeField(default=timezone.now)
+    last_seen = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'query_findings'
+        verbose_name = 'Query finding'
+        verbose_name_plural = 'Query findings'
+        ordering = ['-requests', '-last_seen']
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'fingerprint', 'view'], name='query_findings_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.fingerprint[:8]} in {self.view}"
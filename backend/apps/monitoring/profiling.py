@@ -0,0 +1,225 @@
+"""
+On-demand request profiling.
+
+A request is profiled when an admin asks for it (``X-Profile: 1`` header or
+``?profile=true``) or when it is picked at PROFILE_SAMPLE_RATE. It then runs
+under cProfile while an execute wrapper times every SQL statement, and the
+result is stored as a RequestProfile: top functions by cumulative and own
+time, SQL grouped by statement, and time spent in serializer methods (e.g.
+``EventWithStatsSerializer.get_stats``). Requests that are not profiled only
+pay for the trigger check in core.middleware.ProfilingMiddleware.
+"""
+import cProfile
+import functools
+import logging
+import marshal
+import os
+import pstats
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.fields import Field
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .models import RequestProfile
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = 'profile'
+FLAG_VALUES = {'1', 'true', 'yes'}
+# cProfile names C methods like '<function X.y at 0x7f...>'; drop the address so profiles compare
+ADDRESS = re.compile(r' at 0x[0-9a-f]+')
+
+TOP_FUNCTIONS = 30
+TOP_QUERIES = 30
+TOP_SERIALIZER_METHODS = 30
+# Serializer and field methods attributed by name; any get_* (SerializerMethodField) counts too
+SERIALIZER_METHODS = {'to_representation', 'to_internal_value', 'get_attribute', 'validate', 'run_validation'}
+
+
+def _flagged(request):
+    value = request.META.get(PROFILE_HEADER) or request.GET.get(PROFILE_PARAM)
+    return value is not None and value.lower() in FLAG_VALUES
+
+
+def _admin(request):
+    """The admin making this request, from the session or a JWT, or None."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            authenticated = None
+        user = authenticated[0] if authenticated else None
+    return user if user is not None and getattr(user, 'role', None) == 'ADMIN' else None
+
+
+def trigger(request):
+    """Why this request should be profiled ('REQUEST' or 'SAMPLE'), or None."""
+    if _flagged(request) and _admin(request) is not None:
+        return 'REQUEST'
+    rate = settings.PROFILE_SAMPLE_RATE
+    if rate and random.random() < rate:
+        return 'SAMPLE'
+    return None
+
+
+class SQLRecorder:
+    """Execute wrapper that times every statement run while it is installed."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            self.queries.append((context['connection'].alias, sql, elapsed_ms))
+
+
+def profile(get_response, request, trigger):
+    """Run the rest of the middleware chain under the profiler and store the result."""
+    profiler = cProfile.Profile()
+    recorder = SQLRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler is active in this process (one at a time since Python 3.12)
+            return get_response(request)
+        started = time.perf_counter()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+            duration_ms = (time.perf_counter() - started) * 1000
+
+    try:
+        record = save_profile(request, response, trigger, duration_ms, profiler, recorder.queries)
+    except Exception:
+        logger.exception('Could not store the profile of %s %s', request.method, request.path)
+    else:
+        response['X-Profile-Id'] = str(record.pk)
+    return response
+
+
+@functools.cache
+def _path_prefixes():
+    paths = {os.path.join(str(settings.BASE_DIR), '')}
+    paths.update(os.path.join(path, '') for path in sys.path if path)
+    return sorted(paths, key=len, reverse=True)
+
+
+def _short_path(filename):
+    for prefix in _path_prefixes():
+        if filename.startswith(prefix):
+            return filename[len(prefix):]
+    return filename
+
+
+def _function_name(code):
+    if isinstance(code, str):
+        # Built-in functions are reported by name only
+        return ADDRESS.sub('', code)
+    qualname = getattr(code, 'co_qualname', code.co_name)
+    return f'{qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})'
+
+
+def _serializer_codes():
+    """Map the code objects of serializer and field methods to 'Class.method'."""
+    codes = {}
+    pending, seen = [Field], set()
+    while pending:
+        cls = pending.pop()
+        if cls in seen:
+            continue
+        seen.add(cls)
+        pending.extend(cls.__subclasses__())
+        for attr, value in vars(cls).items():
+            if not (attr.startswith('get_') or attr.startswith('validate_') or attr in SERIALIZER_METHODS):
+                continue
+            code = getattr(getattr(value, '__func__', value), '__code__', None)
+            if code is not None:
+                codes[code] = f'{cls.__name__}.{attr}'
+    return codes
+
+
+def _timing(entry):
+    return {
+        'calls': entry.callcount,
+        'cumulative_ms': round(entry.totaltime * 1000, 3),
+        'own_ms': round(entry.inlinetime * 1000, 3),
+    }
+
+
+def summarize(profiler, queries):
+    """Top functions, SQL statements and serializer methods of one profiled request."""
+    entries = profiler.getstats()
+    by_cumulative = sorted(entries, key=lambda entry: entry.totaltime, reverse=True)
+    by_own = sorted(entries, key=lambda entry: entry.inlinetime, reverse=True)
+
+    serializer_codes = _serializer_codes()
+    serializer_methods = [
+        {'method': serializer_codes[entry.code], **_timing(entry)}
+        for entry in by_cumulative if not isinstance(entry.code, str) and entry.code in serializer_codes
+    ][:TOP_SERIALIZER_METHODS]
+
+    statements = {}
+    for alias, sql, elapsed_ms in queries:
+        statement = statements.setdefault((alias, sql), {'database': alias, 'sql': sql, 'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+        statement['count'] += 1
+        statement['total_ms'] += elapsed_ms
+        statement['max_ms'] = max(statement['max_ms'], elapsed_ms)
+    top_queries = sorted(statements.values(), key=lambda statement: statement['total_ms'], reverse=True)[:TOP_QUERIES]
+    for statement in top_queries:
+        statement['total_ms'] = round(statement['total_ms'], 3)
+        statement['max_ms'] = round(statement['max_ms'], 3)
+
+    return {
+        'functions': [{'function': _function_name(entry.code), **_timing(entry)} for entry in by_cumulative[:TOP_FUNCTIONS]],
+        'own_time': [{'function': _function_name(entry.code), **_timing(entry)} for entry in by_own[:TOP_FUNCTIONS]],
+        'queries': top_queries,
+        'distinct_queries': len(statements),
+        'serializer_methods': serializer_methods,
+    }
+
+
+def save_profile(request, response, trigger, duration_ms, profiler, queries):
+    user = getattr(request, 'user', None)
+    # Explicit alias: routing through db_for_write would pin the profiled client to the primary
+    record = RequestProfile.objects.using('default').create(
+        trigger=trigger,
+        user_id=user.pk if user is not None and user.is_authenticated else None,
+        method=request.method,
+        path=request.path[:500],
+        query_string=request.META.get('QUERY_STRING', ''),
+        status_code=response.status_code,
+        duration_ms=round(duration_ms, 3),
+        sql_count=len(queries),
+        sql_ms=round(sum(elapsed_ms for _, _, elapsed_ms in queries), 3),
+        summary=summarize(profiler, queries),
+        pstats=marshal.dumps(pstats.Stats(profiler).stats),
+    )
+    prune()
+    return record
+
+
+def prune():
+    """Keep only the newest PROFILE_KEEP profiles."""
+    keep = max(settings.PROFILE_KEEP, 1)
+    oldest_kept = list(
+        RequestProfile.objects.using('default').order_by('-id').values_list('id', flat=True)[keep - 1:keep]
+    )
+    if oldest_kept:
+        RequestProfile.objects.using('default').filter(id__lt=oldest_kept[0]).delete()
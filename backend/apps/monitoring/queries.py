@@ -0,0 +1,202 @@
+"""
+Sampled N+1 and slow-query detection.
+
+A QUERY_SAMPLE_RATE fraction of requests runs with an execute wrapper that
+fingerprints every statement (literals and IN/VALUES lists collapsed, so the
+same query with different ids matches). At the end of the request, any
+fingerprint executed more than QUERY_REPEAT_THRESHOLD times and any single
+execution slower than SLOW_QUERY_MS is logged with the view, the innermost
+project frame and the serializer that ran it, and aggregated into
+QueryFinding rows (see /api/monitoring/queries/). The stack is only walked
+when a statement crosses a threshold, so sampled requests stay cheap too.
+"""
+import functools
+import hashlib
+import logging
+import os
+import random
+import re
+import sys
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import IntegrityError, connections, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
+from django.utils import timezone
+from rest_framework.serializers import BaseSerializer, ListSerializer
+
+from .models import QueryFinding
+
+logger = logging.getLogger(__name__)
+
+STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+NUMBER_LITERAL = re.compile(r'\b\d+(?:\.\d+)?\b')
+IN_LIST = re.compile(r'\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))+\s*\)')
+VALUES_ROWS = re.compile(r'(\(\.\.\.\))(?:\s*,\s*\(\.\.\.\))+')
+
+
+@functools.lru_cache(maxsize=2048)
+def fingerprint(sql):
+    """(hash, normalized statement); identical SQL strings are normalized once."""
+    normalized = NUMBER_LITERAL.sub('?', STRING_LITERAL.sub('?', sql))
+    normalized = VALUES_ROWS.sub(r'\1, ...', IN_LIST.sub('(...)', normalized))
+    return hashlib.sha1(normalized.encode()).hexdigest(), normalized
+
+
+def sampled():
+    rate = settings.QUERY_SAMPLE_RATE
+    return bool(rate) and random.random() < rate
+
+
+@functools.cache
+def _project_dirs():
+    base = str(settings.BASE_DIR)
+    return tuple(os.path.join(base, name, '') for name in ('apps', 'core'))
+
+
+@functools.cache
+def _skipped_paths():
+    # The detector, the middleware and the database backends are never the call site
+    return (__file__, sys.modules['core.middleware'].__file__, os.path.join(str(settings.BASE_DIR), 'core', 'db', ''))
+
+
+def call_site():
+    """Innermost project frame ('path:line in function') and serializer class on the current stack."""
+    site = serializer = ''
+    prefix_length = len(os.path.join(str(settings.BASE_DIR), ''))
+    frame = sys._getframe(1)
+    while frame is not None and not (site and serializer):
+        code = frame.f_code
+        if not site and code.co_filename.startswith(_project_dirs()) and not code.co_filename.startswith(_skipped_paths()):
+            qualname = getattr(code, 'co_qualname', code.co_name)
+            site = f'{code.co_filename[prefix_length:]}:{frame.f_lineno} in {qualname}'
+        if not serializer:
+            instance = frame.f_locals.get('self')
+            if isinstance(instance, BaseSerializer) and not isinstance(instance, ListSerializer):
+                serializer = type(instance).__name__
+        frame = frame.f_back
+    return site[:255], serializer
+
+
+class _Statement:
+    __slots__ = ('sql', 'count', 'total_ms', 'slow', 'slow_ms', 'max_ms', 'site', 'serializer')
+
+    def __init__(self, sql):
+        self.sql = sql
+        self.count = 0
+        self.total_ms = 0.0
+        self.slow = 0
+        self.slow_ms = 0.0
+        self.max_ms = 0.0
+        self.site = None
+        self.serializer = ''
+
+
+class QueryInspector:
+    """Execute wrapper that counts and times statements by fingerprint for one request."""
+
+    def __init__(self):
+        self.statements = {}
+        self.repeat_threshold = settings.QUERY_REPEAT_THRESHOLD
+        self.slow_ms = settings.SLOW_QUERY_MS
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            key, normalized = fingerprint(sql)
+            statement = self.statements.get(key)
+            if statement is None:
+                statement = self.statements[key] = _Statement(normalized)
+            statement.count += 1
+            statement.total_ms += elapsed_ms
+            statement.max_ms = max(statement.max_ms, elapsed_ms)
+            if elapsed_ms > self.slow_ms:
+                statement.slow += 1
+                statement.slow_ms += elapsed_ms
+            if statement.site is None and (statement.count > self.repeat_threshold or elapsed_ms > self.slow_ms):
+                statement.site, statement.serializer = call_site()
+
+    def findings(self):
+        """(kind, fingerprint, statement) for every threshold crossed in this request."""
+        for key, statement in self.statements.items():
+            if statement.count > self.repeat_threshold:
+                yield 'REPEATED', key, statement
+            if statement.slow:
+                yield 'SLOW', key, statement
+
+
+def view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return request.path[:255]
+    view = getattr(match.func, 'view_class', match.func)
+    return f'{request.method} {view.__module__}.{view.__qualname__}'[:255]
+
+
+def inspect(get_response, request):
+    """Run the rest of the middleware chain under a QueryInspector and report what it found."""
+    inspector = QueryInspector()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        response = get_response(request)
+
+    findings = list(inspector.findings())
+    if findings:
+        try:
+            report(view_name(request), findings)
+        except Exception:
+            logger.exception('Could not record query findings for %s %s', request.method, request.path)
+    return response
+
+
+def report(view, findings):
+    now = timezone.now()
+    for kind, key, statement in findings:
+        if kind == 'REPEATED':
+            executions, total_ms = statement.count, statement.total_ms
+            logger.warning(
+                'Query ran %s times (%.1f ms) in %s at %s%s: %s', statement.count, statement.total_ms, view,
+                statement.site or '?', f' ({statement.serializer})' if statement.serializer else '', statement.sql,
+            )
+        else:
+            executions, total_ms = statement.slow, statement.slow_ms
+            logger.warning(
+                'Slow query (%.1f ms) in %s at %s%s: %s', statement.max_ms, view,
+                statement.site or '?', f' ({statement.serializer})' if statement.serializer else '', statement.sql,
+            )
+        record_finding(kind, key, view, statement, executions, total_ms, now)
+
+
+def record_finding(kind, key, view, statement, executions, total_ms, now):
+    total_ms, max_ms = round(total_ms, 3), round(statement.max_ms, 3)
+    # Explicit alias: routing through db_for_write would pin the sampled client to the primary
+    findings = QueryFinding.objects.using('default')
+    updated = findings.filter(kind=kind, fingerprint=key, view=view).update(
+        requests=F('requests') + 1,
+        executions=F('executions') + executions,
+        max_per_request=Greatest('max_per_request', executions),
+        total_ms=F('total_ms') + total_ms,
+        max_ms=Greatest('max_ms', max_ms),
+        call_site=statement.site or '',
+        serializer=statement.serializer,
+        last_seen=now,
+    )
+    if updated:
+        return
+    try:
+        with transaction.atomic(using='default'):
+            findings.create(
+                kind=kind, fingerprint=key, view=view, sql=statement.sql,
+                call_site=statement.site or '', serializer=statement.serializer,
+                requests=1, executions=executions, max_per_request=executions,
+                total_ms=total_ms, max_ms=max_ms, first_seen=now, last_seen=now,
+            )
+    except IntegrityError:
+        # Another request recorded the same finding first
+        record_finding(kind, key, view, statement, executions, total_ms, now)
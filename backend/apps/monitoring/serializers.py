@@ -0,0 +1,34 @@
+from rest_framework import serializers
+
+from .models import QueryFinding, RequestProfile
+
+
+class RequestProfileSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = RequestProfile
+        fields = [
+            'id', 'created_at', 'trigger', 'user', 'method', 'path', 'query_string',
+            'status_code', 'duration_ms', 'sql_count', 'sql_ms',
+        ]
+        read_only_fields = fields
+
+
+class RequestProfileDetailSerializer(RequestProfileSerializer):
+    class Meta(RequestProfileSerializer.Meta):
+        fields = [*RequestProfileSerializer.Meta.fields, 'summary']
+        read_only_fields = fields
+
+
+class QueryFindingSerializer(serializers.ModelSerializer):
+    avg_per_request = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QueryFinding
+        fields = [
+            'id', 'kind', 'fingerprint', 'sql', 'view', 'call_site', 'serializer', 'requests',
+            'executions', 'avg_per_request', 'max_per_request', 'total_ms', 'max_ms', 'first_seen', 'last_seen',
+        ]
+        read_only_fields = fields
+
+    def get_avg_per_request(self, obj):
+        return round(obj.executions / obj.requests, 1) if obj.requests else None
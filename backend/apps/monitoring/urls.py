@@ -0,0 +1,14 @@
+from django.urls import path
+from . import views
+
+app_name = 'monitoring'
+
+urlpatterns = [
+    path('db-connections/', views.db_connections_view, name='db-connections'),
+    path('ingest/', views.ingest_admission_view, name='ingest-admission'),
+    path('deletions/', views.pending_deletions_view, name='pending-deletions'),
+    path('profiles/', views.RequestProfileListView.as_view(), name='profile-list'),
+    path('profiles/<int:pk>/', views.RequestProfileDetailView.as_view(), name='profile-detail'),
+    path('profiles/<int:pk>/pstats/', views.request_profile_pstats_view, name='profile-pstats'),
+    path('queries/', views.QueryFindingListView.as_view(), name='query-findings'),
+]
@@ -0,0 +1,89 @@
+import os
+
+from django.db import connections
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework import generics
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from core.db.pool import pool_stats
+from apps.scans.purge import pending_deletions
+from apps.scans.throttling import ingest_gate
+from apps.users.permissions import IsAdminUser
+from .models import QueryFinding, RequestProfile
+from .serializers import QueryFindingSerializer, RequestProfileDetailSerializer, RequestProfileSerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def db_connections_view(request):
+    """
+    Connection reuse settings and pool statistics for the worker process that
+    served this request.
+    """
+    pools = pool_stats()
+    databases = {}
+    for alias in connections:
+        settings_dict = connections.settings[alias]
+        databases[alias] = {
+            'mode': 'pool' if 'POOL' in settings_dict else ('persistent' if settings_dict['CONN_MAX_AGE'] else 'per-request'),
+            'conn_max_age': settings_dict['CONN_MAX_AGE'],
+            'health_checks': settings_dict['CONN_HEALTH_CHECKS'],
+            'pool': pools.get(alias),
+        }
+    return Response({'pid': os.getpid(), 'databases': databases})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def ingest_admission_view(request):
+    """Scan ingest admission counters for the worker process that served this request."""
+    return Response({'pid': os.getpid(), **ingest_gate.stats()})
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def pending_deletions_view(request):
+    """Deleted events and users still being purged, with the scans each has left."""
+    return Response({'pending': pending_deletions()})
+
+
+class RequestProfileListView(generics.ListAPIView):
+    """Stored request profiles, newest first (``?path=`` filters by path prefix)."""
+    serializer_class = RequestProfileSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get_queryset(self):
+        queryset = RequestProfile.objects.defer('summary', 'pstats').order_by('-id')
+        path = self.request.query_params.get('path')
+        if path:
+            queryset = queryset.filter(path__startswith=path)
+        return queryset
+
+
+class RequestProfileDetailView(generics.RetrieveAPIView):
+    """One profile: top functions, SQL statements and serializer methods."""
+    queryset = RequestProfile.objects.defer('pstats')
+    serializer_class = RequestProfileDetailSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def request_profile_pstats_view(request, pk):
+    """Raw cProfile data, loadable with ``pstats.Stats(path)`` or snakeviz."""
+    record = get_object_or_404(RequestProfile.objects.only('pstats'), pk=pk)
+    response = HttpResponse(bytes(record.pstats), content_type='application/octet-stream')
+    response['Content-Disposition'] = f'attachment; filename="profile-{pk}.prof"'
+    return response
+
+
+class QueryFindingListView(generics.ListAPIView):
+    """Repeated (N+1) and slow statements found in sampled requests, most widespread first."""
+    queryset = QueryFinding.objects.all()
+    serializer_class = QueryFindingSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['kind', 'view']
@@ -1,12 +1,17 @@
 from django.contrib import admin
-from .models import ScanLog
+from core.admin import AutocompleteFilter, LargeTableAdmin
+from .models import ScanIdempotencyKey, ScanLog, Student
 
 
 @admin.register(ScanLog)
-class ScanLogAdmin(admin.ModelAdmin):
+class ScanLogAdmin(LargeTableAdmin):
     list_display = ('student_id', 'event', 'scanner', 'status', 'timestamp')
-    list_filter = ('status', 'event', 'timestamp')
-    search_fields = ('student_id', 'event__name', 'scanner__name')
+    list_filter = ('status', ('event', AutocompleteFilter), ('scanner', AutocompleteFilter))
+    list_select_related = ('event', 'scanner')
+    # Prefix match on the indexed column; use the filters for event and scanner
+    search_fields = ('^student_id',)
+    search_help_text = 'Student ID or its beginning'
+    date_hierarchy = 'timestamp'
     ordering = ('-timestamp',)
     autocomplete_fields = ['event', 'scanner']
     
@@ -17,3 +22,18 @@ class ScanLogAdmin(admin.ModelAdmin):
     )
     
     readonly_fields = ('timestamp',)
+
+
+@admin.register(Student)
+class StudentAdmin(LargeTableAdmin):
+    list_display = ('student_id', 'id', 'created_at')
+    search_fields = ('^student_id',)
+    ordering = ('-id',)
+    readonly_fields = ('created_at',)
+
+
+@admin.register(ScanIdempotencyKey)
+class ScanIdempotencyKeyAdmin(LargeTableAdmin):
+    list_display = ('key_hash', 'scan_log', 'created_at')
+    raw_id_fields = ('scan_log',)
+    readonly_fields = ('key_hash', 'scan_log', 'created_at')
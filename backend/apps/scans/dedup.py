@@ -0,0 +1,69 @@
+"""
+Compact encoding of an event's scanned student IDs for offline duplicate detection.
+
+Snapshot format (``front-coded+zlib+base64``): the IDs are sorted by their
+UTF-8 bytes and each one is written as
+
+    varint(length of prefix shared with the previous ID)
+    varint(length of the remaining suffix)
+    suffix bytes
+
+The byte stream is zlib-compressed and base64-encoded. Sorted student numbers
+share long prefixes, so each entry typically costs 2-4 bytes before
+compression. Decoding is exact: there are no false positives.
+"""
+import base64
+import zlib
+
+ENCODING = 'front-coded+zlib+base64'
+
+
+def _write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def encode_student_ids(student_ids):
+    """Encode an iterable of student IDs into the snapshot format."""
+    out = bytearray()
+    previous = b''
+    for current in sorted({student_id.encode() for student_id in student_ids}):
+        shared = 0
+        limit = min(len(previous), len(current))
+        while shared < limit and previous[shared] == current[shared]:
+            shared += 1
+        _write_varint(out, shared)
+        _write_varint(out, len(current) - shared)
+        out += current[shared:]
+        previous = current
+    return base64.b64encode(zlib.compress(bytes(out), 9)).decode('ascii')
+
+
+def decode_student_ids(encoded):
+    """Decode a snapshot back into the sorted list of student IDs (reference for clients)."""
+    data = zlib.decompress(base64.b64decode(encoded))
+    student_ids = []
+    previous = b''
+    pos = 0
+    while pos < len(data):
+        shared, pos = _read_varint(data, pos)
+        length, pos = _read_varint(data, pos)
+        current = previous[:shared] + data[pos:pos + length]
+        pos += length
+        student_ids.append(current.decode())
+        previous = current
+    return student_ids
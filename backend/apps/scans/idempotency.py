@@ -0,0 +1,58 @@
+"""
+Idempotency keys for scan submissions.
+
+Scanner devices send an ``Idempotency-Key`` header (any unique string, e.g. a
+UUID generated when the scan is taken) and reuse it when retrying. The first
+request stores the key next to the scan it created, in the same transaction;
+retries within IDEMPOTENCY_KEY_TTL get that scan back instead of a new row.
+"""
+import hashlib
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import ScanIdempotencyKey, ScanLog
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def key_hash(client_id, key):
+    """Signed 64-bit hash of the key, scoped to the client that sent it."""
+    digest = hashlib.sha256(f'{client_id}:{key}'.encode()).digest()
+    return int.from_bytes(digest[:8], 'big', signed=True)
+
+
+def _cutoff():
+    return timezone.now() - timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS)
+
+
+def find_replay(hashed):
+    """The scan created under this key hash, or None if unseen or expired."""
+    stored = ScanIdempotencyKey.objects.filter(pk=hashed).values_list('scan_log_id', 'created_at').first()
+    if stored is None:
+        return None
+    scan_log_id, created_at = stored
+    if created_at < _cutoff():
+        ScanIdempotencyKey.objects.filter(pk=hashed).delete()
+        return None
+    return ScanLog.objects.select_related('event', 'scanner').filter(pk=scan_log_id).first()
+
+
+def remember(hashed, scan_log):
+    """Store the key; raises IntegrityError if a concurrent request stored it first."""
+    ScanIdempotencyKey.objects.create(key_hash=hashed, scan_log=scan_log)
+
+
+def purge_expired(batch_size=10000):
+    """Delete expired keys in batches; returns the number deleted."""
+    cutoff = _cutoff()
+    deleted = 0
+    while True:
+        batch = list(
+            ScanIdempotencyKey.objects.filter(created_at__lt=cutoff).values_list('pk', flat=True)[:batch_size]
+        )
+        if not batch:
+            return deleted
+        deleted += ScanIdempotencyKey.objects.filter(pk__in=batch).delete()[0]
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from apps.scans.models import ScanLog, Student
+from apps.scans.students import backfill_student_keys
+
+
+class Command(BaseCommand):
+    help = 'Link scan_logs rows without a student_key to the students dimension, in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        remaining = ScanLog.objects.filter(student_key__isnull=True).count()
+        self.stdout.write(f'{remaining} scan(s) to backfill.')
+
+        def progress(done):
+            self.stdout.write(f'  {done}/{remaining}')
+
+        updated = backfill_student_keys(ScanLog, Student, options['batch_size'], progress)
+        self.stdout.write(self.style.SUCCESS(f'Backfilled {updated} scan(s).'))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.scans.purge import pending_deletions, purge_deleted
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete events and users marked deleted, emptying their scan history and other '
+        'dependent rows in small batches first.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per transaction (default: 5000).')
+        parser.add_argument(
+            '--pause', type=float, default=0,
+            help='Seconds to sleep between batches, to leave room for ingest (default: 0).'
+        )
+        parser.add_argument(
+            '--interval', type=int, default=0,
+            help='Keep running and purge newly deleted rows every N seconds (default: run once).'
+        )
+
+    def handle(self, *args, **options):
+        interval = options['interval']
+
+        def progress(instance, table, deleted):
+            self.stdout.write(f'  {instance}: {deleted} {table} row(s) deleted')
+
+        while True:
+            for pending in pending_deletions():
+                self.stdout.write(
+                    f"{pending['type'].title()} {pending['name']}: {pending['scan_logs_remaining']} scan(s) to purge."
+                )
+            purged = purge_deleted(options['batch_size'], options['pause'], progress)
+            self.stdout.write(f'Purged {purged} deleted event(s)/user(s).')
+            if not interval:
+                break
+            time.sleep(interval)
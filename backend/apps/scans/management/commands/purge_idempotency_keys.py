@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from apps.scans.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = 'Delete scan idempotency keys older than IDEMPOTENCY_KEY_TTL_HOURS.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        deleted = purge_expired(options['batch_size'])
+        self.stdout.write(f'Deleted {deleted} expired idempotency key(s).')
@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.models import Event
+from apps.scans.reclassify import count_students, reclassify_event
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute SUCCESS/DUPLICATE statuses of events' scans under their current duplicate "
+        'policy, in batches of students, and refresh the counters derived from them.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('event_ids', nargs='+')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Students per batch (default: 5000).')
+
+    def handle(self, *args, **options):
+        events = Event.objects.in_bulk(options['event_ids'])
+        missing = set(options['event_ids']) - set(events)
+        if missing:
+            raise CommandError(f"Unknown event(s): {', '.join(sorted(missing))}")
+
+        for event_id, event in events.items():
+            students = count_students(event_id)
+            self.stdout.write(f'{event.name} ({event.duplicate_policy}): {students} student(s) to reclassify.')
+
+            def progress(batches, changed):
+                done = min(batches * options['batch_size'], students)
+                self.stdout.write(f'  {done}/{students} students, {changed} status change(s)')
+
+            promoted, demoted = reclassify_event(event_id, options['batch_size'], progress)
+            self.stdout.write(self.style.SUCCESS(
+                f'  {promoted} scan(s) now SUCCESS, {demoted} now DUPLICATE.'
+            ))
@@ -0,0 +1,47 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:41
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_seq(apps, schema_editor):
+    """Number existing scans per event in timestamp order and advance Event.scan_seq past them."""
+    Event = apps.get_model('events', 'Event')
+    ScanLog = apps.get_model('scans', 'ScanLog')
+
+    for event in Event.objects.only('id', 'scan_seq').iterator():
+        batch = []
+        seq = 0
+        for scan in ScanLog.objects.filter(event_id=event.id).only('id').order_by('timestamp', 'id').iterator():
+            seq += 1
+            scan.seq = seq
+            batch.append(scan)
+            if len(batch) >= 1000:
+                ScanLog.objects.bulk_update(batch, ['seq'])
+                batch = []
+        if batch:
+            ScanLog.objects.bulk_update(batch, ['seq'])
+        if seq:
+            Event.objects.filter(pk=event.id).update(scan_seq=event.scan_seq + seq)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_status_indexes'),
+        ('scans', '0003_scanlog_is_override_scanlog_last_scan_at_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanlog',
+            name='seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='scanlog',
+            index=models.Index(fields=['event', 'seq'], name='scan_logs_event_seq_idx'),
+        ),
+        migrations.RunPython(backfill_seq, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:45
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0005_event_status_indexes'),
+        ('scans', '0004_scanlog_seq'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Student',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('student_id', models.CharField(max_length=50, unique=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'Student',
+                'verbose_name_plural': 'Students',
+                'db_table': 'students',
+            },
+        ),
+        migrations.AddField(
+            model_name='scanlog',
+            name='student_key',
+            field=models.ForeignKey(blank=True, db_column='student_key', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='scan_logs', to='scans.student'),
+        ),
+        migrations.AddIndex(
+            model_name='scanlog',
+            index=models.Index(fields=['event', 'student_key'], name='scan_logs_event_student_idx'),
+        ),
+    ]
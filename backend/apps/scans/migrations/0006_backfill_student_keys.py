@@ -0,0 +1,21 @@
+from django.db import migrations
+
+from apps.scans.students import backfill_student_keys
+
+
+def backfill(apps, schema_editor):
+    backfill_student_keys(apps.get_model('scans', 'ScanLog'), apps.get_model('scans', 'Student'))
+
+
+class Migration(migrations.Migration):
+
+    # Batches commit independently so a large table is never locked in one transaction
+    atomic = False
+
+    dependencies = [
+        ('scans', '0005_student_scanlog_student_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0006_eventreportsnapshot'),
+        ('scans', '0006_backfill_student_keys'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scanlog',
+            index=models.Index(fields=['student_id'], name='scan_logs_student_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='scanlog',
+            index=models.Index(fields=['timestamp'], name='scan_logs_timestamp_idx'),
+        ),
+    ]
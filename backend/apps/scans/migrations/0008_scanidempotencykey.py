@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-19 04:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans', '0007_scanlog_admin_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScanIdempotencyKey',
+            fields=[
+                ('key_hash', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('scan_log', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='scans.scanlog')),
+            ],
+            options={
+                'verbose_name': 'Scan Idempotency Key',
+                'verbose_name_plural': 'Scan Idempotency Keys',
+                'db_table': 'scan_idempotency_keys',
+            },
+        ),
+    ]
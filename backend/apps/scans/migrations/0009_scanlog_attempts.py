@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-19 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scans', '0008_scanidempotencykey'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanlog',
+            name='attempts',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
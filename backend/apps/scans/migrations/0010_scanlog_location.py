@@ -0,0 +1,30 @@
+# Generated by Django 5.0.6 on 2026-10-19 05:01
+
+from django.db import migrations, models
+
+
+def backfill_locations(apps, schema_editor):
+    """Attribute existing scans to the door their scanner is currently assigned to."""
+    EventUser = apps.get_model('events', 'EventUser')
+    ScanLog = apps.get_model('scans', 'ScanLog')
+
+    assignments = EventUser.objects.exclude(location__isnull=True).exclude(location='')
+    for event_id, user_id, location in assignments.values_list('event_id', 'user_id', 'location').iterator():
+        ScanLog.objects.filter(event_id=event_id, scanner_id=user_id, location__isnull=True).update(location=location)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_collapse_duplicates'),
+        ('scans', '0009_scanlog_attempts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='scanlog',
+            name='location',
+            field=models.CharField(blank=True, max_length=255, null=True),
+        ),
+        migrations.RunPython(backfill_locations, migrations.RunPython.noop),
+    ]
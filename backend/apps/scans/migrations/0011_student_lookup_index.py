@@ -0,0 +1,27 @@
+# Generated by Django 5.0.6 on 2026-10-19 05:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_collapse_duplicates'),
+        ('scans', '0010_scanlog_location'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Create the composite index first: MySQL needs an index for the FK at all times
+        migrations.AddIndex(
+            model_name='scanlog',
+            index=models.Index(fields=['student_key', '-timestamp', '-id'], name='scan_logs_student_time_idx'),
+        ),
+        migrations.AlterField(
+            model_name='scanlog',
+            name='student_key',
+            field=models.ForeignKey(blank=True, db_column='student_key', db_index=False, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='scan_logs', to='scans.student'),
+        ),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.utils import timezone
+from apps.events.models import Event
+from .signals import scan_folded
 import uuid
 
 
@@ -7,6 +10,56 @@ def generate_uuid():
     return str(uuid.uuid4().hex[:25])
 
 
+def normalize_student_id(student_id):
+    return student_id.strip().upper()
+
+
+class Student(models.Model):
+    """Dimension table mapping each normalized student ID to a compact integer key."""
+    id = models.BigAutoField(primary_key=True)
+    student_id = models.CharField(max_length=50, unique=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'students'
+        verbose_name = 'Student'
+        verbose_name_plural = 'Students'
+
+    def __str__(self):
+        return self.student_id
+
+
+class ScanLogManager(models.Manager):
+    def fold_duplicate(self, event_id, student_key_id, scanner_id, location=None, timestamp=None, since=None):
+        """
+        Count a repeat duplicate scan on the student's latest DUPLICATE row.
+
+        Returns the updated row, or None if there is no DUPLICATE row (taken at
+        or after ``since``, if given) to fold into yet; the caller then stores
+        the scan normally. The row takes a new ``seq`` so incremental feeds
+        pick up the changed count.
+        """
+        timestamp = timestamp or timezone.now()
+        with transaction.atomic():
+            # The event row lock serializes this with inserts for the same event
+            Event.objects.filter(pk=event_id).update(scan_seq=F('scan_seq') + 1)
+            duplicates = self.filter(event_id=event_id, student_key_id=student_key_id, status='DUPLICATE')
+            if since is not None:
+                duplicates = duplicates.filter(timestamp__gte=since)
+            row = duplicates.order_by('-seq').first()
+            if row is None:
+                transaction.set_rollback(True)
+                return None
+            row.seq = Event.objects.filter(pk=event_id).values_list('scan_seq', flat=True).get()
+            row.attempts += 1
+            row.last_scan_at = timestamp
+            self.filter(pk=row.pk).update(seq=row.seq, attempts=F('attempts') + 1, last_scan_at=timestamp)
+            scan_folded.send(
+                sender=self.model, scan_log=row, scanner_id=scanner_id, location=location, timestamp=timestamp
+            )
+        return row
+
+
 class ScanLog(models.Model):
     STATUS_CHOICES = [
         ('SUCCESS', 'Success'),
@@ -19,6 +72,14 @@ class ScanLog(models.Model):
     event = models.ForeignKey('events.Event', on_delete=models.CASCADE, related_name='scan_logs')
     scanner = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='scan_logs')
     student_id = models.CharField(max_length=50)
+    # Door the scanner was assigned to at scan time (EventUser.location)
+    location = models.CharField(max_length=255, null=True, blank=True)
+    # Integer surrogate for the normalized student ID; used for dedup and unique counts.
+    # Indexed by scan_logs_student_time_idx, which leads with this column.
+    student_key = models.ForeignKey(
+        Student, on_delete=models.PROTECT, null=True, blank=True, db_column='student_key', related_name='scan_logs',
+        db_index=False,
+    )
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='SUCCESS')
     timestamp = models.DateTimeField(default=timezone.now)
     
@@ -26,12 +87,72 @@ class ScanLog(models.Model):
     is_override = models.BooleanField(default=False)
     override_reason = models.CharField(max_length=255, null=True, blank=True)
     last_scan_at = models.DateTimeField(null=True, blank=True)
+    # Scan attempts this row stands for; above 1 only for collapsed duplicates
+    attempts = models.PositiveIntegerField(default=1)
+    
+    # Per-event insertion sequence (from Event.scan_seq), used as a sync cursor
+    seq = models.PositiveBigIntegerField(default=0, editable=False)
+
+    objects = ScanLogManager()
 
     class Meta:
         db_table = 'scan_logs'
         verbose_name = 'Scan Log'
         verbose_name_plural = 'Scan Logs'
         ordering = ['-timestamp']
+        indexes = [
+            models.Index(fields=['event', 'seq'], name='scan_logs_event_seq_idx'),
+            models.Index(fields=['event', 'student_key'], name='scan_logs_event_student_idx'),
+            # Admin prefix search and date hierarchy
+            models.Index(fields=['student_id'], name='scan_logs_student_id_idx'),
+            models.Index(fields=['timestamp'], name='scan_logs_timestamp_idx'),
+            # Student lookup: one student's scans, newest first, seekable by (timestamp, id)
+            models.Index(fields=['student_key', '-timestamp', '-id'], name='scan_logs_student_time_idx'),
+        ]
+
+    def __str__(self):
+        # Only local columns, so listing scans never triggers per-row queries
+        return f"{self.student_id} @ {self.event_id} ({self.status})"
+    
+    def save(self, *args, **kwargs):
+        """
+        Override save to bump the event's scan sequence used for ETags and sync cursors.
+
+        Bumping first takes the event row lock, so new rows get their ``seq`` in
+        commit order and clients can safely resume from the highest seq they saw.
+        """
+        if self.student_key_id is None and self.student_id:
+            from .students import intern_student
+            self.student_key_id = intern_student(self.student_id)
+        
+        with transaction.atomic():
+            Event.objects.filter(pk=self.event_id).update(scan_seq=F('scan_seq') + 1)
+            if self._state.adding and not self.seq:
+                self.seq = Event.objects.filter(pk=self.event_id).values_list('scan_seq', flat=True).get()
+            super().save(*args, **kwargs)
+    
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            result = super().delete(*args, **kwargs)
+            Event.objects.filter(pk=self.event_id).update(scan_seq=F('scan_seq') + 1)
+        return result
+
+
+class ScanIdempotencyKey(models.Model):
+    """
+    Idempotency-Key sent with a scan POST, remembered for IDEMPOTENCY_KEY_TTL.
+
+    The key is stored as a 64-bit hash of (client, key) so that replay checks
+    are a single primary-key lookup; see apps.scans.idempotency.
+    """
+    key_hash = models.BigIntegerField(primary_key=True)
+    scan_log = models.ForeignKey(ScanLog, on_delete=models.CASCADE, related_name='+')
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        db_table = 'scan_idempotency_keys'
+        verbose_name = 'Scan Idempotency Key'
+        verbose_name_plural = 'Scan Idempotency Keys'
 
     def __str__(self):
-        return f"{self.event.name} - {self.student_id} by {self.scanner.name}"
+        return str(self.key_hash)
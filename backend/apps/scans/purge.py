@@ -0,0 +1,111 @@
+"""
+Background purge of events and users marked deleted.
+
+Deleting an event or user through the API or admin only marks it deleted
+(``mark_deleted()``), which is instant. purge_deleted() later empties every
+table that would cascade from it, ``batch_size`` rows per short transaction,
+and only then deletes the parent itself, so the deletion collector never
+loads a large scan history and scan_logs is never locked for long.
+"""
+import time
+
+from django.db import models, transaction
+from django.db.models import F
+
+from apps.events.models import Event
+from apps.users.models import User
+from .models import ScanLog
+from .signals import scans_purged
+
+
+def _cascades(instance):
+    """Querysets of the rows that deleting ``instance`` would cascade to, scan_logs first."""
+    relations = [
+        relation for relation in instance._meta.related_objects
+        if not relation.many_to_many and relation.on_delete is models.CASCADE
+    ]
+    relations.sort(key=lambda relation: relation.related_model is not ScanLog)
+    for relation in relations:
+        yield relation.related_model._base_manager.filter(**{relation.field.name: instance.pk})
+
+
+def _delete_in_batches(queryset, batch_size, pause=0, on_batch=None):
+    """Delete ``queryset`` by primary key, one short transaction per batch. Yields the running total."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not ids:
+                return
+            batch = model._base_manager.filter(pk__in=ids)
+            if on_batch:
+                on_batch(batch)
+            batch.delete()
+        deleted += len(ids)
+        yield deleted
+        if pause:
+            time.sleep(pause)
+
+
+def purge(instance, batch_size=5000, pause=0, progress=None):
+    """
+    Delete a marked event or user and everything that cascades from it, in batches.
+
+    Calls ``progress(instance, table, rows_deleted)`` after each batch. Safe to
+    rerun after an interruption: it carries on where the last run stopped.
+    """
+    touched_events = set()
+    touched_days = set()
+
+    def touch_events(scans):
+        # Other events lose scans too (deleted scanner): version them like any scan write
+        event_ids = set(scans.values_list('event_id', flat=True).distinct())
+        Event.objects.filter(pk__in=event_ids).update(scan_seq=F('scan_seq') + 1)
+        touched_events.update(event_ids)
+        # Cross-event aggregates (the per-day attendee sketches) lose these days' scans
+        touched_days.update(scans.dates('timestamp', 'day'))
+
+    for queryset in _cascades(instance):
+        on_batch = touch_events if queryset.model is ScanLog else None
+        for deleted in _delete_in_batches(queryset, batch_size, pause, on_batch):
+            if progress:
+                progress(instance, queryset.model._meta.db_table, deleted)
+    instance.delete()
+
+    live_events = list(Event.objects.filter(pk__in=touched_events).values_list('pk', flat=True))
+    if live_events or touched_days:
+        scans_purged.send(sender=ScanLog, event_ids=live_events, days=sorted(touched_days))
+
+
+def marked_for_deletion():
+    """Events and users waiting to be purged, oldest first."""
+    events = Event.all_objects.filter(deleted_at__isnull=False).order_by('deleted_at')
+    users = User.objects.filter(deleted_at__isnull=False).order_by('deleted_at')
+    return list(events) + list(users)
+
+
+def purge_deleted(batch_size=5000, pause=0, progress=None):
+    """Purge every marked event and user. Returns how many were purged."""
+    pending = marked_for_deletion()
+    for instance in pending:
+        purge(instance, batch_size, pause, progress)
+    return len(pending)
+
+
+def pending_deletions():
+    """Progress report: each marked event or user with the scans it still has."""
+    report = []
+    for instance in marked_for_deletion():
+        if isinstance(instance, Event):
+            kind, scans = 'event', ScanLog.objects.filter(event_id=instance.pk)
+        else:
+            kind, scans = 'user', ScanLog.objects.filter(scanner_id=instance.pk)
+        report.append({
+            'type': kind,
+            'id': instance.pk,
+            'name': instance.name,
+            'deleted_at': instance.deleted_at,
+            'scan_logs_remaining': scans.count(),
+        })
+    return report
@@ -0,0 +1,91 @@
+"""
+Set-based recomputation of SUCCESS/DUPLICATE statuses after a duplicate-policy change.
+
+Within each group (student for ONCE_PER_EVENT, student and day for
+ONCE_PER_DAY) the earliest scan is SUCCESS and the rest are DUPLICATE, ranked
+in SQL with ROW_NUMBER(). Promotions and demotions are each one UPDATE whose
+``id IN`` subquery selects from the ranked rows as a derived table; MySQL
+rejects an UPDATE whose subquery reads the table being updated directly
+(error 1093), but a materialized derived table is allowed. Every non-ERROR
+scan takes part in the ranking, as in the duplicate check at ingest, but
+overrides keep their status. Work is split into ranges of student keys so each
+batch is a short transaction over the (event, student_key) index.
+"""
+from django.db import transaction
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber, TruncDate
+
+from apps.events.models import Event
+from .models import ScanLog
+from .signals import scans_reclassified
+
+
+def _ranked_scans(event_id):
+    return ScanLog.objects.filter(event_id=event_id, student_key__isnull=False).exclude(status='ERROR')
+
+
+def _student_ranges(scans, batch_size):
+    """Yield (lower, upper) student-key bounds covering ``batch_size`` students each."""
+    keys = scans.order_by('student_key').values_list('student_key', flat=True).distinct()
+    lower = None
+    while True:
+        remaining = keys if lower is None else keys.filter(student_key__gt=lower)
+        bound = list(remaining[batch_size - 1:batch_size])
+        upper = bound[0] if bound else None
+        yield lower, upper
+        if upper is None:
+            return
+        lower = upper
+
+
+def _reclassify_range(scans, policy, lower, upper):
+    if lower is not None:
+        scans = scans.filter(student_key__gt=lower)
+    if upper is not None:
+        scans = scans.filter(student_key__lte=upper)
+
+    if policy == 'ALLOW_DUPLICATES':
+        return scans.filter(status='DUPLICATE', is_override=False).update(status='SUCCESS'), 0
+
+    partition = [F('student_key')]
+    if policy == 'ONCE_PER_DAY':
+        partition.append(TruncDate('timestamp'))
+    ranked = scans.annotate(scan_rank=Window(
+        RowNumber(), partition_by=partition, order_by=[F('timestamp').asc(), F('seq').asc(), F('id').asc()],
+    ))
+    # Filtering on a window wraps the ranked query in a derived table
+    first = ranked.filter(scan_rank=1).values('pk')
+    repeats = ranked.filter(scan_rank__gt=1).values('pk')
+    promoted = scans.filter(status='DUPLICATE', is_override=False, pk__in=first).update(status='SUCCESS')
+    demoted = scans.filter(status='SUCCESS', is_override=False, pk__in=repeats).update(status='DUPLICATE')
+    return promoted, demoted
+
+
+def count_students(event_id):
+    return _ranked_scans(event_id).order_by().values('student_key').distinct().count()
+
+
+def reclassify_event(event_id, batch_size=5000, progress=None):
+    """
+    Recompute the statuses of an event's scans under its current duplicate policy.
+
+    Calls ``progress(batches_done, rows_changed)`` after each batch. When
+    anything changed, bumps the event's scan sequence (ETags, report snapshots)
+    and sends ``scans_reclassified``. Returns (promoted, demoted) row counts.
+    """
+    policy = Event.objects.values_list('duplicate_policy', flat=True).get(pk=event_id)
+    scans = _ranked_scans(event_id)
+
+    promoted = demoted = 0
+    for done, (lower, upper) in enumerate(_student_ranges(scans, batch_size), start=1):
+        with transaction.atomic():
+            batch_promoted, batch_demoted = _reclassify_range(scans, policy, lower, upper)
+        promoted += batch_promoted
+        demoted += batch_demoted
+        if progress:
+            progress(done, promoted + demoted)
+
+    if promoted or demoted:
+        Event.objects.filter(pk=event_id).update(scan_seq=F('scan_seq') + 1)
+        scans_reclassified.send(sender=ScanLog, event_id=event_id)
+    return promoted, demoted
@@ -1,6 +1,8 @@
+from django.utils import timezone
 from rest_framework import serializers
 from .models import ScanLog
-from apps.events.models import Event
+from .students import intern_student
+from apps.events.models import Event, EventUser
 from apps.users.models import User
 
 
@@ -12,9 +14,9 @@ class ScanLogSerializer(serializers.ModelSerializer):
         model = ScanLog
         fields = [
             'id', 'event_id', 'scanner_id', 'student_id', 'status', 'timestamp',
-            'event_name', 'scanner_name'
+            'event_name', 'scanner_name', 'attempts', 'last_scan_at', 'location'
         ]
-        read_only_fields = ['id', 'timestamp']
+        read_only_fields = ['id', 'timestamp', 'attempts', 'last_scan_at', 'location']
 
     def create(self, validated_data):
         event_id = validated_data.get('event_id')
@@ -24,8 +26,8 @@ class ScanLogSerializer(serializers.ModelSerializer):
         # Check if this student was already scanned for this event
         existing_scan = ScanLog.objects.filter(
             event_id=event_id,
-            student_id=student_id
-        ).first()
+            student_key_id=intern_student(student_id)
+        ).exists()
 
         status = 'SUCCESS'
         if existing_scan:
@@ -35,6 +37,44 @@ class ScanLogSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+# Columns rendered by ScanLogSerializer, in field order, with the joined names
+SCAN_LOG_VALUES = (
+    'id', 'event_id', 'scanner_id', 'student_id', 'status', 'timestamp',
+    'event__name', 'scanner__name', 'attempts', 'last_scan_at', 'location',
+)
+
+
+def scan_log_values(queryset, *extra):
+    """Tuples of SCAN_LOG_VALUES (then any ``extra`` columns) for render_scan_logs()."""
+    return queryset.select_related(None).values_list(*SCAN_LOG_VALUES, *extra)
+
+
+def render_scan_logs(rows):
+    """
+    Render scan_log_values() rows exactly as ScanLogSerializer(many=True) would,
+    without building model instances or per-row field objects.
+    """
+    fields = ScanLogSerializer().fields
+    timestamp = fields['timestamp'].to_representation
+    last_scan_at = fields['last_scan_at'].to_representation
+    return [
+        {
+            'id': row[0],
+            'event_id': row[1],
+            'scanner_id': row[2],
+            'student_id': row[3],
+            'status': row[4],
+            'timestamp': timestamp(row[5]),
+            'event_name': row[6],
+            'scanner_name': row[7],
+            'attempts': row[8],
+            'last_scan_at': last_scan_at(row[9]) if row[9] is not None else None,
+            'location': row[10],
+        }
+        for row in rows
+    ]
+
+
 class ScanLogCreateSerializer(serializers.Serializer):
     event_id = serializers.CharField()
     scanner_id = serializers.CharField()
@@ -42,33 +82,53 @@ class ScanLogCreateSerializer(serializers.Serializer):
 
     def validate_event_id(self, value):
         try:
-            Event.objects.get(id=value)
+            self.event = Event.objects.get(id=value)
         except Event.DoesNotExist:
             raise serializers.ValidationError("Event not found")
         return value
 
     def validate_scanner_id(self, value):
         try:
-            User.objects.get(id=value, role='USER')
+            User.objects.get(id=value, role='USER', deleted_at__isnull=True)
         except User.DoesNotExist:
             raise serializers.ValidationError("Scanner not found")
         return value
 
     def create(self, validated_data):
-        # Check if this student was already scanned for this event
-        existing_scan = ScanLog.objects.filter(
-            event_id=validated_data['event_id'],
-            student_id=validated_data['student_id']
-        ).first()
+        student_key_id = intern_student(validated_data['student_id'])
+        location = EventUser.objects.location_for(validated_data['event_id'], validated_data['scanner_id'])
+        
+        # Check if this student was already scanned for this event (today, for ONCE_PER_DAY)
+        policy = self.event.duplicate_policy
+        since = None
+        if policy == 'ONCE_PER_DAY':
+            since = timezone.localtime().replace(hour=0, minute=0, second=0, microsecond=0)
+        existing_scan = False
+        if policy != 'ALLOW_DUPLICATES':
+            earlier = ScanLog.objects.filter(
+                event_id=validated_data['event_id'],
+                student_key_id=student_key_id
+            ).exclude(status='ERROR')
+            if since is not None:
+                earlier = earlier.filter(timestamp__gte=since)
+            existing_scan = earlier.exists()
 
         status = 'SUCCESS'
         if existing_scan:
             status = 'DUPLICATE'
+            if self.event.collapse_duplicates:
+                folded = ScanLog.objects.fold_duplicate(
+                    self.event.id, student_key_id, validated_data['scanner_id'], location, since=since
+                )
+                if folded is not None:
+                    return folded
 
         scan_log = ScanLog.objects.create(
             event_id=validated_data['event_id'],
             scanner_id=validated_data['scanner_id'],
             student_id=validated_data['student_id'],
+            student_key_id=student_key_id,
+            location=location,
             status=status
         )
         
@@ -0,0 +1,15 @@
+from django.dispatch import Signal
+
+# Sent when a repeat duplicate is counted on an existing row instead of saved as
+# a new one (ScanLogManager.fold_duplicate). Arguments: scan_log, scanner_id,
+# location, timestamp.
+scan_folded = Signal()
+
+# Sent after reclassify_event() rewrote statuses of an event's scans in bulk, so
+# that counters derived from SUCCESS/DUPLICATE can be rebuilt. Arguments: event_id.
+scans_reclassified = Signal()
+
+# Sent by apps.scans.purge after a deleted event's or user's scans were removed,
+# so that counters derived from them can be rebuilt. Arguments: event_ids (live
+# events that lost scans) and days (local dates of all removed scans).
+scans_purged = Signal()
@@ -0,0 +1,68 @@
+"""
+Interning of student IDs into the students dimension table.
+"""
+from collections import OrderedDict
+
+from django.db import transaction
+
+from .models import Student, normalize_student_id
+
+# Per-process LRU of normalized student ID -> Student.pk
+_intern_cache = OrderedDict()
+_INTERN_CACHE_SIZE = 100_000
+
+
+def _remember(normalized, key):
+    _intern_cache[normalized] = key
+    _intern_cache.move_to_end(normalized)
+    while len(_intern_cache) > _INTERN_CACHE_SIZE:
+        _intern_cache.popitem(last=False)
+
+
+def intern_student(student_id):
+    """Return the integer key for a student ID, creating the dimension row on first sighting."""
+    normalized = normalize_student_id(student_id)
+    key = _intern_cache.get(normalized)
+    if key is not None:
+        _intern_cache.move_to_end(normalized)
+        return key
+
+    student, _ = Student.objects.get_or_create(student_id=normalized)
+    # Only cache keys that survive the surrounding transaction: a row found inside it may
+    # have been created earlier in the same transaction. Runs at once outside a transaction.
+    transaction.on_commit(lambda: _remember(normalized, student.pk))
+    return student.pk
+
+
+def backfill_student_keys(scan_model, student_model, batch_size=5000, progress=None):
+    """
+    Set student_key on scans that lack it, in batches of ``batch_size`` rows.
+
+    Takes the model classes so it can run from a data migration as well as from
+    the backfill_student_keys command. Returns the number of scans updated.
+    """
+    updated = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                scan_model.objects.filter(student_key__isnull=True)
+                .order_by('id')
+                .only('id', 'student_id')[:batch_size]
+            )
+            if not batch:
+                break
+
+            wanted = {normalize_student_id(scan.student_id) for scan in batch}
+            student_model.objects.bulk_create(
+                [student_model(student_id=normalized) for normalized in wanted], ignore_conflicts=True
+            )
+            keys = dict(student_model.objects.filter(student_id__in=wanted).values_list('student_id', 'id'))
+
+            for scan in batch:
+                scan.student_key_id = keys[normalize_student_id(scan.student_id)]
+            scan_model.objects.bulk_update(batch, ['student_key'])
+
+        updated += len(batch)
+        if progress:
+            progress(updated)
+    return updated
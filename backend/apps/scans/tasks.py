@@ -0,0 +1,43 @@
+from apps.events.models import Event
+from apps.jobs.registry import task
+from apps.users.models import User
+from .models import ScanLog
+from .purge import purge
+from .reclassify import count_students, reclassify_event
+
+
+@task('scans.reclassify')
+def reclassify(job, event_id, batch_size=5000):
+    students = count_students(event_id)
+    job.report_progress(0, students, 'Reclassifying')
+
+    def progress(batches, changed):
+        job.report_progress(min(batches * batch_size, students), message=f'{changed} status change(s)')
+
+    promoted, demoted = reclassify_event(event_id, batch_size, progress)
+    return {'promoted': promoted, 'demoted': demoted}
+
+
+@task('scans.purge')
+def purge_marked(job, model, pk, batch_size=5000):
+    """Purge one event or user marked deleted; nothing to do if it is already gone."""
+    if model == 'event':
+        instance = Event.all_objects.filter(pk=pk, deleted_at__isnull=False).first()
+        scans = ScanLog.objects.filter(event_id=pk)
+    else:
+        instance = User.objects.filter(pk=pk, deleted_at__isnull=False).first()
+        scans = ScanLog.objects.filter(scanner_id=pk)
+    if instance is None:
+        return {'purged': False}
+
+    total = scans.count()
+    job.report_progress(0, total, 'Deleting scans')
+
+    def progress(instance, table, deleted):
+        if table == ScanLog._meta.db_table:
+            job.report_progress(deleted, message=f'{deleted} scan(s) deleted')
+        else:
+            job.report_progress(total, message=f'{deleted} {table} row(s) deleted')
+
+    purge(instance, batch_size, progress=progress)
+    return {'purged': True, 'scan_logs_deleted': total}
@@ -0,0 +1,275 @@
+from datetime import datetime, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.test import APIClient
+
+from apps.events.models import Event
+from apps.users.models import User
+from .models import ScanIdempotencyKey, ScanLog
+from . import idempotency, students
+from .dedup import decode_student_ids, encode_student_ids
+from .reclassify import reclassify_event
+from .throttling import ingest_gate
+
+
+def at(day, hour):
+    return timezone.make_aware(datetime(2026, 3, day, hour))
+
+
+class ReclassifyTests(TestCase):
+    def setUp(self):
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.event = Event.objects.create(name='Fair', is_permanent=True)
+        scans = [
+            ('a1', 'A', 'SUCCESS', at(2, 10), False),
+            ('a2', 'A', 'DUPLICATE', at(2, 11), False),
+            ('a3', 'a ', 'DUPLICATE', at(3, 10), False),
+            ('b1', 'B', 'ERROR', at(2, 9), False),
+            ('b2', 'B', 'DUPLICATE', at(2, 12), False),
+            ('c1', 'C', 'SUCCESS', at(2, 8), True),
+            ('c2', 'C', 'DUPLICATE', at(2, 9), False),
+        ]
+        for pk, student_id, status, timestamp, is_override in scans:
+            ScanLog.objects.create(
+                id=pk, event=self.event, scanner=self.scanner, student_id=student_id,
+                status=status, timestamp=timestamp, is_override=is_override,
+            )
+
+    def reclassify(self, policy, batch_size=5000):
+        Event.objects.filter(pk=self.event.pk).update(duplicate_policy=policy)
+        result = reclassify_event(self.event.pk, batch_size=batch_size)
+        return result, dict(ScanLog.objects.values_list('id', 'status'))
+
+    def test_once_per_event(self):
+        (promoted, demoted), statuses = self.reclassify('ONCE_PER_EVENT')
+        self.assertEqual((promoted, demoted), (1, 0))
+        # The override is the student's first scan, so the later one stays a duplicate
+        self.assertEqual(statuses, {
+            'a1': 'SUCCESS', 'a2': 'DUPLICATE', 'a3': 'DUPLICATE',
+            'b1': 'ERROR', 'b2': 'SUCCESS', 'c1': 'SUCCESS', 'c2': 'DUPLICATE',
+        })
+
+    def test_once_per_day(self):
+        (promoted, demoted), statuses = self.reclassify('ONCE_PER_DAY', batch_size=1)
+        self.assertEqual((promoted, demoted), (2, 0))
+        self.assertEqual(statuses['a2'], 'DUPLICATE')
+        self.assertEqual(statuses['a3'], 'SUCCESS')
+
+    def test_allow_duplicates_then_back(self):
+        (promoted, demoted), statuses = self.reclassify('ALLOW_DUPLICATES')
+        self.assertEqual((promoted, demoted), (4, 0))
+        self.assertEqual(statuses['b1'], 'ERROR')
+        self.assertTrue(all(status == 'SUCCESS' for pk, status in statuses.items() if pk != 'b1'))
+
+        seq = Event.objects.values_list('scan_seq', flat=True).get(pk=self.event.pk)
+        (promoted, demoted), statuses = self.reclassify('ONCE_PER_EVENT', batch_size=2)
+        self.assertEqual((promoted, demoted), (0, 3))
+        self.assertEqual((statuses['a2'], statuses['a3'], statuses['c2']), ('DUPLICATE', 'DUPLICATE', 'DUPLICATE'))
+        self.assertGreater(Event.objects.values_list('scan_seq', flat=True).get(pk=self.event.pk), seq)
+
+    def test_nothing_to_change(self):
+        self.reclassify('ONCE_PER_EVENT')
+        (promoted, demoted), _ = self.reclassify('ONCE_PER_EVENT')
+        self.assertEqual((promoted, demoted), (0, 0))
+
+
+class IngestAdmissionTests(TestCase):
+    def setUp(self):
+        # Token buckets live in the cache; interned student keys of earlier tests were rolled back
+        cache.clear()
+        students._intern_cache.clear()
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.event = Event.objects.create(name='Fair', is_permanent=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.scanner)
+
+    def post_scan(self, student_id):
+        return self.client.post('/api/scan-logs/', {
+            'event_id': self.event.pk, 'scanner_id': self.scanner.pk, 'student_id': student_id,
+        }, format='json')
+
+    @override_settings(INGEST_MAX_IN_FLIGHT=2)
+    def test_saturated_gate_sheds_with_retry_after(self):
+        shed = ingest_gate.stats()['shed']
+        slots = [ingest_gate.enter(), ingest_gate.enter()]
+        try:
+            response = self.post_scan('S0001')
+        finally:
+            for started in slots:
+                ingest_gate.leave(started)
+        self.assertEqual(response.status_code, 503)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(ingest_gate.stats()['shed'], shed + 1)
+        self.assertFalse(ScanLog.objects.exists())
+
+        self.assertEqual(self.post_scan('S0001').status_code, 201)
+        self.assertEqual(ingest_gate.stats()['in_flight'], 0)
+
+    @override_settings(INGEST_SCANNER_BURST=3, INGEST_SCANNER_RATE=0.1)
+    def test_scanner_over_its_bucket_gets_429_with_retry_after(self):
+        for index in range(3):
+            self.assertEqual(self.post_scan(f'S{index:04d}').status_code, 201)
+        response = self.post_scan('S0003')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+        self.assertEqual(ScanLog.objects.count(), 3)
+
+
+@override_settings(INGEST_SCANNER_BURST=1, INGEST_SCANNER_RATE=0.01)
+class IdempotentIngestTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        students._intern_cache.clear()
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.event = Event.objects.create(name='Fair', is_permanent=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.scanner)
+
+    def post_scan(self, student_id, key):
+        return self.client.post('/api/scan-logs/', {
+            'event_id': self.event.pk, 'scanner_id': self.scanner.pk, 'student_id': student_id,
+        }, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_replay_is_not_throttled(self):
+        first = self.post_scan('S0001', 'k1')
+        self.assertEqual(first.status_code, 201)
+        # The bucket is empty, but a retry of the stored scan is still answered
+        for _ in range(3):
+            retry = self.post_scan('S0001', 'k1')
+            self.assertEqual(retry.status_code, 201)
+            self.assertEqual(retry['Idempotent-Replayed'], 'true')
+            self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(self.post_scan('S0002', 'k2').status_code, 429)
+        self.assertEqual(ScanLog.objects.count(), 1)
+
+    @override_settings(INGEST_SCANNER_BURST=5)
+    def test_concurrent_request_with_the_same_key_gets_the_stored_scan(self):
+        first = self.post_scan('S0001', 'k1')
+        stored = idempotency.find_replay(idempotency.key_hash(self.scanner.pk, 'k1'))
+        # The retry looked for a replay before the first request committed, then loses the insert race
+        with mock.patch.object(idempotency, 'find_replay', side_effect=[None, stored]):
+            retry = self.post_scan('S0001', 'k1')
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.data['id'], first.data['id'])
+        self.assertEqual(ScanLog.objects.count(), 1)
+
+    @override_settings(INGEST_SCANNER_BURST=5, IDEMPOTENCY_KEY_TTL_HOURS=1)
+    def test_expired_key_records_a_new_scan(self):
+        first = self.post_scan('S0001', 'k1')
+        ScanIdempotencyKey.objects.update(created_at=timezone.now() - timedelta(hours=2))
+        again = self.post_scan('S0001', 'k1')
+        self.assertEqual(again.status_code, 201)
+        self.assertNotIn('Idempotent-Replayed', again)
+        self.assertNotEqual(again.data['id'], first.data['id'])
+        self.assertEqual(again.data['status'], 'DUPLICATE')
+        self.assertEqual(ScanIdempotencyKey.objects.get().scan_log_id, again.data['id'])
+
+
+# The replica connection cannot see the test's uncommitted rows: read from the primary
+@override_settings(REPLICA_DATABASE_ALIAS=None)
+class IncrementalFeedTests(TestCase):
+    def setUp(self):
+        students._intern_cache.clear()
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.event = Event.objects.create(name='Fair', is_permanent=True, duplicate_policy='ALLOW_DUPLICATES')
+        self.other = Event.objects.create(name='Other', is_permanent=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.scanner)
+        for index in range(5):
+            ScanLog.objects.create(
+                event=self.event, scanner=self.scanner, student_id=f'S{index:04d}',
+                status='ERROR' if index == 4 else 'SUCCESS',
+            )
+        ScanLog.objects.create(event=self.other, scanner=self.scanner, student_id='S0000')
+
+    def poll(self, since, **params):
+        response = self.client.get('/api/scan-logs/', {'event_id': self.event.pk, 'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    @mock.patch.object(PageNumberPagination, 'page_size', 2)
+    def test_pages_through_new_scans_in_seq_order(self):
+        expected = list(ScanLog.objects.filter(event=self.event).order_by('seq').values_list('id', flat=True))
+        seen, since, pages = [], 0, 0
+        while True:
+            data = self.poll(since)
+            seen += [row['id'] for row in data['results']]
+            since = data['high_water_mark']
+            pages += 1
+            if not data['has_more']:
+                break
+        self.assertEqual((seen, pages), (expected, 3))
+        self.assertEqual(since, Event.objects.get(pk=self.event.pk).scan_seq)
+
+        self.assertEqual(self.poll(since), {'results': [], 'high_water_mark': since, 'has_more': False})
+        ScanLog.objects.create(event=self.event, scanner=self.scanner, student_id='S0009')
+        data = self.poll(since)
+        self.assertEqual([row['student_id'] for row in data['results']], ['S0009'])
+
+    def test_filtered_feed_advances_past_excluded_rows(self):
+        data = self.poll(0, status='SUCCESS')
+        self.assertEqual(len(data['results']), 4)
+        self.assertEqual(data['high_water_mark'], Event.objects.get(pk=self.event.pk).scan_seq)
+
+    def test_requires_event_and_integer_cursor(self):
+        self.assertEqual(self.client.get('/api/scan-logs/', {'since': 0}).status_code, 400)
+        self.assertEqual(self.client.get('/api/scan-logs/', {'event_id': self.event.pk, 'since': 'x'}).status_code, 400)
+
+
+class DedupEncodingTests(TestCase):
+    def test_round_trip(self):
+        student_ids = ['2024000123', '2024000124', '2024001000', 'S1', 'É-7', '2024000123']
+        self.assertEqual(decode_student_ids(encode_student_ids(student_ids)), sorted(set(student_ids)))
+        self.assertEqual(decode_student_ids(encode_student_ids([])), [])
+
+
+# The replica connection cannot see the test's uncommitted rows: read from the primary
+@override_settings(REPLICA_DATABASE_ALIAS=None)
+class DedupSyncTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        students._intern_cache.clear()
+        self.scanner = User.objects.create_user(pin='1001', name='Scanner')
+        self.event = Event.objects.create(name='Fair', is_permanent=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.scanner)
+
+    def post_scan(self, student_id):
+        response = self.client.post('/api/scan-logs/', {
+            'event_id': self.event.pk, 'scanner_id': self.scanner.pk, 'student_id': student_id,
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        return response.data['status']
+
+    def synced_ids(self):
+        url = f'/api/scan-logs/events/{self.event.pk}/dedup-snapshot/'
+        snapshot = self.client.get(url).data
+        known = set(decode_student_ids(snapshot['data']))
+        since = snapshot['version']
+        return known, since
+
+    def test_snapshot_and_delta_agree_with_ingest(self):
+        self.post_scan(' s0001 ')
+        ScanLog.objects.create(event=self.event, scanner=self.scanner, student_id='S0002', status='ERROR')
+        known, since = self.synced_ids()
+        self.assertEqual(known, {'S0001'})
+
+        # What a device would flag offline is what ingest flags online
+        self.assertEqual(self.post_scan('S0001'), 'DUPLICATE')
+        self.assertEqual(self.post_scan('S0002'), 'SUCCESS')
+        self.assertEqual(self.post_scan('s0003'), 'SUCCESS')
+        ScanLog.objects.create(event=self.event, scanner=self.scanner, student_id='S0004', status='ERROR')
+
+        delta = self.client.get(
+            f'/api/scan-logs/events/{self.event.pk}/dedup-delta/', {'since': since}
+        ).data
+        self.assertEqual(delta['student_ids'], ['S0001', 'S0002', 'S0003'])
+        self.assertEqual(known | set(delta['student_ids']), self.synced_ids()[0])
+        for student_id in ['S0001', 'S0002', 'S0003', 'S0004']:
+            expected = 'DUPLICATE' if student_id in known | set(delta['student_ids']) else 'SUCCESS'
+            self.assertEqual(self.post_scan(student_id), expected)
@@ -0,0 +1,137 @@
+"""
+Admission control for scan ingestion.
+
+Two layers protect the database during a door rush:
+
+* ScannerTokenBucketThrottle (DRF throttle, 429): each scanner gets a bucket of
+  INGEST_SCANNER_BURST tokens refilled at INGEST_SCANNER_RATE per second, kept
+  in the shared cache.
+* IngestAdmissionMixin (503): at most INGEST_MAX_IN_FLIGHT scan writes run at
+  once in each worker process. Extra requests are turned away immediately,
+  before authentication or any query, instead of queueing on the database.
+  The count is deliberately local (a shared counter would cost a round trip
+  per scan and leak slots when a worker dies), so the deployment-wide limit is
+  the number of worker processes times INGEST_MAX_IN_FLIGHT.
+
+Both responses carry ``Retry-After``.
+"""
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.throttling import BaseThrottle
+
+MAX_RETRY_AFTER = 30
+
+
+class Overloaded(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Scan ingestion is overloaded, retry shortly.'
+    default_code = 'overloaded'
+
+    def __init__(self, wait):
+        super().__init__()
+        # Read by DRF's exception handler to set Retry-After
+        self.wait = wait
+
+
+class InFlightGate:
+    """Per-process cap on concurrent scan writes, with a running service-time estimate."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.admitted = 0
+        self.shed = 0
+        self._shed_window_start = time.monotonic()
+        self._shed_in_window = 0
+        self._service_seconds = 0.05  # EWMA of admitted request time
+
+    def _retry_after(self, limit):
+        # Demand waiting to get in: requests in flight plus those turned away in the last second
+        now = time.monotonic()
+        if now - self._shed_window_start >= 1:
+            self._shed_window_start = now
+            self._shed_in_window = 0
+        backlog = self.in_flight + self._shed_in_window
+        return min(MAX_RETRY_AFTER, max(1, math.ceil(backlog * self._service_seconds / limit)))
+
+    def enter(self):
+        """Take a slot or raise Overloaded; returns the start time to pass to leave()."""
+        limit = settings.INGEST_MAX_IN_FLIGHT
+        with self._lock:
+            if self.in_flight >= limit:
+                self.shed += 1
+                self._shed_in_window += 1
+                raise Overloaded(self._retry_after(limit))
+            self.in_flight += 1
+            self.admitted += 1
+        return time.monotonic()
+
+    def leave(self, started):
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self.in_flight -= 1
+            self._service_seconds += 0.2 * (elapsed - self._service_seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_in_flight': settings.INGEST_MAX_IN_FLIGHT,
+                'in_flight': self.in_flight,
+                'admitted': self.admitted,
+                'shed': self.shed,
+                'service_ms_avg': round(self._service_seconds * 1000, 2),
+            }
+
+
+ingest_gate = InFlightGate()
+
+
+class IngestAdmissionMixin:
+    """Apply the in-flight cap to a view's POST requests."""
+
+    def dispatch(self, request, *args, **kwargs):
+        self._admitted_at = None
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            if self._admitted_at is not None:
+                ingest_gate.leave(self._admitted_at)
+
+    def initial(self, request, *args, **kwargs):
+        # Before authentication, so shedding costs no queries
+        if request.method == 'POST':
+            self._admitted_at = ingest_gate.enter()
+        super().initial(request, *args, **kwargs)
+
+
+class ScannerTokenBucketThrottle(BaseThrottle):
+    """Token bucket per authenticated scanner, stored in the default cache."""
+
+    def get_cache_key(self, request):
+        return f'ingest-bucket:{request.user.pk}'
+
+    def allow_request(self, request, view):
+        if not request.user or not request.user.is_authenticated:
+            return True
+        rate = settings.INGEST_SCANNER_RATE
+        burst = settings.INGEST_SCANNER_BURST
+        key = self.get_cache_key(request)
+        now = time.time()
+
+        tokens, updated = cache.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        if tokens < 1:
+            self._wait = (1 - tokens) / rate
+            cache.set(key, (tokens, now), timeout=math.ceil(burst / rate) + 1)
+            return False
+        cache.set(key, (tokens - 1, now), timeout=math.ceil(burst / rate) + 1)
+        return True
+
+    def wait(self):
+        return self._wait
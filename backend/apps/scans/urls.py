@@ -5,5 +5,8 @@ app_name = 'scans'
 
 urlpatterns = [
     path('', views.ScanLogListCreateView.as_view(), name='scanlog-list-create'),
+    path('students/', views.StudentScanLookupView.as_view(), name='student-scans'),
+    path('events/<str:event_id>/dedup-snapshot/', views.DedupSnapshotView.as_view(), name='dedup-snapshot'),
+    path('events/<str:event_id>/dedup-delta/', views.DedupDeltaView.as_view(), name='dedup-delta'),
     path('<str:pk>/', views.ScanLogDetailView.as_view(), name='scanlog-detail'),
 ]
@@ -1,34 +1,308 @@
+import base64
+
 from rest_framework import generics, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from .models import ScanLog
-from .serializers import ScanLogSerializer, ScanLogCreateSerializer
+from django.db import IntegrityError, transaction
+from django.db.models import Count, Max, Q, Sum
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+from core.conditional import ConditionalGetMixin, queryset_stamp
+from core.db_router import ReplicaReadMixin
+from apps.events.models import Event
+from apps.users.models import User
+from . import idempotency
+from .dedup import ENCODING, encode_student_ids
+from .models import ScanLog, Student, normalize_student_id
+from .serializers import ScanLogSerializer, ScanLogCreateSerializer, render_scan_logs, scan_log_values
+from .throttling import IngestAdmissionMixin, ScannerTokenBucketThrottle
 
 
-class ScanLogListCreateView(generics.ListCreateAPIView):
+class ScanLogListCreateView(IngestAdmissionMixin, ReplicaReadMixin, ConditionalGetMixin, generics.ListCreateAPIView):
     queryset = ScanLog.objects.select_related('event', 'scanner').order_by('-timestamp')
     permission_classes = [IsAuthenticated]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['event_id', 'scanner_id', 'status']
+    MAX_SINCE_ROWS = 1000
     
     def get_serializer_class(self):
         if self.request.method == 'POST':
             return ScanLogCreateSerializer
         return ScanLogSerializer
     
+    def get_throttles(self):
+        if self.request.method != 'POST':
+            return super().get_throttles()
+        # A retry of a stored scan is answered from its key and spends no tokens
+        if self.find_replay() is not None:
+            return []
+        return [ScannerTokenBucketThrottle()]
+    
+    def find_replay(self):
+        """The scan already stored under this request's Idempotency-Key, or None; looked up once."""
+        if not hasattr(self, '_replay'):
+            key = self.request.headers.get(idempotency.HEADER)
+            self._replay = None
+            if key and len(key) <= idempotency.MAX_KEY_LENGTH:
+                self._replay = idempotency.find_replay(idempotency.key_hash(self.request.user.pk, key))
+        return self._replay
+    
+    def get_version_stamp(self):
+        # Every scan write bumps its event's scan_seq, so summing the sequences
+        # of the events in scope versions the list without touching scan_logs.
+        events = Event.objects.all()
+        event_id = self.request.query_params.get('event_id')
+        if event_id:
+            events = events.filter(pk=event_id)
+        aggregate = events.order_by().aggregate(seq=Sum('scan_seq'), latest=Max('updated_at'), count=Count('pk'))
+        latest = aggregate['latest'].isoformat() if aggregate['latest'] else '-'
+        return f"{aggregate['count']}:{aggregate['seq']}:{latest}#{queryset_stamp(User.objects.all())}"
+    
+    def list(self, request, *args, **kwargs):
+        if 'since' in request.query_params:
+            return self.list_since(request)
+        
+        # Rendered from column tuples; the output matches ScanLogSerializer
+        rows = scan_log_values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(render_scan_logs(page))
+        return Response(render_scan_logs(rows))
+    
+    def list_since(self, request):
+        """
+        Incremental feed: scans of one event with ``seq`` greater than ``since``, oldest first.
+
+        Returns the rows together with ``high_water_mark``, the cursor to pass as
+        ``since`` on the next poll.
+        """
+        event_id = request.query_params.get('event_id')
+        if not event_id:
+            raise ValidationError({'event_id': 'Required when using since.'})
+        try:
+            since = int(request.query_params['since'])
+        except ValueError:
+            raise ValidationError({'since': 'Must be an integer sequence number.'})
+        limit = self.paginator.get_page_size(request) if self.paginator else self.MAX_SINCE_ROWS
+        limit = min(limit or self.MAX_SINCE_ROWS, self.MAX_SINCE_ROWS)
+        
+        with transaction.atomic(using=ScanLog.objects.db):
+            latest = ScanLog.objects.filter(event_id=event_id).aggregate(latest=Max('seq'))['latest'] or 0
+            rows = list(scan_log_values(
+                self.filter_queryset(self.get_queryset())
+                .filter(seq__gt=since, seq__lte=latest)
+                .order_by('seq'),
+                'seq',
+            )[:limit + 1])
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        # Without more pages the cursor can jump to the newest seq, even past rows excluded by filters
+        high_water_mark = rows[-1][-1] if has_more else max(latest, since)
+        
+        return Response({
+            'results': render_scan_logs(rows),
+            'high_water_mark': high_water_mark,
+            'has_more': has_more,
+        })
+    
     def create(self, request, *args, **kwargs):
+        key = request.headers.get(idempotency.HEADER)
+        if key is None:
+            serializer = self.get_serializer(data=request.data)
+            serializer.is_valid(raise_exception=True)
+            return self._created(serializer.save())
+        
+        if not key or len(key) > idempotency.MAX_KEY_LENGTH:
+            raise ValidationError({'idempotency_key': f'Must be 1-{idempotency.MAX_KEY_LENGTH} characters.'})
+        hashed = idempotency.key_hash(request.user.pk, key)
+        replay = self.find_replay()
+        if replay is not None:
+            return self._created(replay, replayed=True)
+        
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        scan_log = serializer.save()
-        
+        try:
+            with transaction.atomic():
+                scan_log = serializer.save()
+                idempotency.remember(hashed, scan_log)
+        except IntegrityError:
+            # A concurrent retry with the same key committed first; our insert was rolled back
+            replay = idempotency.find_replay(hashed)
+            if replay is None:
+                raise
+            return self._created(replay, replayed=True)
+        return self._created(scan_log)
+    
+    def _created(self, scan_log, replayed=False):
         # Return the scan log with full details
-        response_serializer = ScanLogSerializer(scan_log)
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        response = Response(ScanLogSerializer(scan_log).data, status=status.HTTP_201_CREATED)
+        if replayed:
+            response['Idempotent-Replayed'] = 'true'
+        return response
 
 
 class ScanLogDetailView(generics.RetrieveAPIView):
     queryset = ScanLog.objects.select_related('event', 'scanner')
     serializer_class = ScanLogSerializer
     permission_classes = [IsAuthenticated]
+
+
+class StudentScanLookupView(ReplicaReadMixin, generics.GenericAPIView):
+    """
+    Where and when a student was scanned, across all events, newest first.
+
+    ``student_id`` is matched exactly (after normalization) or, with
+    ``match=prefix``, as a prefix of up to MAX_PREFIX_STUDENTS student IDs.
+    The lookup goes through the students table and scan_logs_student_time_idx,
+    so cost depends on the student's scans rather than the size of scan_logs.
+    Pages are keyset-paginated: pass ``next_cursor`` back as ``cursor``.
+    """
+    permission_classes = [IsAuthenticated]
+    MIN_PREFIX_LENGTH = 3
+    MAX_PREFIX_STUDENTS = 50
+    DEFAULT_LIMIT = 50
+    MAX_LIMIT = 200
+
+    def get(self, request, *args, **kwargs):
+        student_id = normalize_student_id(request.query_params.get('student_id', ''))
+        if not student_id:
+            raise ValidationError({'student_id': 'This parameter is required.'})
+        match = request.query_params.get('match', 'exact')
+        if match not in ('exact', 'prefix'):
+            raise ValidationError({'match': 'Must be "exact" or "prefix".'})
+        limit = self.get_limit(request)
+        
+        students = Student.objects.order_by('student_id')
+        if match == 'prefix':
+            if len(student_id) < self.MIN_PREFIX_LENGTH:
+                raise ValidationError({'student_id': f'Prefix must be at least {self.MIN_PREFIX_LENGTH} characters.'})
+            students = students.filter(student_id__startswith=student_id)
+        else:
+            students = students.filter(student_id=student_id)
+        matched = list(students.values_list('id', 'student_id')[:self.MAX_PREFIX_STUDENTS + 1])
+        if len(matched) > self.MAX_PREFIX_STUDENTS:
+            raise ValidationError({
+                'student_id': f'Prefix matches more than {self.MAX_PREFIX_STUDENTS} students; type more characters.'
+            })
+        
+        scans = ScanLog.objects.filter(student_key_id__in=[key for key, _ in matched]).order_by('-timestamp', '-id')
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            timestamp, pk = self.decode_cursor(cursor)
+            scans = scans.filter(Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk))
+        rows = list(scan_log_values(scans)[:limit + 1]) if matched else []
+        
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        return Response({
+            'students': [normalized for _, normalized in matched],
+            'results': render_scan_logs(rows),
+            'next_cursor': self.encode_cursor(rows[-1]) if has_more else None,
+            'has_more': has_more,
+        })
+    
+    def get_limit(self, request):
+        try:
+            limit = int(request.query_params.get('limit', self.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': 'Must be an integer.'})
+        return max(1, min(limit, self.MAX_LIMIT))
+    
+    @staticmethod
+    def encode_cursor(row):
+        # Position of the last row returned: (timestamp, id) from SCAN_LOG_VALUES
+        return base64.urlsafe_b64encode(f'{row[5].isoformat()}~{row[0]}'.encode()).decode('ascii')
+    
+    @staticmethod
+    def decode_cursor(cursor):
+        try:
+            timestamp, _, pk = base64.urlsafe_b64decode(cursor.encode()).decode().partition('~')
+            timestamp = parse_datetime(timestamp)
+        except ValueError:
+            timestamp = None
+        if timestamp is None or not pk:
+            raise ValidationError({'cursor': 'Invalid cursor.'})
+        return timestamp, pk
+
+
+class DedupSnapshotView(ConditionalGetMixin, generics.RetrieveAPIView):
+    """
+    Compact, versioned snapshot of the student IDs already scanned at an event.
+
+    Scanner devices load this once, then follow DedupDeltaView from ``version``
+    to detect duplicates while offline. See apps.scans.dedup for the format.
+    IDs are normalized (normalize_student_id) and ERROR scans are left out,
+    matching the duplicate check at ingest.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_version_stamp(self):
+        scan_seq = Event.objects.filter(pk=self.kwargs['event_id']).values_list('scan_seq', flat=True).first()
+        if scan_seq is None:
+            return None
+        return f"dedup:{self.kwargs['event_id']}:{scan_seq}"
+
+    def retrieve(self, request, *args, **kwargs):
+        event = get_object_or_404(Event.objects.only('id', 'duplicate_policy'), pk=kwargs['event_id'])
+
+        # One consistent read: the version is the highest seq included in the snapshot
+        with transaction.atomic(using=ScanLog.objects.db):
+            scans = ScanLog.objects.filter(event_id=event.id)
+            version = scans.aggregate(version=Max('seq'))['version'] or 0
+            student_ids = list(
+                scans.filter(seq__lte=version, student_key__isnull=False).exclude(status='ERROR')
+                .order_by().values_list('student_key__student_id', flat=True).distinct()
+            )
+
+        return Response({
+            'event_id': event.id,
+            'version': version,
+            'duplicate_policy': event.duplicate_policy,
+            'count': len(student_ids),
+            'encoding': ENCODING,
+            'data': encode_student_ids(student_ids),
+        })
+
+
+class DedupDeltaView(generics.RetrieveAPIView):
+    """
+    Student IDs scanned at an event after the ``since`` cursor.
+
+    Returns at most ``MAX_ROWS`` scans per call; when ``has_more`` is true the
+    client calls again with ``since`` set to the returned ``version``. IDs are
+    normalized and ERROR scans skipped, as in DedupSnapshotView.
+    """
+    permission_classes = [IsAuthenticated]
+    MAX_ROWS = 5000
+
+    def retrieve(self, request, *args, **kwargs):
+        event_id = kwargs['event_id']
+        try:
+            since = int(request.query_params.get('since', 0))
+        except ValueError:
+            raise ValidationError({'since': 'Must be an integer sequence number.'})
+
+        if not Event.objects.filter(pk=event_id).exists():
+            return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+
+        rows = list(
+            ScanLog.objects
+            .filter(event_id=event_id, seq__gt=since, student_key__isnull=False)
+            .exclude(status='ERROR')
+            .order_by('seq')
+            .values_list('seq', 'student_key__student_id')[:self.MAX_ROWS + 1]
+        )
+        has_more = len(rows) > self.MAX_ROWS
+        rows = rows[:self.MAX_ROWS]
+
+        return Response({
+            'event_id': event_id,
+            'since': since,
+            'version': rows[-1][0] if rows else since,
+            'student_ids': list(dict.fromkeys(student_id for _, student_id in rows)),
+            'has_more': has_more,
+        })
@@ -1,10 +1,11 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
+from core.admin import MarkDeletedAdminMixin
 from .models import User
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(MarkDeletedAdminMixin, BaseUserAdmin):
     list_display = ('pin', 'name', 'email', 'role', 'enabled', 'is_first_login', 'created_at')
     list_filter = ('role', 'enabled', 'is_first_login', 'created_at')
     search_fields = ('name', 'email', 'pin')
@@ -26,3 +27,6 @@ class UserAdmin(BaseUserAdmin):
     )
     
     readonly_fields = ('created_at', 'updated_at')
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).filter(deleted_at__isnull=True)
@@ -0,0 +1,45 @@
+"""
+Bulk user import, shared by the bulk-import endpoint and its background job.
+"""
+from django.db import IntegrityError, transaction
+from rest_framework import status
+
+from .serializers import UserBulkImportSerializer
+
+
+def import_users(rows):
+    """
+    Validate and insert import rows.
+
+    Returns (payload, HTTP status): every row reported as ``created`` or
+    ``error``, or the validation errors of the request as a whole.
+    """
+    serializer = UserBulkImportSerializer(data={'users': rows})
+    if not serializer.is_valid():
+        return serializer.errors, status.HTTP_400_BAD_REQUEST
+
+    try:
+        with transaction.atomic():
+            created = serializer.save()
+    except IntegrityError:
+        # Another request created a conflicting PIN/email after our checks ran
+        return (
+            {'error': 'Conflicting users were created concurrently. Please retry the import.'},
+            status.HTTP_409_CONFLICT
+        )
+
+    results = [
+        {'row': index + 1, 'status': 'error', 'errors': errors}
+        for index, errors in serializer.row_errors.items()
+    ]
+    for index, user in created:
+        result = {'row': index + 1, 'status': 'created', 'id': user.id, 'pin': user.pin}
+        if user.temp_password:
+            result['temp_password'] = user.temp_password
+        results.append(result)
+    results.sort(key=lambda result: result['row'])
+
+    return (
+        {'created': len(created), 'failed': len(serializer.row_errors), 'results': results},
+        status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST
+    )
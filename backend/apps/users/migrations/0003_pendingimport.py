@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-19 06:04
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def drop_job_import_rows(apps, schema_editor):
+    """Import rows now live in PendingImport; jobs queued with rows in their args cannot run."""
+    Job = apps.get_model('jobs', 'Job')
+    for job in Job.objects.filter(kind='users.bulk_import', args__has_key='rows').iterator():
+        job.args = {}
+        if job.status in ('QUEUED', 'RUNNING'):
+            job.status = 'FAILED'
+            job.error = 'Queued before an upgrade; please run the import again.'
+            job.finished_at = django.utils.timezone.now()
+        job.save(update_fields=['args', 'status', 'error', 'finished_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_hash_import_passwords'),
+        ('users', '0002_user_deleted_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingImport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('rows', models.JSONField()),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('job', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='pending_import', to='jobs.job')),
+            ],
+            options={
+                'verbose_name': 'Pending import',
+                'verbose_name_plural': 'Pending imports',
+                'db_table': 'pending_user_imports',
+            },
+        ),
+        migrations.RunPython(drop_job_import_rows, migrations.RunPython.noop),
+    ]
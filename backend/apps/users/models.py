@@ -1,5 +1,5 @@
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 import uuid
 
@@ -58,6 +58,8 @@ class User(AbstractBaseUser, PermissionsMixin):
     temp_password = models.CharField(max_length=255, null=True, blank=True)
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # Set by mark_deleted(); the row and its scans are removed later by purge_deleted
+    deleted_at = models.DateTimeField(null=True, blank=True, db_index=True, editable=False)
     
     # Django required fields
     is_staff = models.BooleanField(default=False)
@@ -76,6 +78,23 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return f"{self.name} ({self.pin})"
 
+    def mark_deleted(self):
+        """
+        Lock the user out and drop their event assignments at once, and queue a
+        job that deletes the row and its scans in small batches
+        (apps.scans.purge). Returns the job.
+        """
+        from apps.events.models import EventUser
+        from apps.jobs.registry import enqueue
+        with transaction.atomic():
+            self.deleted_at = timezone.now()
+            self.enabled = False
+            self.is_active = False
+            self.save(update_fields=['deleted_at', 'enabled', 'is_active', 'updated_at'])
+            for assignment in EventUser.objects.filter(user=self):
+                assignment.delete()
+            return enqueue('scans.purge', key=f'user:{self.pk}', model='user', pk=self.pk)
+
     @property
     def is_admin(self):
         return self.role == 'ADMIN'
@@ -83,3 +102,24 @@ class User(AbstractBaseUser, PermissionsMixin):
     @property
     def is_scanner(self):
         return self.role == 'USER'
+
+
+class PendingImport(models.Model):
+    """
+    Rows of a queued background bulk import.
+
+    Kept out of Job.args because they hold plaintext passwords: the
+    users.bulk_import task hashes them while importing and deletes this row
+    when it finishes.
+    """
+    job = models.OneToOneField('jobs.Job', on_delete=models.CASCADE, related_name='pending_import')
+    rows = models.JSONField()
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'pending_user_imports'
+        verbose_name = 'Pending import'
+        verbose_name_plural = 'Pending imports'
+
+    def __str__(self):
+        return f"Import for job #{self.job_id} ({len(self.rows)} rows)"
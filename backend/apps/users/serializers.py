@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from django.conf import settings
 from django.contrib.auth import get_user_model, authenticate
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.password_validation import validate_password
+from concurrent.futures import ThreadPoolExecutor
 import bcrypt
 import secrets
 import string
@@ -8,6 +11,10 @@ import string
 User = get_user_model()
 
 
+def generate_temp_password():
+    return ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(12))
+
+
 class UserSerializer(serializers.ModelSerializer):
     class Meta:
         model = User
@@ -40,7 +47,7 @@ class UserCreateSerializer(serializers.ModelSerializer):
         
         # Generate temporary password for admin users if no password provided
         if role == 'ADMIN' and not password:
-            temp_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(12))
+            temp_password = generate_temp_password()
             validated_data['temp_password'] = temp_password
             validated_data['is_first_login'] = True
         
@@ -53,6 +60,95 @@ class UserCreateSerializer(serializers.ModelSerializer):
         return user
 
 
+class UserImportRowSerializer(serializers.Serializer):
+    """Validates a single bulk import row without touching the database."""
+    name = serializers.CharField(max_length=255)
+    pin = serializers.CharField(max_length=10)
+    email = serializers.EmailField(required=False, allow_blank=True, allow_null=True)
+    role = serializers.ChoiceField(choices=User.ROLE_CHOICES, default='USER')
+    password = serializers.CharField(required=False, allow_blank=True)
+    enabled = serializers.BooleanField(default=True)
+
+
+def hash_passwords(passwords):
+    """make_password for each password, in threads (hashlib releases the GIL so they scale)."""
+    with ThreadPoolExecutor(max_workers=settings.USER_IMPORT_HASH_WORKERS) as pool:
+        return list(pool.map(make_password, passwords))
+
+
+class UserBulkImportSerializer(serializers.Serializer):
+    """
+    Validate and insert many users at once.
+
+    Rows are validated individually, then all PINs and all emails are checked
+    for conflicts with one query each. Invalid rows are reported in
+    ``row_errors`` (keyed by row index) and do not block the valid ones.
+    """
+    MAX_ROWS = 10000
+
+    users = serializers.ListField(child=serializers.DictField(), allow_empty=False, max_length=MAX_ROWS)
+
+    def validate_users(self, rows):
+        self.row_errors = {}
+        candidates = []
+        for index, row in enumerate(rows):
+            row_serializer = UserImportRowSerializer(data=row)
+            if row_serializer.is_valid():
+                data = dict(row_serializer.validated_data)
+                data['email'] = User.objects.normalize_email(data['email']) if data.get('email') else None
+                candidates.append((index, data))
+            else:
+                self.row_errors[index] = row_serializer.errors
+
+        pins = {data['pin'] for _, data in candidates}
+        emails = {data['email'] for _, data in candidates if data['email']}
+        taken_pins = set(User.objects.filter(pin__in=pins).values_list('pin', flat=True)) if pins else set()
+        # Compare emails case-insensitively, as MySQL's default collation does
+        taken_emails = {
+            email.lower() for email in User.objects.filter(email__in=emails).values_list('email', flat=True)
+        } if emails else set()
+
+        accepted = []
+        for index, data in candidates:
+            errors = {}
+            if data['pin'] in taken_pins:
+                errors['pin'] = ["A user with this PIN already exists."]
+            if data['email'] and data['email'].lower() in taken_emails:
+                errors['email'] = ["A user with this email already exists."]
+            if errors:
+                self.row_errors[index] = errors
+                continue
+            # Later rows reusing a PIN or email from this batch conflict with the first one
+            taken_pins.add(data['pin'])
+            if data['email']:
+                taken_emails.add(data['email'].lower())
+            accepted.append((index, data))
+        return accepted
+
+    def create(self, validated_data):
+        """Insert accepted rows with bulk_create. Returns a list of (row index, user)."""
+        accepted = validated_data['users']
+        users = []
+        passwords = []
+        for _, data in accepted:
+            password = data.pop('password', None)
+            if data['role'] == 'ADMIN' and not password:
+                data['temp_password'] = generate_temp_password()
+                data['is_first_login'] = True
+            users.append(User(**data))
+            passwords.append(password)
+
+        # Password hashing dominates large imports
+        to_hash = [(user, password) for user, password in zip(users, passwords) if password]
+        if to_hash:
+            encoded = hash_passwords([password for _, password in to_hash])
+            for (user, _), password in zip(to_hash, encoded):
+                user.password = password
+
+        User.objects.bulk_create(users, batch_size=500)
+        return [(index, user) for (index, _), user in zip(accepted, users)]
+
+
 class LoginSerializer(serializers.Serializer):
     pin = serializers.CharField(required=False)
     email = serializers.EmailField(required=False)
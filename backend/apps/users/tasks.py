@@ -0,0 +1,24 @@
+from apps.jobs.registry import task
+from .imports import import_users
+from .models import PendingImport
+
+
+@task('users.bulk_import')
+def bulk_import(job):
+    """
+    Import the job's PendingImport rows, hashing their passwords here rather
+    than in the request. The rows are deleted once the job finishes, and
+    generated temp passwords are kept out of the stored result.
+    """
+    # Also drop rows left behind by imports whose worker died
+    PendingImport.objects.filter(job__status__in=['SUCCEEDED', 'FAILED']).delete()
+    try:
+        rows = PendingImport.objects.get(job=job).rows
+        job.report_progress(0, len(rows), 'Importing')
+        payload, status_code = import_users(rows)
+    finally:
+        PendingImport.objects.filter(job=job).delete()
+    for result in payload.get('results', []):
+        if result.pop('temp_password', None):
+            result['temp_password_generated'] = True
+    return {'status_code': status_code, **payload}
@@ -0,0 +1,53 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.jobs.models import Job
+from apps.jobs.worker import work
+from .models import PendingImport, User
+from .serializers import UserBulkImportSerializer
+
+
+class BackgroundImportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_rows_are_kept_out_of_the_job_and_deleted_after_import(self):
+        rows = [
+            {'name': 'Scanner', 'pin': '1001', 'password': 'S3cret!pass'},
+            {'name': 'New Admin', 'pin': '1002', 'email': 'new@example.com', 'role': 'ADMIN'},
+        ]
+        response = self.client.post('/api/users/bulk-import/?background=true', rows, format='json')
+        self.assertEqual(response.status_code, 202)
+
+        job = Job.objects.get(pk=response.data['job_id'])
+        self.assertEqual(job.args, {})
+        self.assertEqual(job.pending_import.rows, rows)
+        detail = self.client.get(f'/api/jobs/{job.pk}/')
+        self.assertNotIn('S3cret!pass', str(detail.data))
+
+        work(burst=True)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUCCEEDED')
+        self.assertEqual(job.result['created'], 2)
+        self.assertFalse(PendingImport.objects.exists())
+        self.assertTrue(User.objects.get(pin='1001').check_password('S3cret!pass'))
+        admin_row = job.result['results'][1]
+        self.assertNotIn('temp_password', admin_row)
+        self.assertTrue(admin_row['temp_password_generated'])
+
+    def test_row_limit_is_checked_before_queueing(self):
+        rows = [{'name': 'Scanner', 'pin': str(index)} for index in range(UserBulkImportSerializer.MAX_ROWS + 1)]
+        response = self.client.post('/api/users/bulk-import/?background=true', rows, format='json')
+        self.assertEqual(response.status_code, 400)
+        response = self.client.post('/api/users/bulk-import/?background=true', [], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_synchronous_import_still_hashes(self):
+        response = self.client.post(
+            '/api/users/bulk-import/', [{'name': 'Scanner', 'pin': '1003', 'password': 'another-pass'}], format='json'
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(User.objects.get(pin='1003').check_password('another-pass'))
@@ -11,5 +11,6 @@ urlpatterns = [
     
     # User management endpoints
     path('', views.UserListCreateView.as_view(), name='user-list-create'),
+    path('bulk-import/', views.bulk_import_view, name='user-bulk-import'),
     path('<str:pk>/', views.UserDetailView.as_view(), name='user-detail'),
 ]
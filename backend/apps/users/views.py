@@ -4,15 +4,25 @@ from rest_framework.response import Response
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from django_filters.rest_framework import DjangoFilterBackend
-from .serializers import UserSerializer, UserCreateSerializer, LoginSerializer, ChangePasswordSerializer
+from rest_framework.exceptions import ValidationError
+from .imports import import_users
+from .models import PendingImport
+from .serializers import (
+    UserSerializer, UserCreateSerializer, UserBulkImportSerializer, LoginSerializer, ChangePasswordSerializer
+)
 from .permissions import IsAdminUser
+from core.db_router import ReplicaReadMixin
+from apps.jobs.registry import enqueue
+import csv
+import io
 
 User = get_user_model()
 
 
-class UserListCreateView(generics.ListCreateAPIView):
-    queryset = User.objects.all()
+class UserListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
+    queryset = User.objects.filter(deleted_at__isnull=True)
     permission_classes = [IsAuthenticated, IsAdminUser]
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['role', 'enabled']
@@ -24,9 +34,61 @@ class UserListCreateView(generics.ListCreateAPIView):
 
 
 class UserDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.filter(deleted_at__isnull=True)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]
+    
+    def destroy(self, request, *args, **kwargs):
+        # Scans are purged in batches by a background job; the cascade would lock scan_logs
+        job = self.get_object().mark_deleted()
+        return Response({'status': 'deleting', 'job_id': job.pk}, status=status.HTTP_202_ACCEPTED)
+
+
+def _read_import_rows(request):
+    """Return import rows from an uploaded CSV file or a JSON body (list or {"users": [...]})."""
+    upload = request.FILES.get('file')
+    if upload is not None:
+        reader = csv.DictReader(io.StringIO(upload.read().decode('utf-8-sig')))
+        rows = []
+        for row in reader:
+            # Empty CSV cells mean "not provided" so field defaults apply
+            rows.append({
+                key.strip(): value.strip()
+                for key, value in row.items()
+                if key and value is not None and value.strip() != ''
+            })
+        return rows
+    if isinstance(request.data, list):
+        return request.data
+    return request.data.get('users', [])
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def bulk_import_view(request):
+    """
+    Create many users from a JSON list or an uploaded CSV file (field "file").
+
+    Valid rows are inserted even when others fail; every row is reported.
+    With ``?background=true`` the import runs as a job and the response is
+    ``202`` with its ``job_id``; the job's result holds the usual report.
+    Queued rows are stored in PendingImport rather than the job's args, and
+    the job hashes their passwords.
+    """
+    rows = _read_import_rows(request)
+    if request.query_params.get('background') == 'true':
+        # Shape and row limit only; rows are validated by the job
+        try:
+            UserBulkImportSerializer().fields['users'].run_validation(rows)
+        except ValidationError as exc:
+            return Response({'users': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+        with transaction.atomic():
+            job = enqueue('users.bulk_import', created_by=request.user, max_attempts=1)
+            PendingImport.objects.create(job=job, rows=rows)
+        return Response({'job_id': job.pk}, status=status.HTTP_202_ACCEPTED)
+
+    payload, status_code = import_users(rows)
+    return Response(payload, status=status_code)
 
 
 @api_view(['POST'])
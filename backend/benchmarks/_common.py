@@ -0,0 +1,109 @@
+"""
+Shared setup and helpers for the benchmark scripts.
+
+Importing this module puts the backend on ``sys.path`` and sets up Django
+(DJANGO_SETTINGS_MODULE defaults to core.settings), so each script imports
+it before any Django or app code:
+
+    from _common import rolled_back, timed
+"""
+
+import os
+import random
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import django
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+django.setup()
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+from apps.scans.models import ScanLog, Student
+from apps.scans.students import intern_student
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """Run the block in a transaction that is always rolled back."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def timed(func, repeat=1):
+    """Mean wall time of ``func()`` over ``repeat`` calls, in milliseconds."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) * 1000 / repeat
+
+
+def get_ok(client, path, data=None, **extra):
+    response = client.get(path, data, **extra)
+    assert response.status_code == 200, response.content
+    return response
+
+
+def load_scans(events, scanner, rows, students, timestamp=None):
+    """
+    Bulk-load ``rows`` SUCCESS scans of ``students`` random students over
+    ``events``, with interned student keys. ``timestamp()``, if given, dates
+    each scan. Returns the student IDs.
+    """
+    student_ids = [f'2024{index:06d}' for index in range(students)]
+    keys = {student_id: intern_student(student_id) for student_id in student_ids}
+    batch = []
+    for seq in range(1, rows + 1):
+        student_id = random.choice(student_ids)
+        scan = ScanLog(
+            event=random.choice(events), scanner=scanner, student_id=student_id,
+            student_key_id=keys[student_id], status='SUCCESS', seq=seq,
+        )
+        if timestamp is not None:
+            scan.timestamp = timestamp()
+        batch.append(scan)
+        if len(batch) == 10000:
+            ScanLog.objects.bulk_create(batch)
+            batch = []
+            print(f'  loaded {seq} rows', end='\r')
+    if batch:
+        ScanLog.objects.bulk_create(batch)
+    print()
+    return student_ids
+
+
+def analyze(*tables):
+    """Refresh MySQL index statistics after a bulk load."""
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE TABLE {', '.join(tables)}")
+
+
+def last_student_key():
+    return Student.objects.aggregate(last=Max('id'))['last'] or 0
+
+
+def delete_scans(event_ids, students_after):
+    """
+    Delete the scans of ``event_ids`` in batches without loading them, then
+    the students interned after key ``students_after`` that have no scans left.
+    """
+    while True:
+        ids = list(ScanLog.objects.filter(event_id__in=event_ids).values_list('id', flat=True)[:10000])
+        if not ids:
+            break
+        ScanLog.objects.filter(id__in=ids)._raw_delete(ScanLog.objects.db)
+    Student.objects.filter(id__gt=students_after, scan_logs__isnull=True).delete()
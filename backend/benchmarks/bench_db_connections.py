@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request database latency with and without connection reuse.
+
+Simulates requests the way Django's request_started/request_finished signals
+drive the connection: each request runs one small query, then the connection
+is closed, kept (CONN_MAX_AGE) or returned to the pool (DB_POOL_SIZE).
+Modes:
+
+    per-request  CONN_MAX_AGE=0, a new connection for every request
+    persistent   CONN_MAX_AGE=60 with health checks, one connection per thread
+    pool         core.db.backends.mysql, threads share a capped pool (MySQL only)
+
+Usage (from the backend directory):
+    python benchmarks/bench_db_connections.py [--requests 500] [--threads 4] [--pool-size 2]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+
+import _common  # noqa: F401  (sets up Django)
+
+from django.db import connections
+from django.db.utils import load_backend
+
+from core.db.pool import pool_stats
+
+
+def mode_settings(mode, pool_size):
+    settings_dict = dict(connections['default'].settings_dict)
+    settings_dict.pop('POOL', None)
+    if settings_dict['ENGINE'] == 'core.db.backends.mysql':
+        settings_dict['ENGINE'] = 'django.db.backends.mysql'
+    settings_dict['CONN_HEALTH_CHECKS'] = True
+
+    if mode == 'per-request':
+        settings_dict['CONN_MAX_AGE'] = 0
+    elif mode == 'persistent':
+        settings_dict['CONN_MAX_AGE'] = 60
+    else:
+        settings_dict.update({
+            'ENGINE': 'core.db.backends.mysql',
+            'CONN_MAX_AGE': 0,
+            'POOL': {'MAX_SIZE': pool_size, 'MAX_AGE': 60, 'TIMEOUT': 30},
+        })
+    return settings_dict
+
+
+def worker(settings_dict, alias, count, latencies):
+    wrapper = load_backend(settings_dict['ENGINE']).DatabaseWrapper(settings_dict, alias)
+    try:
+        for _ in range(count):
+            started = time.perf_counter()
+            wrapper.close_if_unusable_or_obsolete()  # request_started
+            with wrapper.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.fetchone()
+            wrapper.close_if_unusable_or_obsolete()  # request_finished
+            latencies.append((time.perf_counter() - started) * 1000)
+    finally:
+        wrapper.close()
+
+
+def run_mode(mode, requests, threads, pool_size):
+    settings_dict = mode_settings(mode, pool_size)
+    alias = f'bench-{mode}'
+    latencies = []
+    per_thread = requests // threads
+    workers = [
+        threading.Thread(target=worker, args=(settings_dict, alias, per_thread, latencies))
+        for _ in range(threads)
+    ]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return latencies, elapsed, pool_stats().get(alias)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--pool-size', type=int, default=2)
+    args = parser.parse_args()
+
+    modes = ['per-request', 'persistent']
+    if connections['default'].vendor == 'mysql':
+        modes.append('pool')
+    else:
+        print('Pool mode needs MySQL; skipping it.')
+
+    print(f"{'mode':>12} | {'mean ms':>8} {'p50 ms':>8} {'p95 ms':>8} {'req/s':>8}")
+    for mode in modes:
+        latencies, elapsed, stats = run_mode(mode, args.requests, args.threads, args.pool_size)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95) - 1]
+        print(
+            f'{mode:>12} | {statistics.mean(latencies):>8.2f} {statistics.median(latencies):>8.2f} '
+            f'{p95:>8.2f} {len(latencies) / elapsed:>8.0f}'
+        )
+        if stats:
+            print(f"{'':>12}   pool: {stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Benchmark: editing event scanner assignments.
+
+Compares the old delete-and-recreate approach against
+EventUser.objects.sync_for_event() for events with 10 to 1000 assignments.
+Each edit removes 5% of the scanners, adds 5% new ones and relocates 10%.
+
+Runs against the configured database inside a transaction that is rolled back.
+
+Usage (from the backend directory):
+    python benchmarks/bench_event_assignments.py
+"""
+
+import time
+
+from _common import rolled_back
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.events.models import Event, EventUser
+from apps.users.models import User
+
+SIZES = [10, 50, 150, 500, 1000]
+
+
+def legacy_update(event, user_ids, user_locations):
+    """The previous EventSerializer.update behaviour."""
+    event.event_users.all().delete()
+    for user_id in user_ids:
+        EventUser.objects.create(event=event, user_id=user_id, location=user_locations.get(user_id, ''))
+
+
+def edit_plan(user_ids, spare_ids):
+    """Return (new_user_ids, new_locations) for a typical edit of an assignment list."""
+    count = len(user_ids)
+    churn = max(1, count // 20)
+    kept = user_ids[churn:]
+    added = spare_ids[:churn]
+    new_ids = kept + added
+    locations = {user_id: 'Main door' for user_id in new_ids}
+    for user_id in kept[:max(1, count // 10)]:
+        locations[user_id] = 'Side door'
+    return new_ids, locations
+
+
+def measure(func, *args):
+    with CaptureQueriesContext(connection) as queries:
+        started = time.perf_counter()
+        func(*args)
+        elapsed = time.perf_counter() - started
+    return elapsed * 1000, len(queries)
+
+
+def run_size(size, users):
+    user_ids = [user.id for user in users[:size]]
+    spare_ids = [user.id for user in users[size:]]
+    new_ids, new_locations = edit_plan(user_ids, spare_ids)
+    initial_locations = {user_id: 'Main door' for user_id in user_ids}
+
+    results = {}
+    for label, func in (('legacy', legacy_update), ('sync', EventUser.objects.sync_for_event)):
+        event = Event.objects.create(name=f'bench-assignments-{size}-{label}')
+        EventUser.objects.sync_for_event(event, user_ids, initial_locations)
+        results[label] = measure(func, event, new_ids, new_locations)
+    return results
+
+
+def main():
+    print(f"{'assignments':>11} | {'legacy ms':>10} {'queries':>8} | {'sync ms':>10} {'queries':>8}")
+    with rolled_back():
+        needed = max(SIZES) + max(SIZES) // 20
+        users = User.objects.bulk_create([
+            User(pin=f'b{index:07d}', name=f'Bench Scanner {index}', role='USER')
+            for index in range(needed)
+        ])
+        for size in SIZES:
+            results = run_size(size, users)
+            legacy_ms, legacy_queries = results['legacy']
+            sync_ms, sync_queries = results['sync']
+            print(f'{size:>11} | {legacy_ms:>10.1f} {legacy_queries:>8} | {sync_ms:>10.1f} {sync_queries:>8}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Overload test: scan ingest latency with and without admission control.
+
+Many client threads post scans as fast as they can (far more concurrency than
+the database can serve). Without admission control every request queues and
+latency grows with the load; with it, extra requests get an immediate 503 and
+the admitted ones keep a bounded p99. Rejected clients back off for
+min(Retry-After, --backoff) seconds before trying again.
+
+Creates a temporary event and scanners, deleted afterwards.
+
+Usage (from the backend directory):
+    python benchmarks/bench_ingest_overload.py [--clients 32] [--seconds 10] [--max-in-flight 4]
+"""
+
+import argparse
+import statistics
+import threading
+import time
+from collections import Counter
+
+import _common  # noqa: F401  (sets up Django)
+
+from django.conf import settings
+from django.db import connection
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+from apps.events.models import Event
+from apps.scans.throttling import ingest_gate
+from apps.users.models import User
+
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def client_loop(scanner, event, deadline, backoff, label, results):
+    client = APIClient()
+    client.force_authenticate(scanner)
+    # Count server errors (e.g. lock timeouts) as results instead of stopping the client
+    client.raise_request_exception = False
+    number = 0
+    try:
+        while time.monotonic() < deadline:
+            number += 1
+            started = time.perf_counter()
+            response = client.post('/api/scan-logs/', {
+                'event_id': event.id,
+                'scanner_id': scanner.id,
+                'student_id': f'{label}-{scanner.pin}-{number}',
+            }, format='json')
+            elapsed = (time.perf_counter() - started) * 1000
+            results.append((response.status_code, elapsed))
+            if response.status_code in (429, 503):
+                time.sleep(min(int(response['Retry-After']), backoff))
+    finally:
+        connection.close()
+
+
+def run(label, event, scanners, seconds, backoff):
+    results = []
+    deadline = time.monotonic() + seconds
+    threads = [
+        threading.Thread(target=client_loop, args=(scanner, event, deadline, backoff, label, results))
+        for scanner in scanners
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    counts = Counter(code for code, _ in results)
+    admitted = [elapsed for code, elapsed in results if code == 201]
+    rejected = [elapsed for code, elapsed in results if code in (429, 503)]
+    print(
+        f'{label:>12} | {len(admitted) / seconds:>8.1f} {percentile(admitted, 0.5):>8.1f} '
+        f'{percentile(admitted, 0.99):>8.1f} | {counts[503]:>6} {counts[429]:>6} '
+        f'{statistics.mean(rejected) if rejected else float("nan"):>10.2f} | {dict(counts)}'
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--seconds', type=float, default=10)
+    parser.add_argument('--max-in-flight', type=int, default=4)
+    parser.add_argument('--backoff', type=float, default=0.05, help='Cap on the client back-off, in seconds.')
+    args = parser.parse_args()
+
+    event = Event.objects.create(name='bench-ingest-overload', is_permanent=True)
+    scanners = [
+        User.objects.create(pin=f'ovl{index:05d}', name=f'Overload Scanner {index}', role='USER')
+        for index in range(args.clients)
+    ]
+    print(f"{'mode':>12} | {'ok/s':>8} {'p50 ms':>8} {'p99 ms':>8} | {'503':>6} {'429':>6} {'reject ms':>10} |")
+    try:
+        # Token buckets are opened wide so the comparison isolates the in-flight cap
+        unlimited = {'INGEST_SCANNER_RATE': 1e6, 'INGEST_SCANNER_BURST': 10 ** 6}
+        with override_settings(INGEST_MAX_IN_FLIGHT=10 ** 6, **unlimited):
+            run('no control', event, scanners, args.seconds, args.backoff)
+        with override_settings(INGEST_MAX_IN_FLIGHT=args.max_in_flight, **unlimited):
+            run('admission', event, scanners, args.seconds, args.backoff)
+        with override_settings(INGEST_MAX_IN_FLIGHT=args.max_in_flight):
+            run(f'+buckets {settings.INGEST_SCANNER_RATE:g}/s', event, scanners, args.seconds, args.backoff)
+        print(f'gate: {ingest_gate.stats()}')
+    finally:
+        event.delete()
+        User.objects.filter(pk__in=[scanner.pk for scanner in scanners]).delete()
+
+
+if __name__ == '__main__':
+    main()
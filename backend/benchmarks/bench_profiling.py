@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of ProfilingMiddleware on requests that are not profiled.
+
+Times the trigger check the middleware runs on every request, then
+GET /api/events/ through the test client without the middleware, with it
+installed but not triggered, and with every request flagged for profiling
+(best of --rounds interleaved rounds). Runs inside a transaction that is
+rolled back.
+
+Usage (from the backend directory):
+    python benchmarks/bench_profiling.py [--requests 200] [--rounds 5] [--events 20]
+"""
+
+import argparse
+import timeit
+
+from _common import get_ok, rolled_back, timed
+
+from django.conf import settings
+from django.test import Client, RequestFactory, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.events.models import Event
+from apps.monitoring import profiling
+from apps.users.models import User
+
+PROFILING_MIDDLEWARE = 'core.middleware.ProfilingMiddleware'
+
+
+def per_request(requests, middleware, **headers):
+    with override_settings(MIDDLEWARE=middleware, PROFILE_SAMPLE_RATE=0.0):
+        client = Client()
+        client.get('/api/events/', **headers)
+        return timed(lambda: get_ok(client, '/api/events/', **headers), repeat=requests)
+
+
+def trigger_check_us(number=100000):
+    request = RequestFactory().get('/api/events/', {'includeStats': 'true'})
+    request.GET  # parsed once per request by the view anyway
+    with override_settings(PROFILE_SAMPLE_RATE=0.0):
+        return timeit.timeit(lambda: profiling.trigger(request), number=number) * 1e6 / number
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--events', type=int, default=20)
+    options = parser.parse_args()
+
+    print(f'Trigger check on an unflagged request: {trigger_check_us():.2f} us\n')
+
+    without = [name for name in settings.MIDDLEWARE if name != PROFILING_MIDDLEWARE]
+    with_profiling = [*without, PROFILING_MIDDLEWARE]
+    with rolled_back():
+        admin = User.objects.create(pin='bench-profiling', name='Bench Admin', role='ADMIN')
+        Event.objects.bulk_create([Event(name=f'bench-profiling-{index}') for index in range(options.events)])
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(admin)}'}
+
+        baseline = idle = profiled = float('inf')
+        for _ in range(options.rounds):
+            baseline = min(baseline, per_request(options.requests, without, **auth))
+            idle = min(idle, per_request(options.requests, with_profiling, **auth))
+            profiled = min(profiled, per_request(max(options.requests // 10, 1), with_profiling, HTTP_X_PROFILE='1', **auth))
+        print(f'GET /api/events/, best of {options.rounds} rounds, mean per request (ms):')
+        print(f'  without middleware    : {baseline:8.3f}')
+        print(f'  installed, not flagged: {idle:8.3f}')
+        print(f'  flagged (profiled)    : {profiled:8.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of QueryInspectionMiddleware.
+
+Times GET /api/events/?includeStats=true (one stats query per event and
+field, the pattern the detector flags) with no request sampled and with every
+request sampled, best of --rounds interleaved rounds, and prints the findings
+recorded. Runs inside a transaction that is rolled back.
+
+Usage (from the backend directory):
+    python benchmarks/bench_query_inspection.py [--requests 50] [--rounds 5] [--events 20]
+"""
+
+import argparse
+
+from _common import get_ok, rolled_back, timed
+
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework_simplejwt.tokens import AccessToken
+
+from apps.events.models import Event
+from apps.monitoring.models import QueryFinding
+from apps.users.models import User
+
+URL = '/api/events/?includeStats=true'
+
+
+def per_request(client, requests, sample_rate, **headers):
+    with override_settings(QUERY_SAMPLE_RATE=sample_rate, PROFILE_SAMPLE_RATE=0.0):
+        return timed(lambda: get_ok(client, URL, **headers), repeat=requests)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--events', type=int, default=20)
+    options = parser.parse_args()
+
+    with rolled_back():
+        admin = User.objects.create(pin='bench-queries', name='Bench Admin', role='ADMIN')
+        Event.objects.bulk_create([Event(name=f'bench-queries-{index}') for index in range(options.events)])
+        auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(admin)}'}
+        client = Client()
+        with override_settings(QUERY_SAMPLE_RATE=0.0), CaptureQueriesContext(connection) as captured:
+            client.get(URL, **auth)
+
+        off = sampled = float('inf')
+        for _ in range(options.rounds):
+            off = min(off, per_request(client, options.requests, 0.0, **auth))
+            sampled = min(sampled, per_request(client, options.requests, 1.0, **auth))
+        print(f'GET {URL} ({len(captured)} queries), best of {options.rounds} rounds, mean per request (ms):')
+        print(f'  not sampled: {off:8.3f}')
+        print(f'  sampled    : {sampled:8.3f} ({(sampled - off) / len(captured) * 1000:+.1f} us per query)')
+
+        print('\nFindings:')
+        for finding in QueryFinding.objects.all():
+            print(f'  {finding.kind:<8} x{finding.max_per_request:<4} {finding.call_site}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark: recomputing scan statuses after a duplicate-policy change.
+
+Loads a synthetic event with --rows scans (default 1,000,000) over --students
+distinct students spread across --days days, then times reclassify_event()
+for ONCE_PER_DAY -> ONCE_PER_EVENT -> ALLOW_DUPLICATES. The analytics rebuild
+queued on scans_reclassified is run inline and timed separately.
+
+The synthetic event and its scans are deleted afterwards.
+
+Usage (from the backend directory):
+    python benchmarks/bench_reclassify.py [--rows 1000000] [--students 50000] [--days 3]
+"""
+
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from _common import analyze, delete_scans, last_student_key, load_scans
+
+from django.utils import timezone
+
+from apps.analytics.signals import rebuild_after_reclassification
+from apps.analytics.tasks import rebuild_event_analytics
+from apps.events.models import Event
+from apps.scans.reclassify import reclassify_event
+from apps.scans.signals import scans_reclassified
+from apps.users.models import User
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--students', type=int, default=50_000)
+    parser.add_argument('--days', type=int, default=3)
+    options = parser.parse_args()
+
+    students_after = last_student_key()
+    scanner = User.objects.create_user(pin='bench-reclassify', name='Bench Scanner')
+    event = Event.objects.create(name='bench-reclassify', is_permanent=True)
+
+    try:
+        print(f'Loading {options.rows} scans over {options.students} students...')
+        start = timezone.now() - timedelta(days=options.days)
+        load_scans(
+            [event], scanner, options.rows, options.students,
+            timestamp=lambda: start + timedelta(seconds=random.randrange(options.days * 86400)),
+        )
+        analyze('scan_logs')
+
+        scans_reclassified.disconnect(rebuild_after_reclassification)
+        print(f"\n{'policy':>16} | {'status ms':>9} | {'analytics ms':>12} | {'promoted':>8} | {'demoted':>8}")
+        for policy in ('ONCE_PER_DAY', 'ONCE_PER_EVENT', 'ALLOW_DUPLICATES'):
+            Event.objects.filter(pk=event.pk).update(duplicate_policy=policy)
+            started = time.perf_counter()
+            promoted, demoted = reclassify_event(event.id)
+            reclassified = time.perf_counter()
+            rebuild_event_analytics([event.id])
+            rebuilt = time.perf_counter()
+            print(f'{policy:>16} | {(reclassified - started) * 1000:>9.0f} | {(rebuilt - reclassified) * 1000:>12.0f} | '
+                  f'{promoted:>8} | {demoted:>8}')
+    finally:
+        scans_reclassified.connect(rebuild_after_reclassification)
+        print('\nCleaning up...')
+        delete_scans([event.id], students_after)
+        event.delete()
+        scanner.delete()
+
+if __name__ == '__main__':
+    main()
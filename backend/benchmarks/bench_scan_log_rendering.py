@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: rendering scan log pages through ScanLogSerializer versus the
+values()-based fast path (scan_log_values + render_scan_logs).
+
+Both paths include the query. The JSON produced by each is compared byte for
+byte. Runs inside a transaction that is rolled back.
+
+Usage (from the backend directory):
+    python benchmarks/bench_scan_log_rendering.py
+"""
+
+import time
+from datetime import timedelta
+
+from _common import rolled_back
+
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.events.models import Event
+from apps.scans.models import ScanLog
+from apps.scans.serializers import ScanLogSerializer, render_scan_logs, scan_log_values
+from apps.users.models import User
+
+SIZES = [100, 1000, 5000, 10000]
+REPEAT = 3
+
+
+def serializer_path(queryset, size):
+    return ScanLogSerializer(queryset.select_related('event', 'scanner')[:size], many=True).data
+
+
+def fast_path(queryset, size):
+    return render_scan_logs(scan_log_values(queryset)[:size])
+
+
+def best_of(func, *args):
+    best = None
+    for _ in range(REPEAT):
+        started = time.perf_counter()
+        data = func(*args)
+        elapsed = (time.perf_counter() - started) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, JSONRenderer().render(data)
+
+
+def main():
+    print(f"{'rows':>6} | {'serializer ms':>13} | {'fast ms':>8} | {'speedup':>7} | identical")
+    with rolled_back():
+        event = Event.objects.create(name='bench-rendering', is_permanent=True)
+        scanner = User.objects.create(pin='bench-render', name='Bench Scanner', role='USER')
+        now = timezone.now()
+        ScanLog.objects.bulk_create([
+            ScanLog(
+                event=event, scanner=scanner, student_id=f'S{index:08d}',
+                status='SUCCESS', timestamp=now - timedelta(seconds=index), seq=index + 1,
+            )
+            for index in range(max(SIZES))
+        ], batch_size=1000)
+        queryset = ScanLog.objects.filter(event=event).order_by('-timestamp')
+
+        for size in SIZES:
+            slow_ms, slow_json = best_of(serializer_path, queryset, size)
+            fast_ms, fast_json = best_of(fast_path, queryset, size)
+            print(f'{size:>6} | {slow_ms:>13.1f} | {fast_ms:>8.1f} | {slow_ms / fast_ms:>6.1f}x | {slow_json == fast_json}')
+
+
+if __name__ == '__main__':
+    main()
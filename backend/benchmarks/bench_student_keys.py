@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: string student IDs vs integer student keys on scan_logs.
+
+Loads a synthetic event with --rows scans (default 1,000,000) over --students
+distinct students, then reports:
+  * index sizes on scan_logs (MySQL only, from mysql.innodb_index_stats)
+  * unique-count time: COUNT(DISTINCT student_id) vs COUNT(DISTINCT student_key)
+  * dedup lookup time: (event, student_id) vs (event, student_key)
+
+The synthetic event and its scans are deleted afterwards.
+
+Usage (from the backend directory):
+    python benchmarks/bench_student_keys.py [--rows 1000000] [--students 50000]
+"""
+
+import argparse
+import random
+
+from _common import analyze, delete_scans, last_student_key, load_scans, timed
+
+from django.db import connection
+
+from apps.events.models import Event
+from apps.scans.models import ScanLog
+from apps.scans.students import intern_student
+from apps.users.models import User
+
+
+def index_sizes():
+    if connection.vendor != 'mysql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT table_name, index_name, stat_value * @@innodb_page_size "
+            "FROM mysql.innodb_index_stats "
+            "WHERE database_name = DATABASE() AND table_name IN ('scan_logs', 'students') AND stat_name = 'size'"
+        )
+        return cursor.fetchall()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--students', type=int, default=50_000)
+    options = parser.parse_args()
+
+    students_after = last_student_key()
+    scanner = User.objects.create_user(pin='bench-sk', name='Bench Scanner')
+    event = Event.objects.create(name='bench-student-keys')
+    try:
+        print(f'Loading {options.rows} scans over {options.students} students...')
+        student_ids = load_scans([event], scanner, options.rows, options.students)
+        analyze('scan_logs', 'students')
+
+        sizes = index_sizes()
+        if sizes:
+            print('\nIndex sizes:')
+            for table, index, size in sizes:
+                print(f'  {table:<10} {index:<40} {size / 1024 / 1024:8.1f} MB')
+        else:
+            print('\nIndex sizes: only reported on MySQL')
+
+        scans = ScanLog.objects.filter(event=event).order_by()
+        print('\nUnique count (ms):')
+        print(f"  DISTINCT student_id : {timed(lambda: scans.values('student_id').distinct().count()):8.1f}")
+        print(f"  DISTINCT student_key: {timed(lambda: scans.values('student_key').distinct().count()):8.1f}")
+
+        probes = random.sample(student_ids, min(1000, len(student_ids)))
+        keys = [intern_student(student_id) for student_id in probes]
+        print('\nDedup lookup, mean of 1000 (ms):')
+        print(f"  (event, student_id) : "
+              f"{timed(lambda: [scans.filter(student_id=s).exists() for s in probes]) / len(probes):8.3f}")
+        print(f"  (event, student_key): "
+              f"{timed(lambda: [scans.filter(student_key_id=k).exists() for k in keys]) / len(keys):8.3f}")
+    finally:
+        print('\nCleaning up...')
+        delete_scans([event.id], students_after)
+        event.delete()
+        scanner.delete()
+
+if __name__ == '__main__':
+    main()
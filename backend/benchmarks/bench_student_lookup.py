@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: finding one student's scans.
+
+Loads --rows scans (default 1,000,000) over --students distinct students and
+--events events, then compares, for random students:
+  * the old admin search: student_id icontains, newest first, first page
+  * GET /api/scan-logs/students/?student_id=... (exact match, first page)
+  * the same endpoint with match=prefix, dropping the last digit (10 students)
+
+The synthetic events and their scans are deleted afterwards.
+
+Usage (from the backend directory):
+    python benchmarks/bench_student_lookup.py [--rows 1000000] [--students 50000] [--events 20]
+"""
+
+import argparse
+import random
+
+from _common import analyze, delete_scans, get_ok, last_student_key, load_scans, timed
+
+from rest_framework.test import APIClient
+
+from apps.events.models import Event
+from apps.scans.models import ScanLog
+from apps.users.models import User
+
+PROBES = 50
+
+
+def per_probe(func, probes):
+    """Mean milliseconds of ``func(probe)`` over the probes."""
+    return timed(lambda: [func(probe) for probe in probes]) / len(probes)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--students', type=int, default=50_000)
+    parser.add_argument('--events', type=int, default=20)
+    options = parser.parse_args()
+
+    students_after = last_student_key()
+    scanner = User.objects.create_user(pin='bench-lookup', name='Bench Scanner')
+    events = [Event.objects.create(name=f'bench-lookup-{index}') for index in range(options.events)]
+    try:
+        print(f'Loading {options.rows} scans over {options.students} students...')
+        student_ids = load_scans(events, scanner, options.rows, options.students)
+        analyze('scan_logs', 'students')
+
+        client = APIClient()
+        client.force_authenticate(scanner)
+        probes = random.sample(student_ids, min(PROBES, len(student_ids)))
+
+        def admin_search(student_id):
+            list(ScanLog.objects.filter(student_id__icontains=student_id).order_by('-timestamp')[:100])
+
+        def lookup(student_id, **params):
+            get_ok(client, '/api/scan-logs/students/', {'student_id': student_id, **params})
+
+        print(f'\nFirst page for one student, mean of {len(probes)} (ms):')
+        print(f"  admin icontains search  : {per_probe(admin_search, probes):8.2f}")
+        print(f"  lookup, exact           : {per_probe(lookup, probes):8.2f}")
+        print(f"  lookup, prefix (10 IDs) : {per_probe(lambda s: lookup(s[:-1], match='prefix'), probes):8.2f}")
+    finally:
+        print('\nCleaning up...')
+        event_ids = [event.id for event in events]
+        delete_scans(event_ids, students_after)
+        Event.objects.filter(id__in=event_ids).delete()
+        scanner.delete()
+
+if __name__ == '__main__':
+    main()
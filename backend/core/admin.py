@@ -0,0 +1,147 @@
+"""
+Admin helpers for very large tables (scan_logs and friends).
+
+LargeTableAdmin avoids the queries that make the stock changelist unusable on
+millions of rows: exact COUNT(*) on every page, list filters that load every
+related object, and per-row queries for related objects.
+"""
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.views.main import PAGE_VAR
+from django.contrib.admin.widgets import AutocompleteSelect
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+
+
+def estimated_row_count(model, using):
+    """The database's table-statistics row estimate, or None if unavailable."""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'mysql':
+        sql = 'SELECT TABLE_ROWS FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s'
+    elif connection.vendor == 'postgresql':
+        sql = 'SELECT reltuples::bigint FROM pg_class WHERE relname = %s'
+    else:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [table])
+        row = cursor.fetchone()
+    return row[0] if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that never runs an unbounded COUNT(*).
+
+    Unfiltered lists use the table-statistics estimate once the table is
+    larger than ``exact_count_limit``. Filtered lists are counted up to that
+    limit or one row past the page after ``page_number``, whichever is further,
+    so the requested page and the next one always exist and paging on counts
+    further. ``count_qualifier`` labels a count that is not exact.
+    """
+    exact_count_limit = 10000
+
+    def __init__(self, *args, page_number=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.page_number = page_number
+        self.count_qualifier = ''
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, 'query', None)
+        if query is None:
+            return super().count
+
+        if not query.where:
+            estimate = estimated_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.exact_count_limit:
+                self.count_qualifier = _('About')
+                return estimate
+        limit = max(self.exact_count_limit, (self.page_number + 1) * self.per_page) + 1
+        count = queryset.order_by()[:limit].count()
+        if count == limit:
+            self.count_qualifier = _('At least')
+        return count
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """
+    List filter for a foreign key that searches the related admin instead of
+    listing every related object. Use as ``('event', AutocompleteFilter)``.
+    """
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.attname}__exact'
+        super().__init__(field, request, params, model, model_admin, field_path)
+        selected = self.used_parameters.get(self.lookup_kwarg)
+        self.lookup_val = selected[-1] if isinstance(selected, list) else selected
+
+        form_field = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=self.get_widget(field, model_admin.admin_site),
+            required=False,
+        )
+        self.rendered_widget = form_field.widget.render(self.lookup_kwarg, self.lookup_val)
+
+    @staticmethod
+    def get_widget(field, admin_site):
+        return AutocompleteSelect(field, admin_site, attrs={'data-autocomplete-filter': 'true'})
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(remove=[self.lookup_kwarg]),
+            'display': 'All',
+        }
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """ModelAdmin defaults for tables too large for exact counts and full filter lists."""
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        try:
+            page_number = max(1, int(request.GET.get(PAGE_VAR, 1)))
+        except ValueError:
+            page_number = 1
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, page_number=page_number)
+
+    @property
+    def media(self):
+        media = super().media
+        for list_filter in self.list_filter:
+            if isinstance(list_filter, (list, tuple)) and issubclass(list_filter[1], AutocompleteFilter):
+                field = self.model._meta.get_field(list_filter[0])
+                media += AutocompleteFilter.get_widget(field, self.admin_site).media
+        return media
+
+
+class MarkDeletedAdminMixin:
+    """
+    Delete by calling the model's mark_deleted() instead of cascading, for
+    parents of large scan histories (see apps.scans.purge).
+
+    The confirmation page lists only the selected objects: the stock one walks
+    every related row, which is the cost this avoids.
+    """
+
+    def delete_model(self, request, obj):
+        obj.mark_deleted()
+
+    def delete_queryset(self, request, queryset):
+        for obj in queryset:
+            obj.mark_deleted()
+
+    def get_deleted_objects(self, objs, request):
+        objs = list(objs)
+        model_count = {self.model._meta.verbose_name_plural: len(objs)}
+        return [str(obj) for obj in objs], model_count, set(), []
@@ -0,0 +1,57 @@
+"""
+Conditional GET support (ETag / If-None-Match) for API views.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+def queryset_stamp(queryset, timestamp_field='updated_at'):
+    """Cheap version stamp for a queryset: row count plus newest modification time."""
+    aggregate = queryset.order_by().aggregate(count=Count('pk'), latest=Max(timestamp_field))
+    latest = aggregate['latest'].isoformat() if aggregate['latest'] else '-'
+    return f"{aggregate['count']}:{latest}"
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with an ETag derived from a cheap version stamp.
+
+    Views implement ``get_version_stamp()`` using model timestamps and
+    counters instead of hashing the rendered body. When the stamp matches
+    the client's ``If-None-Match`` header a 304 is returned before the
+    queryset is serialized.
+    """
+
+    def get_version_stamp(self):
+        return None
+
+    def get_cache_control(self):
+        # Clients may keep the payload but must revalidate it on every use.
+        return {'private': True, 'no_cache': True}
+
+    def get_etag(self):
+        stamp = self.get_version_stamp()
+        if stamp is None:
+            return None
+        return quote_etag(hashlib.md5(stamp.encode()).hexdigest())
+
+    def get(self, request, *args, **kwargs):
+        etag = self.get_etag()
+        if etag is not None:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return self._add_validator_headers(not_modified, etag)
+
+        response = super().get(request, *args, **kwargs)
+        if etag is not None and response.status_code == 200:
+            self._add_validator_headers(response, etag)
+        return response
+
+    def _add_validator_headers(self, response, etag):
+        response['ETag'] = etag
+        patch_cache_control(response, **self.get_cache_control())
+        patch_vary_headers(response, ['Authorization'])
+        return response
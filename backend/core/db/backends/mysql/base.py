@@ -0,0 +1,34 @@
+"""
+MySQL backend that checks connections out of a per-process pool.
+
+Configured through the ``POOL`` entry of the database settings (see
+core/settings.py). Django "closes" the connection at the end of every request;
+this backend returns it to the pool instead.
+"""
+from django.db.backends.mysql import base as mysql_base
+
+from core.db.pool import ConnectionPool, get_pool
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    def _get_pool(self, conn_params):
+        options = self.settings_dict.get('POOL', {})
+
+        def create():
+            return ConnectionPool(
+                connect=lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                max_size=options.get('MAX_SIZE', 10),
+                max_age=options.get('MAX_AGE'),
+                timeout=options.get('TIMEOUT', 10),
+                check=lambda connection: connection.ping(),
+            )
+
+        return get_pool(self.alias, create)
+
+    def get_new_connection(self, conn_params):
+        return self._get_pool(conn_params).acquire()
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._get_pool(None).release(self.connection)
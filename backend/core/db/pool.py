@@ -0,0 +1,180 @@
+"""
+Per-process database connection pool.
+
+Each worker process keeps up to ``max_size`` open connections per database
+alias and hands them to request threads on checkout. Idle connections are
+health-checked before reuse and recycled once older than ``max_age`` seconds.
+"""
+import collections
+import os
+import threading
+import time
+
+from django.db.utils import OperationalError
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+    def __init__(self, connect, max_size, max_age=None, timeout=10, check=None):
+        self._connect = connect
+        self._check = check
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+
+        self._lock = threading.Condition()
+        self._idle = collections.deque()  # (connection, opened_at), most recently used last
+        self._opened_at = {}  # id(connection) -> opened_at, for checked-out connections
+        self._in_use = 0
+
+        self._opened = 0
+        self._closed = 0
+        self._checkouts = 0
+        self._waits = 0
+        self._wait_seconds = 0.0
+        self._timeouts = 0
+        self._health_check_failures = 0
+        self._connect_seconds = 0.0
+        self._last_connect_seconds = None
+
+    def _expired(self, opened_at):
+        return self.max_age is not None and time.monotonic() - opened_at >= self.max_age
+
+    def _close(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self._lock:
+            self._closed += 1
+
+    def _open(self):
+        started = time.monotonic()
+        connection = self._connect()
+        elapsed = time.monotonic() - started
+        with self._lock:
+            self._opened += 1
+            self._connect_seconds += elapsed
+            self._last_connect_seconds = elapsed
+        return connection, time.monotonic()
+
+    def _healthy(self, connection):
+        if self._check is None:
+            return True
+        try:
+            self._check(connection)
+            return True
+        except Exception:
+            with self._lock:
+                self._health_check_failures += 1
+            return False
+
+    def acquire(self):
+        """Check out a connection, waiting up to ``timeout`` seconds for a free slot."""
+        started = time.monotonic()
+        waited = False
+        with self._lock:
+            while not self._idle and self._in_use >= self.max_size:
+                if not waited:
+                    self._waits += 1
+                    waited = True
+                remaining = self.timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeout(
+                        f'No database connection available within {self.timeout}s '
+                        f'({self.max_size} in use).'
+                    )
+                self._lock.wait(remaining)
+            if waited:
+                self._wait_seconds += time.monotonic() - started
+            self._in_use += 1
+            self._checkouts += 1
+            connection, opened_at = self._idle.pop() if self._idle else (None, None)
+
+        try:
+            if connection is not None and (self._expired(opened_at) or not self._healthy(connection)):
+                self._close(connection)
+                connection = None
+            if connection is None:
+                connection, opened_at = self._open()
+        except Exception:
+            with self._lock:
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._opened_at[id(connection)] = opened_at
+        return connection
+
+    def release(self, connection):
+        """Return a checked-out connection; it is rolled back before reuse."""
+        with self._lock:
+            opened_at = self._opened_at.pop(id(connection), None)
+
+        reusable = opened_at is not None and not self._expired(opened_at)
+        if reusable:
+            try:
+                connection.rollback()
+            except Exception:
+                reusable = False
+        if not reusable:
+            self._close(connection)
+
+        with self._lock:
+            if reusable:
+                self._idle.append((connection, opened_at))
+            self._in_use -= 1
+            self._lock.notify()
+
+    def close_idle(self):
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+        for connection, _ in idle:
+            self._close(connection)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_size': self.max_size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'checkouts': self._checkouts,
+                'opened': self._opened,
+                'closed': self._closed,
+                'waits': self._waits,
+                'wait_ms_total': round(self._wait_seconds * 1000, 2),
+                'timeouts': self._timeouts,
+                'health_check_failures': self._health_check_failures,
+                'connect_ms_avg': round(self._connect_seconds * 1000 / self._opened, 2) if self._opened else None,
+                'connect_ms_last': (
+                    round(self._last_connect_seconds * 1000, 2) if self._last_connect_seconds is not None else None
+                ),
+            }
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, create):
+    """Return this process's pool for a database alias, creating it with create() on first use."""
+    key = (os.getpid(), alias)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = create()
+        return pool
+
+
+def pool_stats():
+    """Statistics for every pool in the current process, keyed by database alias."""
+    pid = os.getpid()
+    with _pools_lock:
+        pools = {alias: pool for (owner, alias), pool in _pools.items() if owner == pid}
+    return {alias: pool.stats() for alias, pool in pools.items()}
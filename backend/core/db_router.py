@@ -0,0 +1,109 @@
+"""
+Primary/replica database routing.
+
+Reads go to the primary unless a view opts in with ReplicaReadMixin (class
+views) or @replica_reads (function views). Opted-in safe requests read from
+the ``replica`` alias, except for clients that wrote recently: any write
+pins the rest of the request to the primary, and DatabaseRoutingMiddleware
+keeps the writing user on the primary for REPLICA_STICKY_SECONDS afterwards.
+"""
+import contextvars
+import functools
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+STICKY_COOKIE = 'db_primary'
+
+_routing = contextvars.ContextVar('db_routing', default=None)
+
+
+class _RequestRouting:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+
+
+def begin_request():
+    return _routing.set(_RequestRouting())
+
+
+def end_request(token):
+    state = _routing.get()
+    _routing.reset(token)
+    return state
+
+
+def replica_alias():
+    alias = settings.REPLICA_DATABASE_ALIAS
+    return alias if alias in connections.databases else None
+
+
+def _sticky_cache_key(user_id):
+    return f'db-sticky:{user_id}'
+
+
+def recently_wrote(request):
+    """True if this client wrote within the stickiness window."""
+    if request.COOKIES.get(STICKY_COOKIE):
+        return True
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return bool(cache.get(_sticky_cache_key(user.pk)))
+    return False
+
+
+def remember_write(request, response):
+    """Keep this client on the primary long enough for replicas to catch up."""
+    seconds = settings.REPLICA_STICKY_SECONDS
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        cache.set(_sticky_cache_key(user.pk), True, timeout=seconds)
+    response.set_cookie(STICKY_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+
+
+def use_replica(request):
+    """Route the remaining reads of a safe request to the replica when allowed."""
+    state = _routing.get()
+    if state is None or replica_alias() is None:
+        return
+    if request.method in SAFE_METHODS and not state.wrote and not recently_wrote(request):
+        state.use_replica = True
+
+
+class ReplicaReadMixin:
+    """Serve safe requests for this view from the read replica."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        use_replica(request)
+
+
+def replica_reads(view_func):
+    """Function-view counterpart of ReplicaReadMixin; apply below @api_view."""
+    @functools.wraps(view_func)
+    def wrapped(request, *args, **kwargs):
+        use_replica(request)
+        return view_func(request, *args, **kwargs)
+    return wrapped
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing.get()
+        if state is not None and state.use_replica and not state.wrote:
+            return replica_alias()
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        state = _routing.get()
+        if state is not None:
+            # Read-your-writes: once a request writes, it reads from the primary
+            state.wrote = True
+            state.use_replica = False
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
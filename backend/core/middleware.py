@@ -0,0 +1,62 @@
+"""
+Project-wide middleware.
+"""
+from core import db_router
+from apps.monitoring import profiling, queries
+
+
+class DatabaseRoutingMiddleware:
+    """
+    Scope primary/replica routing state to a single request.
+
+    Requests that wrote to the database mark the client as a recent writer so
+    its next reads also come from the primary (see core.db_router).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = db_router.begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            state = db_router.end_request(token)
+
+        if state.wrote and db_router.replica_alias() is not None:
+            db_router.remember_write(request, response)
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests an admin flags with ``X-Profile: 1`` or ``?profile=true``,
+    plus a PROFILE_SAMPLE_RATE fraction of all requests (see
+    apps.monitoring.profiling). The stored profile's id is returned in the
+    ``X-Profile-Id`` response header. Placed after AuthenticationMiddleware so
+    admin sessions are recognised.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        trigger = profiling.trigger(request)
+        if trigger is None:
+            return self.get_response(request)
+        return profiling.profile(self.get_response, request, trigger)
+
+
+class QueryInspectionMiddleware:
+    """
+    Count and time the SQL of a QUERY_SAMPLE_RATE fraction of requests and
+    record repeated (N+1) and slow statements (see apps.monitoring.queries).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not queries.sampled():
+            return self.get_response(request)
+        return queries.inspect(self.get_response, request)
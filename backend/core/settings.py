@@ -5,6 +5,7 @@ Django settings for event scanning system project.
 from pathlib import Path
 from decouple import config
 from datetime import timedelta
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -32,9 +33,13 @@ INSTALLED_APPS = [
     'apps.users',
     'apps.events',
     'apps.scans',
+    'apps.analytics',
+    'apps.monitoring',
+    'apps.jobs',
 ]
 
 MIDDLEWARE = [
+    'core.middleware.DatabaseRoutingMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -43,6 +48,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.QueryInspectionMiddleware',
+    'core.middleware.ProfilingMiddleware',
 ]
 
 ROOT_URLCONF = 'core.urls'
@@ -50,7 +57,7 @@ ROOT_URLCONF = 'core.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'core' / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -77,7 +84,59 @@ DATABASES = {
         'OPTIONS': {
             'charset': 'utf8mb4',
             'sql_mode': 'STRICT_TRANS_TABLES',
-        }
+        },
+        # Keep connections open between requests; verify them before reuse
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+# Connection pool: with DB_POOL_SIZE > 0 each worker process shares up to that
+# many connections between its threads (see core/db/pool.py). Pooled
+# connections are recycled after DB_CONN_MAX_AGE seconds.
+DB_POOL_SIZE = config('DB_POOL_SIZE', default=0, cast=int)
+if DB_POOL_SIZE:
+    DATABASES['default'].update({
+        'ENGINE': 'core.db.backends.mysql',
+        'CONN_MAX_AGE': 0,  # Hand the connection back to the pool after each request
+        'POOL': {
+            'MAX_SIZE': DB_POOL_SIZE,
+            'MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'TIMEOUT': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        },
+    })
+
+# Optional read replica for analytics, reports and list pages (see core/db_router.py).
+# Point DB_REPLICA_* at a second database to enable it.
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+REPLICA_DATABASE_ALIAS = 'replica'
+if DB_REPLICA_NAME or DB_REPLICA_HOST:
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES['default'],
+        'NAME': DB_REPLICA_NAME or DATABASES['default']['NAME'],
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': DB_REPLICA_HOST or DATABASES['default']['HOST'],
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['core.db_router.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=5, cast=int)
+
+# Seconds a scanner's door assignment is cached for scan attribution. Other
+# processes only see a reassignment once this expires unless the cache is shared.
+ASSIGNMENT_CACHE_SECONDS = config('ASSIGNMENT_CACHE_SECONDS', default=5, cast=int)
+
+# Cache (stickiness markers and other shared counters). Use a shared backend,
+# e.g. memcached, when running several worker processes.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='scanunion'),
     }
 }
 
@@ -159,9 +218,53 @@ CORS_ALLOW_CREDENTIALS = True
 
 CORS_ALLOW_ALL_ORIGINS = DEBUG  # Only in development
 
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key', 'x-profile')
+CORS_EXPOSE_HEADERS = ['Retry-After', 'Idempotent-Replayed', 'X-Profile-Id']
+
 # Custom User Model
 AUTH_USER_MODEL = 'users.User'
 
+# Threads used to hash passwords during bulk user imports
+USER_IMPORT_HASH_WORKERS = config('USER_IMPORT_HASH_WORKERS', default=8, cast=int)
+
+# Scan ingest admission control (see apps/scans/throttling.py): per-scanner
+# token bucket (scans per second, burst size) and concurrent scan writes per worker process.
+# The in-flight cap is counted in each process, not across the deployment: the database
+# sees up to (worker processes x INGEST_MAX_IN_FLIGHT) scan writes at once, so size it as
+# the total the database should take divided by the number of workers. With a connection
+# pool it defaults to DB_POOL_SIZE, as admitted writes beyond that would queue for a connection.
+INGEST_SCANNER_RATE = config('INGEST_SCANNER_RATE', default=2.0, cast=float)
+INGEST_SCANNER_BURST = config('INGEST_SCANNER_BURST', default=20, cast=int)
+INGEST_MAX_IN_FLIGHT = config('INGEST_MAX_IN_FLIGHT', default=DB_POOL_SIZE or 8, cast=int)
+
+# How long scan Idempotency-Key values are remembered
+IDEMPOTENCY_KEY_TTL_HOURS = config('IDEMPOTENCY_KEY_TTL_HOURS', default=24, cast=int)
+
+# Seconds clients may reuse a completed event's report without revalidating
+REPORT_CACHE_SECONDS = config('REPORT_CACHE_SECONDS', default=300, cast=int)
+
+# Background jobs (see apps/jobs): worker processes for runworker, seconds between
+# polls of an empty queue, attempts per job, first retry delay (doubled per attempt)
+# and seconds without a heartbeat before a RUNNING job is considered abandoned
+JOB_WORKER_PROCESSES = config('JOB_WORKER_PROCESSES', default=2, cast=int)
+JOB_POLL_SECONDS = config('JOB_POLL_SECONDS', default=2.0, cast=float)
+JOB_MAX_ATTEMPTS = config('JOB_MAX_ATTEMPTS', default=3, cast=int)
+JOB_RETRY_DELAY_SECONDS = config('JOB_RETRY_DELAY_SECONDS', default=30, cast=int)
+JOB_STALE_SECONDS = config('JOB_STALE_SECONDS', default=300, cast=int)
+
+# Request profiling (see apps/monitoring/profiling.py): fraction of all requests
+# profiled at random (0 = only admin requests flagged with X-Profile) and how
+# many stored profiles to keep
+PROFILE_SAMPLE_RATE = config('PROFILE_SAMPLE_RATE', default=0.0, cast=float)
+PROFILE_KEEP = config('PROFILE_KEEP', default=200, cast=int)
+
+# Query inspection (see apps/monitoring/queries.py): fraction of requests whose
+# SQL is fingerprinted, executions of one statement per request that count as
+# an N+1, and milliseconds after which a single statement is logged as slow
+QUERY_SAMPLE_RATE = config('QUERY_SAMPLE_RATE', default=0.01, cast=float)
+QUERY_REPEAT_THRESHOLD = config('QUERY_REPEAT_THRESHOLD', default=10, cast=int)
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', default=500, cast=float)
+
 # Logging
 LOGGING = {
     'version': 1,
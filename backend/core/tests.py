@@ -0,0 +1,140 @@
+from contextlib import ExitStack, contextmanager
+from unittest import mock, skipUnless
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+
+from apps.events.models import Event
+from apps.scans.admin import ScanLogAdmin
+from apps.scans.models import ScanLog
+from apps.users.models import User
+from core import db_router
+from core.admin import EstimatedCountPaginator
+from core.db_router import PrimaryReplicaRouter
+
+
+@contextmanager
+def database_aliases():
+    """Collect the alias of every connection that runs a statement inside the block."""
+    aliases = set()
+
+    def record(execute, sql, params, many, context):
+        aliases.add(context['connection'].alias)
+        return execute(sql, params, many, context)
+
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(record))
+        yield aliases
+
+
+# Runs when DB_REPLICA_NAME/DB_REPLICA_HOST configure a replica (a test mirror of the primary)
+REPLICA_CONFIGURED = settings.REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+@skipUnless(REPLICA_CONFIGURED, 'no replica database configured')
+class ReplicaRoutingTests(TestCase):
+    # The test runner sets up every alias listed here, even for skipped classes
+    databases = {'default', settings.REPLICA_DATABASE_ALIAS} if REPLICA_CONFIGURED else {'default'}
+
+    def setUp(self):
+        # Stickiness markers of earlier tests live in the cache
+        cache.clear()
+        self.admin = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.other_admin = User.objects.create_superuser(pin='0002', name='Other', email='other@example.com', password='x')
+        self.event = Event.objects.create(name='Fair', is_permanent=True)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_safe_request_reads_from_replica(self):
+        with database_aliases() as aliases:
+            response = self.client_for(self.admin).get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {'replica'})
+        self.assertNotIn(db_router.STICKY_COOKIE, response.cookies)
+
+    def test_reads_after_a_write_in_the_same_request_use_primary(self):
+        request = RequestFactory().get('/api/events/')
+        request.user = self.admin
+        router = PrimaryReplicaRouter()
+        token = db_router.begin_request()
+        try:
+            db_router.use_replica(request)
+            self.assertEqual(router.db_for_read(Event), 'replica')
+            Event.objects.create(name='Written', is_permanent=True)
+            self.assertEqual(router.db_for_read(Event), 'default')
+            # A later opt-in cannot send the writing request back to the replica
+            db_router.use_replica(request)
+            self.assertEqual(router.db_for_read(Event), 'default')
+        finally:
+            state = db_router.end_request(token)
+        self.assertTrue(state.wrote)
+        self.assertEqual(router.db_for_read(Event), 'default')
+
+    def test_writer_stays_on_primary_and_fresh_client_reads_replica(self):
+        writer = self.client_for(self.admin)
+        response = writer.patch(f'/api/events/{self.event.pk}/', {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(db_router.STICKY_COOKIE, response.cookies)
+
+        # Same client: sticky cookie and the per-user cache marker keep it on the primary
+        with database_aliases() as aliases:
+            response = writer.get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {'default'})
+
+        # Same user from another device (no cookie): the cache marker still applies
+        with database_aliases() as aliases:
+            self.client_for(self.admin).get('/api/events/')
+        self.assertEqual(aliases, {'default'})
+
+        # A client that never wrote reads from the replica
+        with database_aliases() as aliases:
+            response = self.client_for(self.other_admin).get('/api/events/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(aliases, {'replica'})
+
+        cache.clear()
+        writer.cookies.clear()
+        with database_aliases() as aliases:
+            writer.get('/api/events/')
+        self.assertEqual(aliases, {'replica'})
+
+
+@mock.patch.object(ScanLogAdmin, 'list_per_page', 2)
+@mock.patch.object(EstimatedCountPaginator, 'exact_count_limit', 3)
+class EstimatedCountPaginatorTests(TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(pin='0001', name='Admin', email='admin@example.com', password='x')
+        self.client.force_login(admin_user)
+        scanner = User.objects.create_user(pin='1001', name='Scanner')
+        event = Event.objects.create(name='Fair', is_permanent=True, duplicate_policy='ALLOW_DUPLICATES')
+        ScanLog.objects.bulk_create([
+            ScanLog(event=event, scanner=scanner, student_id=f'S{index:04d}', status='SUCCESS', seq=index + 1)
+            for index in range(12)
+        ])
+
+    def changelist(self, page):
+        return self.client.get('/admin/scans/scanlog/', {'status__exact': 'SUCCESS', 'p': page})
+
+    def test_filtered_pages_past_the_count_limit_are_reachable(self):
+        response = self.changelist(1)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'At least 5 Scan Logs')
+
+        response = self.changelist(4)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+        self.assertContains(response, 'At least 11 Scan Logs')
+
+        # The last page is counted exactly
+        response = self.changelist(6)
+        self.assertEqual(len(response.context['cl'].result_list), 2)
+        self.assertContains(response, '12 Scan Logs')
+        self.assertNotContains(response, 'At least')
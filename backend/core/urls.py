@@ -10,4 +10,7 @@ urlpatterns = [
     path('api/users/', include('apps.users.urls')),
     path('api/events/', include('apps.events.urls')),
     path('api/scan-logs/', include('apps.scans.urls')),
+    path('api/analytics/', include('apps.analytics.urls')),
+    path('api/monitoring/', include('apps.monitoring.urls')),
+    path('api/jobs/', include('apps.jobs.urls')),
 ]